@@ -1,19 +1,58 @@
+import importlib as _importlib
 
-from QV.kind_of_quantity import *
-from QV.scale import *
-from QV.quantity_value import *
-from QV.unit_register import *
-from QV.context import *
+#----------------------------------------------------------------------------
+# The public names are imported from the submodules when they are first 
+# used (PEP 562), so `import QV` is fast and NumPy is only imported when 
+# quantity arrays are needed.
+#
+# Public names - keys; submodules - values 
+_LAZY = dict()
+for _module, _names in (
+    ('kind_of_quantity', ('KindOfQuantity','Number')),
+    ('scale', ('Scale','OrdinalScale','IntervalScale','RatioScale','AffineConversion')),
+    ('signature', ('Signature',)),
+    ('quantity_value', ('qvalue','value','unit','qresult','qratio','qmap')),
+    ('unit_register', ('UnitRegister','proportional_unit')),
+    ('context', ('Context',)),
+    ('quantity_array', ('QArray','qarray')),
+    ('aggregate', ('qsorted','qmin','qmax','qsum','qmean')),
+):
+    for _name in _names:
+        _LAZY[_name] = _module
+del _module, _names, _name
+
+def __getattr__(name):
+    if name == 'prefix':
+        return _importlib.import_module('QV.prefix')
+        
+    if name not in _LAZY:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__,name)
+        )
+        
+    value = getattr( _importlib.import_module('QV.' + _LAZY[name]), name )
+    globals()[name] = value
+    return value
+    
+def __dir__():
+    return sorted( set( globals() ) | set( _LAZY ) | {'prefix'} )
 
-from QV import prefix 
 #----------------------------------------------------------------------------
 
+# Names that need NumPy (e.g., `qarray`) are not included,  
+# so `from QV import *` does not import it 
 __all__ = (
     'qvalue',
     'qratio',
     'value',
     'unit',
     'qresult',
+    'qmap',
+    'qsorted',
+    'qmin',
+    'qmax',
+    'qsum',
+    'qmean',
     'Context',
     'UnitRegister',
     'proportional_unit',
@@ -0,0 +1,220 @@
+from math import fsum
+
+from QV.quantity_value import ValueUnit, value, _conversion_to
+from QV.scale import RatioScale
+
+__all__ = ( 'qsorted', 'qmin', 'qmax', 'qsum', 'qmean' )
+
+#----------------------------------------------------------------------------
+# Values in a collection may have different units. To order them,
+# each value is converted to the reference unit once and the converted
+# values are used as keys (decorate-sort-undecorate). The conversion
+# for each distinct unit is only resolved once.
+#
+def _reference_keys(value_units):
+    """
+    Return the values of the ``value_units`` in the reference unit
+
+    A ``RuntimeError`` is raised unless all the values are
+    for the same kind of quantity and unit register.
+
+    """
+    ref_unit = None
+    conversions = dict()
+    keys = list()
+    for vu in value_units:
+        u = vu.unit
+        if u in conversions:
+            fn = conversions[u]
+        else:
+            ref_unit, fn = _conversion_to(u,ref_unit)
+            conversions[u] = fn
+
+        keys.append( fn(vu.value) )
+
+    return keys
+
+#----------------------------------------------------------------------------
+def qsorted(value_units,reverse=False):
+    """
+    Return a new list of the quantity values in ``value_units``, sorted
+
+    The values may have different units, but must be for the
+    same kind of quantity. Each value is converted to the
+    reference unit once. The sort is stable and the
+    quantity values themselves are returned.
+
+    Example ::
+
+        >>> context = Context( ("Length","L"), )
+        >>> si = UnitRegister("si",context)
+        >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        >>> centimetre = si.unit( prefix.centi(metre) )
+        >>> x = [ qvalue(1.2,metre), qvalue(35,centimetre), qvalue(0.5,metre) ]
+        >>> print( [ str(x_i) for x_i in qsorted(x) ] )
+        ['35 cm', '0.5 m', '1.2 m']
+
+    """
+    value_units = list(value_units)
+    keys = _reference_keys(value_units)
+
+    order = sorted(
+        range( len(value_units) ),
+        key=keys.__getitem__,
+        reverse=reverse
+    )
+    return [ value_units[i] for i in order ]
+
+#----------------------------------------------------------------------------
+# Reductions group the values by unit, reduce the raw values in each 
+# group and then convert only the group results to the reference unit. 
+# So, the number of conversions depends on the number of distinct units.
+#
+def _group_by_unit(value_units):
+    """
+    Return the ``value_units`` grouped by unit (in order of first 
+    appearance), the conversion from each unit to the reference unit, 
+    and the reference unit
+    
+    """
+    groups = dict()
+    for vu in value_units:
+        u = vu.unit
+        if u in groups:
+            groups[u].append(vu)
+        else:
+            groups[u] = [vu]
+            
+    if not groups:
+        raise RuntimeError("no quantity values")
+    
+    ref_unit = None
+    conversions = dict()
+    for u in groups:
+        ref_unit, conversions[u] = _conversion_to(u,ref_unit)
+        
+    return groups, conversions, ref_unit
+
+def _sum(values):
+    """
+    Return the sum of ``values``, using compensated summation 
+    for floats, otherwise pairwise summation  
+    
+    """
+    types = set( type(x) for x in values )
+    if types == {int}:
+        return sum(values)
+    elif types <= {float,int}:
+        return fsum(values)
+        
+    # Other types (e.g., Fractions or arrays) are summed pairwise 
+    while len(values) > 1:
+        pairs = [ 
+            values[i] + values[i+1] 
+                for i in range(0,len(values)-1,2) 
+        ]
+        if len(values) % 2:
+            pairs.append( values[-1] )
+        values = pairs
+        
+    return values[0]
+    
+#----------------------------------------------------------------------------
+def qsum(value_units):
+    """
+    Return the sum of the quantity values in ``value_units``
+
+    The values may have different units, but must be for the
+    same kind of quantity, on ratio scales. When there is 
+    more than one unit, the result is in the reference unit.
+    
+    The raw values for each unit are summed first (using compensated 
+    summation for floats), so there is one conversion for each unit.
+
+    Example ::
+
+        >>> context = Context( ("Length","L"), )
+        >>> si = UnitRegister("si",context)
+        >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        >>> centimetre = si.unit( prefix.centi(metre) )
+        >>> x = [ qvalue(1.2,metre), qvalue(35,centimetre), qvalue(0.5,metre) ]
+        >>> print( qsum(x) )
+        2.05 m
+        >>> print( qsum( x[1:2] ) )
+        35 cm
+        
+    """
+    groups, conversions, ref_unit = _group_by_unit(value_units)
+    
+    for u in groups:
+        if type(u.scale) is not RatioScale:
+            raise RuntimeError(
+                "cannot add values on {!r}".format(u.scale)
+            )
+
+    if len(groups) == 1:
+        (u,group), = groups.items()
+        return ValueUnit( _sum( [ vu.value for vu in group ] ), u )
+        
+    return ValueUnit(
+        _sum([
+            conversions[u]( _sum( [ vu.value for vu in group ] ) ) 
+                for u,group in groups.items()
+        ]),
+        ref_unit
+    )
+    
+#----------------------------------------------------------------------------
+def qmean(value_units):
+    """
+    Return the mean of the quantity values in ``value_units``
+
+    The values may have different units, but must be for the
+    same kind of quantity, on ratio scales (see :func:`.qsum`). 
+
+    """
+    value_units = list(value_units)
+    total = qsum(value_units)
+    return ValueUnit( total.value / len(value_units), total.unit )
+    
+#----------------------------------------------------------------------------
+def _extreme(value_units,choose):
+    groups, conversions, ref_unit = _group_by_unit(value_units)
+    
+    # The extreme of each group is found with raw values. 
+    # Conversions preserve order, so only these are converted. 
+    candidates = [ 
+        choose( group, key=value ) for group in groups.values() 
+    ]
+    keys = [ conversions[vu.unit](vu.value) for vu in candidates ]
+    
+    return candidates[ choose( range( len(keys) ), key=keys.__getitem__ ) ]
+    
+def qmin(value_units):
+    """
+    Return the smallest of the quantity values in ``value_units``
+
+    The values may have different units, but must be for the
+    same kind of quantity. One value for each distinct unit 
+    is converted to the reference unit.
+
+    """
+    return _extreme(value_units,min)
+
+#----------------------------------------------------------------------------
+def qmax(value_units):
+    """
+    Return the largest of the quantity values in ``value_units``
+
+    The values may have different units, but must be for the
+    same kind of quantity. One value for each distinct unit 
+    is converted to the reference unit.
+
+    """
+    return _extreme(value_units,max)
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
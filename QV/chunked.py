@@ -0,0 +1,292 @@
+import operator
+from math import fsum
+
+from QV.quantity_value import ValueUnit
+from QV.quantity_array import QArray, np, _require_numpy
+from QV.scale import RatioScale
+
+__all__ = ( 'Chunks', 'ChunkedQArray', 'chunked' )
+
+#----------------------------------------------------------------------------
+# The value of a chunked quantity array is a `Chunks` object: a lazy
+# sequence of NumPy arrays. Arithmetic on `Chunks` returns another
+# `Chunks` object, which applies the operation to each chunk when it
+# is iterated over. So, the arithmetic in ValueUnit and the conversion
+# functions used by `qresult` work unchanged, and only one chunk for
+# each stage of a calculation is held in memory at a time.
+#
+class Chunks(object):
+
+    """
+    A lazy sequence of NumPy arrays.
+
+    ``source`` is a function that returns an iterable of
+    array-like objects, or an iterable (which will be
+    iterated over each time the chunks are needed).
+    An iterator, such as a generator, can only be iterated 
+    over once, so it is not accepted: pass the function 
+    that creates it instead.
+
+    """
+
+    # NumPy arrays defer to the reflected operations 
+    __array_ufunc__ = None
+
+    def __init__(self,source):
+        _require_numpy()
+        if callable(source):
+            self._source = source
+        elif iter(source) is source:
+            raise TypeError(
+                "chunks may be used more than once, so an iterator "
+                "cannot be the source, use a function that returns one"
+            )
+        else:
+            self._source = lambda: source
+
+    def __iter__(self):
+        for c in self._source():
+            yield np.asarray(c)
+
+    # An array operand (that is not a scalar) is split 
+    # to match the chunks, other operands are broadcast 
+    def _map(self,op,other):
+        if isinstance(other,Chunks):
+            return Chunks( lambda: _zip_map(op,self,other) )
+        elif getattr(other,'ndim',0):
+            return Chunks( lambda: ( op(c,o) for c,o in _split(self,other) ) )
+        else:
+            return Chunks( lambda: ( op(c,other) for c in self ) )
+
+    def _rmap(self,op,other):
+        if getattr(other,'ndim',0):
+            return Chunks( lambda: ( op(o,c) for c,o in _split(self,other) ) )
+        else:
+            return Chunks( lambda: ( op(other,c) for c in self ) )
+
+    def __add__(self,rhs):
+        return self._map(operator.add,rhs)
+
+    def __radd__(self,lhs):
+        return self._rmap(operator.add,lhs)
+
+    def __sub__(self,rhs):
+        return self._map(operator.sub,rhs)
+
+    def __rsub__(self,lhs):
+        return self._rmap(operator.sub,lhs)
+
+    def __mul__(self,rhs):
+        return self._map(operator.mul,rhs)
+
+    def __rmul__(self,lhs):
+        return self._rmap(operator.mul,lhs)
+
+    def __truediv__(self,rhs):
+        return self._map(operator.truediv,rhs)
+
+    def __rtruediv__(self,lhs):
+        return self._rmap(operator.truediv,lhs)
+
+    def __pow__(self,rhs):
+        return self._map(operator.pow,rhs)
+
+def _zip_map(op,lhs,rhs):
+    end = object()
+    rhs = iter(rhs)
+    for l in lhs:
+        r = next(rhs,end)
+        if r is end:
+            break
+        yield op(l,r)
+    else:
+        if next(rhs,end) is end:
+            return
+
+    raise RuntimeError("different numbers of chunks")
+
+def _split(chunks,array):
+    # Each chunk and the part of `array` with the same index range
+    start = 0
+    for c in chunks:
+        stop = start + len(c)
+        if stop > len(array):
+            break
+        yield c, array[start:stop]
+        start = stop
+    else:
+        if start == len(array):
+            return
+
+    raise RuntimeError("different numbers of values")
+
+#----------------------------------------------------------------------------
+class ChunkedQArray(ValueUnit):
+
+    """
+    A sequence of chunks of numbers and an associated unit.
+
+    A ``ChunkedQArray`` is a :class:`.ValueUnit` with a :class:`.Chunks`
+    object as the value. Arithmetic and :func:`.qresult` are evaluated
+    lazily, one chunk at a time, when the chunks are iterated over or
+    when a reduction is calculated. The operands in arithmetic between
+    chunked arrays must have the same chunk sizes. A :class:`.QArray` 
+    operand is split to match the chunks.
+
+    """
+    __slots__ = ()
+
+    # NumPy operations on the whole array are not supported
+    __array_ufunc__ = None
+
+    def __array_function__(self,func,types,args,kwargs):
+        return NotImplemented
+
+    def __init__(self,value,unit):
+        if not isinstance(value,Chunks):
+            value = Chunks(value)
+        ValueUnit.__init__(self,value,unit)
+
+    def __repr__(self):
+        return "{!s}(...,{!s})".format(
+            'chunked',
+            self.unit.scale.name
+        )
+
+    def __iter__(self):
+        u = self.unit
+        for c in self.value:
+            yield QArray(c,u)
+
+    def qarray(self):
+        """Return the values in memory, as a :class:`.QArray`"""
+        return QArray(
+            np.concatenate( [ c.ravel() for c in self.value ] ),
+            self.unit
+        )
+
+    # Reductions
+    def __len__(self):
+        return sum( c.size for c in self.value )
+
+    def sum(self):
+        """Return the sum of the values"""
+        if type(self.unit.scale) is not RatioScale:
+            raise RuntimeError(
+                "cannot add values on {!r}".format(self.unit.scale)
+            )
+        total, n = _total(self.value)
+        return ValueUnit( total, self.unit )
+
+    def mean(self):
+        """Return the mean of the values"""
+        total, n = _total(self.value)
+        if n == 0:
+            raise RuntimeError("no values")
+        return ValueUnit( total/n, self.unit )
+
+    def min(self):
+        """Return the smallest value"""
+        return ValueUnit( _extreme(self.value,np.min,min), self.unit )
+
+    def max(self):
+        """Return the largest value"""
+        return ValueUnit( _extreme(self.value,np.max,max), self.unit )
+
+    # As for QArray, the results of
+    # arithmetic are converted here
+    def __add__(self,rhs):
+        return _as_chunked( ValueUnit.__add__(self,rhs) )
+
+    def __radd__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_chunked( ValueUnit.__add__(lhs,self) )
+        return _as_chunked( ValueUnit.__radd__(self,lhs) )
+
+    def __sub__(self,rhs):
+        return _as_chunked( ValueUnit.__sub__(self,rhs) )
+
+    def __rsub__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_chunked( ValueUnit.__sub__(lhs,self) )
+        return _as_chunked( ValueUnit.__rsub__(self,lhs) )
+
+    def __mul__(self,rhs):
+        return _as_chunked( ValueUnit.__mul__(self,rhs) )
+
+    def __rmul__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_chunked( ValueUnit.__mul__(lhs,self) )
+        return _as_chunked( ValueUnit.__rmul__(self,lhs) )
+
+    def __truediv__(self,rhs):
+        return _as_chunked( ValueUnit.__truediv__(self,rhs) )
+
+    def __rtruediv__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_chunked( ValueUnit.__truediv__(lhs,self) )
+        return _as_chunked( ValueUnit.__rtruediv__(self,lhs) )
+
+    def __pow__(self,rhs):
+        return _as_chunked( ValueUnit.__pow__(self,rhs) )
+
+def _as_chunked(value_unit):
+    if value_unit is NotImplemented:
+        return value_unit
+    else:
+        return ChunkedQArray(value_unit.value,value_unit.unit)
+
+def _total(chunks):
+    partials = []
+    n = 0
+    for c in chunks:
+        partials.append( c.sum() )
+        n += c.size
+
+    if partials and all( np.issubdtype(type(p),np.floating) for p in partials ):
+        return fsum(partials), n
+    else:
+        return sum(partials), n
+
+def _extreme(chunks,reduce,choose):
+    candidates = [ reduce(c) for c in chunks if c.size ]
+    if not candidates:
+        raise RuntimeError("no values")
+    return choose(candidates)
+
+#----------------------------------------------------------------------------
+def chunked(chunks,unit):
+    """
+    Create a new chunked quantity array object.
+
+    ``chunks`` is a function that returns an iterable of arrays
+    (e.g., read from files), or a sequence of arrays (not an 
+    iterator, see :class:`.Chunks`), ``unit`` is the measurement scale
+
+    Example ::
+
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> def readings():
+        ...     for i in range(3):
+        ...         yield [ 10.0*i, 10.0*i + 5.0 ]
+        ...
+        >>> x = chunked( readings, millivolt )
+        >>> y = qresult( 2*x )
+        >>> y
+        chunked(...,volt)
+        >>> [ str(c) for c in y ]
+        ['[0.   0.01] V', '[0.02 0.03] V', '[0.04 0.05] V']
+        >>> print( x.mean(), x.max() )
+        12.5 mV 25.0 mV
+
+    """
+    return ChunkedQArray(chunks,unit)
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
@@ -1,8 +1,54 @@
-from bidict import bidict 
-
 from QV.kind_of_quantity import KindOfQuantity, Number
 from QV.signature import Signature
 
+__all__ = ( 'Context', )
+
+#----------------------------------------------------------------------------
+class ValueDuplicationError(RuntimeError):
+
+    """
+    Raised when a signature is already associated with a kind of quantity
+    
+    """
+
+#----------------------------------------------------------------------------
+class _TwoWayDict(object):
+
+    """
+    A one-to-one mapping of keys to values, with the inverse mapping 
+    available as ``inverse`` (a dict). A value may only be associated 
+    with one key.
+    
+    """
+    
+    def __init__(self):
+        self._forward = dict()
+        self.inverse = dict()
+        
+    def __len__(self):
+        return len(self._forward)
+        
+    def __iter__(self):
+        return iter(self._forward)
+        
+    def __contains__(self,key):
+        return key in self._forward
+        
+    def __getitem__(self,key):
+        return self._forward[key]
+        
+    def __setitem__(self,key,value):
+        if value in self.inverse and self.inverse[value] != key:
+            raise ValueDuplicationError(
+                "{!r} is associated with {!r}".format(value,self.inverse[value])
+            )
+            
+        if key in self._forward:
+            del self.inverse[ self._forward[key] ]
+            
+        self._forward[key] = value
+        self.inverse[value] = key 
+            
 #----------------------------------------------------------------------------
 class Context(object):
 
@@ -38,7 +84,8 @@ class Context(object):
             if self._valid_koq_name_or_symbol(koq_i._name):
                 self._koq[koq_i._name] = koq_i
                 
-        self._koq_signature = bidict()
+        # KoQ objects - keys; Signature objects - values 
+        self._koq_signature = _TwoWayDict()
         
         # Assign an independent exponent to each base quantity
         exponents = [0] * len(argv)
@@ -72,8 +119,11 @@ class Context(object):
             )
           
     def __getattr__(self,koq_name):
-        if koq_name in self:
-            return self._koq[koq_name]
+        # `_koq` is looked up in `__dict__` because it is 
+        # not defined yet when an object is being unpickled
+        koq = self.__dict__.get('_koq',{})
+        if koq_name in koq:
+            return koq[koq_name]
         else:
             raise AttributeError(
                 "{!r} not found".format(koq_name)
@@ -134,9 +184,9 @@ class Context(object):
         and quotients of :obj:`.KindOfQuantity` objects, 
         or a string representing these operations.
         
-        A ``RuntimeError`` is raised if the signature 
-        resulting from ``expression`` is already associated 
-        with a kind of quantity.
+        A ``RuntimeError`` (a ``ValueDuplicationError``) is raised if 
+        the signature resulting from ``expression`` is already 
+        associated with a kind of quantity.
         
         """
         self._valid_koq_name_or_symbol(koq_name)
@@ -43,6 +43,14 @@ class KindOfQuantity(object):
     def symbol(self):
         return self._symbol
 
+    # `Number` is tested by identity, so 
+    # it is pickled as a reference to this module
+    def __reduce__(self):
+        if self is Number:
+            return 'Number'
+        else:
+            return ( self.__class__, (self._name,self._symbol) )
+            
     def __mul__(self,rhs):
         # NB deliberately don't allow `rhs` to be numeric
         return Mul(self,rhs)
@@ -66,25 +74,36 @@ class KindOfQuantity(object):
     def __rfloordiv__(self,lhs):
         # Assume that lhs behaves like a number
         return Ratio(Number,self)
+
+    def __pow__(self,rhs):
+        # NB `rhs` is the exponent, a number
+        return Pow(self,rhs)
         
     def _simplify(self):
         return Simplify(self)
 
 #----------------------------------------------------------------------------
 # The `execute` method is defined in all operation classes and is used to  
-# resolve expressions into a result, by executing the nodes of a parse tree.
-# See `context._evaluate_signature`
+# resolve expressions into a result (see `context._evaluate_signature`).
+#
+# The signature of a product, quotient or power is the sum of the 
+# signatures of the leaves of the expression tree, multiplied by 
+# their powers. So, the tree is flattened, without recursion, into 
+# a mapping of leaf signatures to powers, and each distinct leaf 
+# contributes once to the result. A ratio or a simplified expression 
+# is not a sum of this kind: it is evaluated separately and the  
+# resulting signature is a leaf. 
 #----------------------------------------------------------------------------
 class UnaryOp(object):   
 
     def __init__(self,arg):
         self.arg = arg
 
+    # The `converter` argument is a `Context` method
+    # that converts a `KindOfQuantity` object into a Signature.
+    # The `stack` holds signatures. 
     def execute(self,stack,converter):
-        if isinstance( self.arg,(BinaryOp,UnaryOp) ):
-            self.arg.execute(stack,converter)
-        else:
-            stack.append( converter(self.arg) )
+        stack.append( _evaluate(self,converter) )
             
 #----------------------------------------------------------------------------
 class BinaryOp(object):   
@@ -127,21 +146,8 @@ class BinaryOp(object):
     def _simplify(self):
         return Simplify(self)
         
-    # Execution is a recursive process that reduces a tree 
-    # of Mul and Div objects to a result.
-    # The `converter` argument is a `Context` method
-    # that converts a `KindOfQuantity` object into a Signature.
-    # The `stack` holds signatures. 
     def execute(self,stack,converter):
-        if isinstance( self.lhs,(BinaryOp,UnaryOp) ):
-            self.lhs.execute(stack,converter)
-        else:
-            stack.append( converter(self.lhs) )
-            
-        if isinstance( self.rhs,(BinaryOp,UnaryOp) ):
-            self.rhs.execute(stack,converter)
-        else:
-            stack.append( converter(self.rhs) )
+        stack.append( _evaluate(self,converter) )
 
 #----------------------------------------------------------------------------
 class Simplify(UnaryOp):
@@ -149,50 +155,24 @@ class Simplify(UnaryOp):
     def __init__(self,arg):
         UnaryOp.__init__(self,arg) 
 
-    def execute(self,stack,converter):
-        super(Simplify,self).execute(stack,converter)    
-        # The stack holds Signature objects
-        x = stack.pop()
-        stack.append( x.simplify() )
-
 #----------------------------------------------------------------------------
 class Pow(BinaryOp):   
 
+    # The `rhs` is an exponent, not a kind of quantity
     def __init__(self,lhs,rhs):
         BinaryOp.__init__(self,lhs,rhs) 
-
-    def execute(self,stack,converter):
-        super(Pow,self).execute(stack,converter)    
-        # The stack holds Signature objects
-        r = stack.pop()
-        l = stack.pop()
-        stack.append( l ** r )
         
 #----------------------------------------------------------------------------
 class Mul(BinaryOp):   
 
     def __init__(self,lhs,rhs):
         BinaryOp.__init__(self,lhs,rhs) 
-
-    def execute(self,stack,converter):
-        super(Mul,self).execute(stack,converter)    
-        # The stack holds Signature objects
-        r = stack.pop()
-        l = stack.pop()
-        stack.append( l * r )
         
 #----------------------------------------------------------------------------
 class Div(BinaryOp):   
 
     def __init__(self,lhs,rhs):
         BinaryOp.__init__(self,lhs,rhs) 
-    
-    def execute(self,stack,converter):
-        super(Div,self).execute(stack,converter)    
-        # The stack holds Signature objects
-        r = stack.pop()
-        l = stack.pop()
-        stack.append( l / r )
         
 #----------------------------------------------------------------------------
 class Ratio(BinaryOp):   
@@ -200,12 +180,54 @@ class Ratio(BinaryOp):
     def __init__(self,lhs,rhs):
         BinaryOp.__init__(self,lhs,rhs) 
 
-    def execute(self,stack,converter):
-        super(Ratio,self).execute(stack,converter)    
-        # The stack holds Signature objects
-        r = stack.pop()
-        l = stack.pop()
-        stack.append( l // r )
+#----------------------------------------------------------------------------
+def _exponents(expression,converter):
+    """
+    Return a mapping of leaf signatures to powers for ``expression``
+    
+    """
+    powers = dict()
+    
+    stack = [ (expression,1) ]
+    while stack:
+        node, power = stack.pop()
+        
+        if isinstance(node,Mul):
+            stack.append( (node.lhs,power) )
+            stack.append( (node.rhs,power) )
+        elif isinstance(node,Div):
+            stack.append( (node.lhs,power) )
+            stack.append( (node.rhs,-power) )
+        elif isinstance(node,Pow):
+            stack.append( (node.lhs,power*node.rhs) )
+        else:
+            if isinstance(node,Ratio):
+                sig = _evaluate(node.lhs,converter) // _evaluate(node.rhs,converter)
+            elif isinstance(node,Simplify):
+                sig = _evaluate(node.arg,converter).simplify()
+            else:
+                sig = converter(node)
+            
+            # Zero powers are kept: they contribute zeros to the result
+            powers[sig] = powers.get(sig,0) + power
+            
+    return powers 
+    
+def _evaluate(expression,converter):
+    """
+    Return the signature of ``expression``
+    
+    """
+    if not isinstance( expression,(BinaryOp,UnaryOp) ):
+        return converter(expression)
+        
+    result = None 
+    for sig,power in _exponents(expression,converter).items():
+        if power != 1:
+            sig = sig ** power 
+        result = sig if result is None else result * sig 
+        
+    return result 
 
 #----------------------------------------------------------------------------
 # The kind of quantity of all numbers
@@ -0,0 +1,211 @@
+from QV.quantity_value import ValueUnit, _conversion_to
+from QV.quantity_array import QArray, np, _require_numpy
+from QV.scale import RatioScale
+
+__all__ = ( 'MixedQArray', 'mixed_qarray' )
+
+#----------------------------------------------------------------------------
+# A mixed-unit array holds raw values and, for each value, the id of its
+# unit in a register (see `RegisteredUnit.unit_id`). Every unit must be
+# for the same kind of quantity. Conversions between scales are affine, 
+# so each unit is described by the factor and offset of its conversion 
+# to the reference unit, held in arrays indexed by unit id. Converting 
+# the whole array is then a gather of factors and offsets by id, with 
+# no per-element unit objects.
+#
+class MixedQArray(object):
+
+    """
+    An array of numbers with a unit for each element.
+
+    The unit of element ``i`` is ``register.unit_for_id( codes[i] )``.
+    All the units must be for the same kind of quantity.
+
+    """
+
+    def __init__(self,values,codes,register):
+        _require_numpy()
+
+        values = np.asarray(values)
+        codes = np.asarray(codes)
+        if values.shape != codes.shape:
+            raise RuntimeError(
+                "the values and codes have different shapes: {} and {}".format(
+                    values.shape,codes.shape
+                )
+            )
+        if codes.size and not np.issubdtype(codes.dtype,np.integer):
+            raise RuntimeError(
+                "unit codes must be integers, got {}".format(codes.dtype)
+            )
+
+        # The conversion of each unit is resolved once
+        ids = np.unique(codes)
+        size = int( ids[-1] ) + 1 if ids.size else 0
+        factors = np.zeros(size,dtype=float)
+        offsets = np.zeros(size,dtype=float)
+        ref_unit = None
+        for i in ids.tolist():
+            u = register.unit_for_id(i)
+            ref_unit, fn = _conversion_to(u,ref_unit)
+            offsets[i] = fn(0.0)
+            factors[i] = fn(1.0) - offsets[i]
+
+        self._values = values
+        self._codes = codes
+        self._register = register
+        self._ids = ids
+        self._ref_unit = ref_unit
+        self._factors = factors
+        self._offsets = offsets
+
+    def __repr__(self):
+        return "{!s}({!s},{!s},{!s})".format(
+            'mixed_qarray',
+            np.array2string(self._values,separator=','),
+            np.array2string(self._codes,separator=','),
+            self._register
+        )
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self,index):
+        x = self._values[index]
+        c = self._codes[index]
+        if isinstance(x,np.ndarray):
+            return MixedQArray(x,c,self._register)
+        else:
+            return ValueUnit(x,self._register.unit_for_id(c))
+
+    @property
+    def values(self):
+        """The raw values"""
+        return self._values
+
+    @property
+    def codes(self):
+        """The unit id of each value"""
+        return self._codes
+
+    @property
+    def register(self):
+        """The register of the units"""
+        return self._register
+
+    @property
+    def units(self):
+        """The units of the values, in order of unit id"""
+        return tuple( 
+            self._register.unit_for_id(i) for i in self._ids.tolist() 
+        )
+
+    @property
+    def reference_unit(self):
+        """The reference unit for the kind of quantity"""
+        return self._ref_unit
+
+    def qarray(self,unit=None):
+        """
+        Return a :class:`.QArray` of the values in one unit
+
+        When ``unit`` is ``None``, the reference unit is used.
+
+        """
+        if self._ref_unit is None:
+            raise RuntimeError("no values")
+            
+        x = self._factors[self._codes]*self._values
+        if self._offsets.any():
+            x += self._offsets[self._codes]
+
+        if unit is None:
+            return QArray( x, self._ref_unit )
+        else:
+            u, fn = _conversion_to(self._ref_unit,unit)
+            return QArray( fn(x), u )
+
+    # Reductions are done for each unit, on the raw values,
+    # then the results for each unit are converted
+    def _group_sums(self):
+        n = len(self._factors)
+        codes = self._codes.ravel()
+        counts = np.bincount(codes,minlength=n)
+        sums = np.bincount(codes,weights=self._values.ravel(),minlength=n)
+        return counts, sums
+
+    def counts(self):
+        """Return the number of values for each unit (indexed by unit id)"""
+        return np.bincount( self._codes.ravel(), minlength=len(self._factors) )
+
+    def sum(self):
+        """Return the sum of the values, in the reference unit"""
+        for u in self.units:
+            if type(u.scale) is not RatioScale:
+                raise RuntimeError(
+                    "cannot add values on {!r}".format(u.scale)
+                )
+        counts, sums = self._group_sums()
+        return ValueUnit( float( self._factors @ sums ), self._ref_unit )
+
+    def mean(self):
+        """Return the mean of the values, in the reference unit"""
+        counts, sums = self._group_sums()
+        n = counts.sum()
+        if n == 0:
+            raise RuntimeError("no values")
+        total = self._factors @ sums + self._offsets @ counts
+        return ValueUnit( float( total/n ), self._ref_unit )
+
+    def _extreme(self,ufunc,initial):
+        if self._values.size == 0:
+            raise RuntimeError("no values")
+
+        groups = np.full( len(self._factors), initial )
+        ufunc.at( groups, self._codes.ravel(), self._values.ravel() )
+
+        # Conversions preserve order
+        present = self.counts() > 0
+        converted = self._factors[present]*groups[present] + self._offsets[present]
+        return ValueUnit( float( ufunc.reduce(converted) ), self._ref_unit )
+
+    def min(self):
+        """Return the smallest value, in the reference unit"""
+        return self._extreme(np.minimum,np.inf)
+
+    def max(self):
+        """Return the largest value, in the reference unit"""
+        return self._extreme(np.maximum,-np.inf)
+
+#----------------------------------------------------------------------------
+def mixed_qarray(values,codes,register):
+    """
+    Create a new mixed-unit quantity array object.
+
+    ``values`` is a sequence of measures (or a NumPy array), ``codes`` is
+    a sequence of integers (or a NumPy array) that holds the id of the 
+    unit in ``register`` for each measure (see :meth:`.UnitRegister.unit_for_id`).
+
+    Example ::
+
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> V, mV = volt.unit_id, millivolt.unit_id
+        >>> x = mixed_qarray( [1.5, 250, 0.75], [V, mV, V], ureg )
+        >>> print( x[1] )
+        250.0 mV
+        >>> print( x.qarray() )
+        [1.5  0.25 0.75] V
+        >>> print( x.max() )
+        1.5 V
+
+    """
+    return MixedQArray(values,codes,register)
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
@@ -0,0 +1,100 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from QV.quantity_value import ValueUnit, _resolve_conversion
+
+__all__ = ( 'qresult_map', )
+
+#----------------------------------------------------------------------------
+# Worker processes receive a pickled copy of the unit register once,
+# when the process starts. The conversion is then resolved in the worker,
+# against its own copy of the register, and chunks of raw values are sent
+# to be converted. Only numbers are returned: the parent process attaches
+# its own (live) unit to the results.
+#
+_worker_conversion = None
+
+def _initialise_worker(payload):
+    global _worker_conversion
+
+    unit_expr, target, simplify = pickle.loads(payload)
+    _worker_conversion = _resolve_conversion(unit_expr,target,simplify)[1]
+
+def _convert_chunk(chunk):
+    fn = _worker_conversion
+    return [ fn(x) for x in chunk ]
+
+#----------------------------------------------------------------------------
+def qresult_map(
+    values,
+    unit,
+    target=None,
+    simplify=True,
+    workers=None,
+    chunk_size=None
+):
+    """
+    Return a list of quantity values for ``values`` measured in ``unit``
+
+    The results are the same as applying :func:`.qresult` to each value,
+    with ``target`` and ``simplify`` used as the ``unit`` and ``simplify``
+    arguments of :func:`.qresult`, and they are returned in order.
+
+    The conversion is shared between up to ``workers`` processes
+    (the default is the number of processors). The unit register
+    is sent to each process once and ``values`` is partitioned
+    into chunks of ``chunk_size`` values.
+
+    Example ::
+
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> results = qresult_map( [1.5, 250, 12], millivolt, workers=2 )
+        >>> [ str(r) for r in results ]
+        ['0.0015 V', '0.25 V', '0.012 V']
+        >>> results[0].unit is volt
+        True
+
+    """
+    values = list(values)
+
+    # Resolving in this process checks the arguments
+    # and provides the unit for the results
+    u, fn = _resolve_conversion(unit,target,simplify)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 or len(values) < 2:
+        return [ ValueUnit( fn(x), u ) for x in values ]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialise_worker,
+        initargs=( pickle.dumps( (unit,target,simplify) ), )
+    ) as executor:
+
+        if chunk_size is None:
+            # A few chunks for each worker helps to balance the load
+            n = 4*workers
+            chunk_size = max( 1, -(-len(values) // n) )
+
+        chunks = (
+            values[i:i+chunk_size]
+                for i in range(0,len(values),chunk_size)
+        )
+
+        return [
+            ValueUnit( x, u )
+                for chunk in executor.map(_convert_chunk,chunks)
+                    for x in chunk
+        ]
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
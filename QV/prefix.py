@@ -46,7 +46,7 @@ class Prefix(object):
             )
             
         # Must be applied to a reference unit
-        if register.reference_unit_for(unit) is not unit:
+        if getattr(unit,'reference_unit',None) is not unit:
             raise RuntimeError(
                 "{!r} is a derived scale".format(scale)
             )
@@ -0,0 +1,415 @@
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from QV.quantity_value import ValueUnit, _resolve_conversion, _conversion_to, _ordered_values
+from QV.signature import _rational_exponent
+from QV.scale import RatioScale
+
+__all__ = ( 'QArray', 'qarray' )
+
+#----------------------------------------------------------------------------
+# NumPy is not a requirement of QV, it is only needed for quantity arrays.
+def _require_numpy():
+    if np is None:
+        raise RuntimeError(
+            "NumPy is required for quantity arrays"
+        )
+
+#----------------------------------------------------------------------------
+class QArray(ValueUnit):
+
+    """
+    An array of numbers and an associated unit.
+
+    A ``QArray`` is a :class:`.ValueUnit` with a NumPy array
+    as the value, so the unit applies to every element.
+    Arithmetic is the same as for :class:`.ValueUnit`, but
+    the numerical work is done on the whole array at once.
+
+    """
+    __slots__ = ()
+
+    def __init__(self,value,unit):
+        _require_numpy()
+        ValueUnit.__init__(self,np.asarray(value),unit)
+
+    def __repr__(self):
+        return "{!s}({!s},{!s})".format(
+            'qarray',
+            np.array2string(self.value,separator=','),
+            self.unit.scale.name
+        )
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        u = self.unit
+        for x in self.value:
+            yield ValueUnit(x,u)
+
+    def __getitem__(self,index):
+        x = self.value[index]
+        if isinstance(x,np.ndarray):
+            return QArray(x,self.unit)
+        else:
+            return ValueUnit(x,self.unit)
+
+    # The ValueUnit operations return ValueUnit objects,
+    # which are converted here. When the left-hand operand
+    # is a ValueUnit, Python will try the reflected
+    # operations of QArray first. As for NumPy arrays, 
+    # operands that set `__array_ufunc__ = None` (e.g., 
+    # chunked arrays) are left to their reflected operations.
+    def __add__(self,rhs):
+        if _defers(rhs):
+            return NotImplemented
+        return _as_qarray( ValueUnit.__add__(self,rhs) )
+
+    def __radd__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_qarray( ValueUnit.__add__(lhs,self) )
+        return _as_qarray( ValueUnit.__radd__(self,lhs) )
+
+    def __sub__(self,rhs):
+        if _defers(rhs):
+            return NotImplemented
+        return _as_qarray( ValueUnit.__sub__(self,rhs) )
+
+    def __rsub__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_qarray( ValueUnit.__sub__(lhs,self) )
+        return _as_qarray( ValueUnit.__rsub__(self,lhs) )
+
+    def __mul__(self,rhs):
+        if _defers(rhs):
+            return NotImplemented
+        return _as_qarray( ValueUnit.__mul__(self,rhs) )
+
+    def __rmul__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_qarray( ValueUnit.__mul__(lhs,self) )
+        return _as_qarray( ValueUnit.__rmul__(self,lhs) )
+
+    def __truediv__(self,rhs):
+        if _defers(rhs):
+            return NotImplemented
+        return _as_qarray( ValueUnit.__truediv__(self,rhs) )
+
+    def __rtruediv__(self,lhs):
+        if isinstance(lhs,ValueUnit):
+            return _as_qarray( ValueUnit.__truediv__(lhs,self) )
+        return _as_qarray( ValueUnit.__rtruediv__(self,lhs) )
+
+    def __pow__(self,rhs):
+        # NumPy would create an object array for a Fraction exponent 
+        rhs = _rational_exponent(rhs)
+        return QArray( self.value ** float(rhs), self.unit ** rhs )
+
+    # Statistics are calculated by NumPy on the values. The unit of 
+    # the result is found once, from the unit of the array. Results 
+    # that are differences (a spread of values) need a ratio scale.
+    def mean(self,axis=None):
+        """Return the mean of the values"""
+        return _result( np.mean(self.value,axis=axis), self.unit )
+
+    def median(self,axis=None):
+        """Return the median of the values"""
+        return _result( np.median(self.value,axis=axis), self.unit )
+
+    def percentile(self,q,axis=None):
+        """Return the ``q``-th percentile(s) of the values"""
+        return _result( np.percentile(self.value,q,axis=axis), self.unit )
+
+    def ptp(self,axis=None):
+        """Return the range of the values (maximum - minimum)"""
+        _check_ratio_scale(self.unit,'range')
+        return _result( np.ptp(self.value,axis=axis), self.unit )
+
+    def var(self,axis=None,ddof=0):
+        """
+        Return the variance of the values, in the unit squared
+
+        ``ddof`` is the delta degrees of freedom, as for NumPy.
+
+        """
+        _check_ratio_scale(self.unit,'variance')
+        return _result( np.var(self.value,axis=axis,ddof=ddof), self.unit**2 )
+
+    def std(self,axis=None,ddof=0):
+        """
+        Return the standard deviation of the values
+
+        ``ddof`` is the delta degrees of freedom, as for NumPy.
+
+        """
+        _check_ratio_scale(self.unit,'standard deviation')
+        return _result( np.std(self.value,axis=axis,ddof=ddof), self.unit )
+
+    def histogram(self,bins=10,range=None):
+        """
+        Return the histogram of the values, as a pair of 
+        an array of counts and a :class:`.QArray` of bin edges
+
+        ``bins`` is the number of bins, or a quantity array of 
+        bin edges, ``range`` is a pair of quantity values for 
+        the lower and upper limits of the bins. Quantities in 
+        other units are converted to the unit of the array.
+
+        Example ::
+
+            >>> context = Context( ("Voltage","V"), )
+            >>> ureg = UnitRegister("ureg",context)
+            >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+            >>> millivolt = ureg.unit( prefix.milli(volt) )
+            >>> x = qarray( [0.1, 0.25, 0.4, 0.9], volt )
+            >>> counts, edges = x.histogram( 2, (qvalue(0,millivolt),qvalue(1,volt)) )
+            >>> counts
+            array([3, 1])
+            >>> edges
+            qarray([0. ,0.5,1. ],volt)
+
+        """
+        if isinstance(bins,ValueUnit):
+            bins = _values_in(bins,self.unit)
+        if range is not None:
+            range = tuple( _values_in(r,self.unit) for r in range )
+
+        counts, edges = np.histogram(self.value,bins=bins,range=range)
+        return counts, QArray(edges,self.unit)
+
+def _defers(operand):
+    return getattr(operand,'__array_ufunc__',False) is None
+
+def _as_qarray(value_unit):
+    if value_unit is NotImplemented:
+        return value_unit
+    else:
+        return QArray(value_unit.value,value_unit.unit)
+
+def _result(x,unit):
+    if isinstance(x,np.ndarray):
+        return QArray(x,unit)
+    else:
+        return ValueUnit(x,unit)
+
+def _check_ratio_scale(unit,statistic):
+    if type(unit.scale) is not RatioScale:
+        raise RuntimeError(
+            "cannot calculate the {} of values on {!r}".format(
+                statistic,unit.scale
+            )
+        )
+
+def _values_in(value_unit,unit):
+    """
+    Return the value(s) of ``value_unit`` converted to ``unit``
+    
+    """
+    if value_unit.unit is unit:
+        return value_unit.value
+
+    return _conversion_to(value_unit.unit,unit)[1](value_unit.value)
+
+#----------------------------------------------------------------------------
+# NumPy ufuncs and functions applied to quantity values (and arrays) are
+# dispatched here by `ValueUnit.__array_ufunc__` and `__array_function__`.
+# Ufuncs that correspond to arithmetic use the ValueUnit operations, so
+# the unit of the result is found in the usual way, once, and NumPy does
+# the numerical work on the values. Other ufuncs and functions are listed
+# by the way they affect the unit. Anything else, including the ``out``
+# argument, is not supported and NumPy raises a ``TypeError``.
+#
+def _as_result(value_unit):
+    if value_unit is NotImplemented:
+        return value_unit
+    else:
+        return _result(value_unit.value,value_unit.unit)
+
+def _reference_unit(lhs,rhs):
+    if lhs.unit is rhs.unit:
+        return lhs.unit
+    else:
+        return _resolve_conversion(lhs.unit,simplify=False)[0]
+
+if np is not None:
+
+    # Arithmetic: the method names for `lhs` and (reflected) `rhs`
+    _UFUNC_OPERATORS = {
+        np.add: ('__add__',None),
+        np.subtract: ('__sub__',None),
+        np.multiply: ('__mul__','__rmul__'),
+        np.true_divide: ('__truediv__','__rtruediv__'),
+        np.power: ('__pow__',None),
+    }
+
+    # The unit is unchanged
+    _UFUNC_SAME_UNIT = {
+        np.negative, np.positive, np.absolute, np.fabs,
+        np.floor, np.ceil, np.trunc, np.rint,
+    }
+
+    # The unit is raised to a power
+    _UFUNC_POWERS = {
+        np.sqrt: Fraction(1,2),
+        np.cbrt: Fraction(1,3),
+        np.square: 2,
+        np.reciprocal: -1,
+    }
+
+    # The result is not a quantity
+    _UFUNC_NO_UNIT = { np.isnan, np.isinf, np.isfinite, np.signbit }
+
+    # Both operands are converted to a common unit
+    _UFUNC_COMPARISONS = {
+        np.less, np.less_equal, np.greater, np.greater_equal,
+        np.equal, np.not_equal,
+    }
+    _UFUNC_EXTREMES = { np.maximum, np.minimum, np.fmax, np.fmin }
+
+    _FUNCTIONS_SAME_UNIT = {
+        np.mean, np.median, np.percentile, np.quantile,
+        np.min, np.max, np.amin, np.amax,
+        np.sort, np.copy, np.reshape, np.ravel, np.transpose,
+        np.squeeze, np.round,
+    }
+
+    # Sums and spreads of values need a ratio scale
+    _FUNCTIONS_RATIO_SCALE = {
+        np.sum, np.cumsum, np.std, np.ptp, np.diff,
+    }
+
+    _FUNCTIONS_NO_UNIT = {
+        np.shape, np.ndim, np.size, np.argsort, np.argmin, np.argmax,
+    }
+
+    _FUNCTIONS_JOIN = { np.concatenate, np.stack, np.hstack, np.vstack }
+
+def _array_ufunc(ufunc,method,inputs,kwargs):
+    if kwargs.get('out') is not None:
+        return NotImplemented
+
+    if method == 'reduce':
+        x, = inputs
+        if ufunc in _UFUNC_EXTREMES:
+            return _result( ufunc.reduce(x.value,**kwargs), x.unit )
+        elif ufunc is np.add:
+            _check_ratio_scale(x.unit,'sum')
+            return _result( ufunc.reduce(x.value,**kwargs), x.unit )
+        else:
+            return NotImplemented
+
+    if method != '__call__' or kwargs:
+        return NotImplemented
+
+    if ufunc in _UFUNC_OPERATORS:
+        lhs, rhs = inputs
+        name, rname = _UFUNC_OPERATORS[ufunc]
+        if isinstance(lhs,ValueUnit) and (
+            isinstance(rhs,ValueUnit) or rname is not None
+            or ufunc is np.power
+        ):
+            return _as_result( getattr(lhs,name)(rhs) )
+        elif rname is not None:
+            return _as_result( getattr(rhs,rname)(lhs) )
+        else:
+            return NotImplemented
+
+    elif ufunc in _UFUNC_SAME_UNIT:
+        x, = inputs
+        return _result( ufunc(x.value), x.unit )
+
+    elif ufunc in _UFUNC_POWERS:
+        x, = inputs
+        return _result( ufunc(x.value), x.unit ** _UFUNC_POWERS[ufunc] )
+
+    elif ufunc in _UFUNC_NO_UNIT:
+        x, = inputs
+        return ufunc(x.value)
+
+    elif ufunc in _UFUNC_COMPARISONS or ufunc in _UFUNC_EXTREMES:
+        lhs, rhs = inputs
+        if not isinstance(lhs,ValueUnit):
+            return NotImplemented
+        l, r = _ordered_values(lhs,rhs)
+        if ufunc in _UFUNC_COMPARISONS:
+            return ufunc(l,r)
+        else:
+            return _result( ufunc(l,r), _reference_unit(lhs,rhs) )
+
+    else:
+        return NotImplemented
+
+def _array_function(func,types,args,kwargs):
+    if kwargs.get('out') is not None:
+        return NotImplemented
+
+    if func in _FUNCTIONS_JOIN:
+        arrays = list( args[0] )
+        if not arrays or not all( isinstance(a,ValueUnit) for a in arrays ):
+            return NotImplemented
+        u = arrays[0].unit
+        values = [ _values_in(a,u) for a in arrays ]
+        return QArray( func(values,*args[1:],**kwargs), u )
+
+    if func is np.histogram:
+        x = args[0]
+        if not isinstance(x,QArray):
+            x = QArray(x.value,x.unit)
+        return x.histogram(*args[1:],**kwargs)
+
+    # The other functions act on one quantity
+    x = args[0]
+    others = list(args[1:]) + list( kwargs.values() )
+    if not isinstance(x,ValueUnit) or any( 
+        isinstance(a,ValueUnit) for a in others 
+    ):
+        return NotImplemented
+
+    if func in _FUNCTIONS_SAME_UNIT:
+        u = x.unit
+    elif func in _FUNCTIONS_RATIO_SCALE:
+        _check_ratio_scale(x.unit,func.__name__)
+        u = x.unit
+    elif func is np.var:
+        _check_ratio_scale(x.unit,'variance')
+        u = x.unit**2
+    elif func in _FUNCTIONS_NO_UNIT:
+        return func(x.value,*args[1:],**kwargs)
+    else:
+        return NotImplemented
+
+    return _result( func(x.value,*args[1:],**kwargs), u )
+
+#----------------------------------------------------------------------------
+def qarray(values,unit):
+    """
+    Create a new quantity array object.
+
+    ``values`` is a sequence of measures (or a NumPy array),
+    ``unit`` is the measurement scale
+
+    Example ::
+
+        >>> context = Context( ("Length","L"), ("Time","T") )
+        >>> si = UnitRegister("si",context)
+        >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        >>> centimetre = si.unit( prefix.centi(metre) )
+        >>> x = qarray( [1.5, 2.0, 3.25], centimetre )
+        >>> x
+        qarray([1.5 ,2.  ,3.25],centimetre)
+        >>> print( qresult(x) )
+        [0.015  0.02   0.0325] m
+
+    """
+    return QArray(values,unit)
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
@@ -1,9 +1,10 @@
 from QV.registered_unit import RegisteredUnit as Unit
 from QV.registered_unit import RegisteredUnitExpression
 from QV.kind_of_quantity import Number
-from QV.scale import RatioScale, IntervalScale
+from QV.scale import RatioScale, IntervalScale, AffineConversion
+from QV.signature import _rational_exponent
 
-__all__ = ('qvalue','value','unit','qresult','qratio')
+__all__ = ('qvalue','value','unit','qresult','qratio','qmap')
 
 #----------------------------------------------------------------------------
 #
@@ -68,15 +69,11 @@ class ValueUnit(object):
                 # may not be the same but both are registered, 
                 # in either case we must resolve the unit   
                 # and convert before proceeding.
-                ref_u_l = register.reference_unit_for( lhs.unit ) 
-                ref_u_r = register.reference_unit_for( rhs.unit ) 
-                
-                # For ratio scales there could be a conversion 
-                # factor to get from the resolved unit to the 
-                # reference unit.
-                
-                l_to_ref_fn = register.conversion_from_A_to_B(lhs.unit,ref_u_l)
-                r_to_ref_fn = register.conversion_from_A_to_B(rhs.unit,ref_u_r)
+                # The reference unit and the conversion factor 
+                # are kept by the register (the signature is 
+                # not simplified).
+                ref_u_l, l_to_ref_fn = _resolve_conversion(lhs.unit,simplify=False)
+                ref_u_r, r_to_ref_fn = _resolve_conversion(rhs.unit,simplify=False)
                 
                 assert ref_u_r is ref_u_l, "different units"
                     
@@ -130,15 +127,11 @@ class ValueUnit(object):
                 # in either case we must resolve the unit   
                 # and convert before proceeding.
 
-                ref_u_l = register.reference_unit_for( lhs.unit ) 
-                ref_u_r = register.reference_unit_for( rhs.unit ) 
-                
-                # For ratio scales there could be a conversion 
-                # factor to get from the resolved unit to the 
-                # reference unit.
-
-                l_to_ref_fn = register.conversion_from_A_to_B(lhs.unit,ref_u_l)
-                r_to_ref_fn = register.conversion_from_A_to_B(rhs.unit,ref_u_r)
+                # The reference unit and the conversion factor 
+                # are kept by the register (the signature is 
+                # not simplified).
+                ref_u_l, l_to_ref_fn = _resolve_conversion(lhs.unit,simplify=False)
+                ref_u_r, r_to_ref_fn = _resolve_conversion(rhs.unit,simplify=False)
                 
                 assert ref_u_r is ref_u_l, "different units"
                     
@@ -162,63 +155,265 @@ class ValueUnit(object):
             return ValueUnit( lhs - rhs.value, rhs.unit )
         else:
             return NotImplemented
+
+    # Comparisons are made after converting both values to 
+    # the reference unit, unless the units are the same. 
+    # Values of different kinds of quantity are not equal,
+    # and cannot be ordered. 
+    
+    # ValueUnit objects are mutable 
+    __hash__ = None
+    
+    def __eq__(self,rhs):
+        if not isinstance(rhs,ValueUnit):
+            return NotImplemented
+        values = _reference_values(self,rhs)
+        if values is None:
+            return False
+        return values[0] == values[1]
+        
+    def __ne__(self,rhs):
+        if not isinstance(rhs,ValueUnit):
+            return NotImplemented
+        values = _reference_values(self,rhs)
+        if values is None:
+            return True
+        return values[0] != values[1]
+        
+    def __lt__(self,rhs):
+        l, r = _ordered_values(self,rhs)
+        return l < r
+        
+    def __le__(self,rhs):
+        l, r = _ordered_values(self,rhs)
+        return l <= r
+        
+    def __gt__(self,rhs):
+        l, r = _ordered_values(self,rhs)
+        return l > r
+        
+    def __ge__(self,rhs):
+        l, r = _ordered_values(self,rhs)
+        return l >= r
   
     # Multiplication, division and exponentiation 
     # create temporary ValueUnit objects. 
     # These expose an interface with 
     # `register` and `kind_of_quantity` attributes, 
     # which allow a kind_of_quantity and hence a unit to be resolved.
+    # When the register collapses results, products and quotients 
+    # are resolved immediately, if possible (see `_product` and 
+    # `_collapsed`).
     
     def __mul__(self,rhs):
         lhs = self
         if hasattr(rhs,'unit'):                      
             assert lhs.unit.register is rhs.unit.register, "different unit registers"
             
-            return ValueUnit(lhs.value * rhs.value, lhs.unit * rhs.unit)
+            return _product(lhs,rhs,'*',lhs.value * rhs.value)
         else:
             # Assume that the `rhs` behaves as a number 
-            return ValueUnit(
-                rhs * lhs.value, 
-                lhs.unit.register.Number.unity * lhs.unit
-            )
+            return _numeric_result( _scaled( rhs * lhs.value, lhs.unit ), rhs )
             
     def __rmul__(self,lhs):
         rhs = self
         # Assume that the `lhs` behaves as a number 
-        return ValueUnit(
-            lhs * rhs.value, 
-            rhs.unit.register.Number.unity * rhs.unit
-        )
+        return _numeric_result( _scaled( lhs * rhs.value, rhs.unit ), lhs )
             
     def __truediv__(self,rhs):
         lhs = self 
         if hasattr(rhs,'unit'):          
             assert lhs.unit.register is rhs.unit.register, "different unit registers"
 
-            return ValueUnit(
-                lhs.value / rhs.value,
-                lhs.unit / rhs.unit
-            )
+            return _product(lhs,rhs,'/',lhs.value / rhs.value)
             
         else:
             # Assume that the `rhs` behaves as a number 
-            return ValueUnit(
-                lhs.value / rhs, 
-                lhs.unit / lhs.unit.register.Number.unity 
-            )
+            return _numeric_result( _scaled( lhs.value / rhs, lhs.unit ), rhs )
         
     def __rtruediv__(self,lhs):
         rhs = self
         # Assume that the `lhs` behaves as a number 
-        return ValueUnit(
-            lhs / rhs.value, 
-            rhs.unit.register.Number.unity / rhs.unit
-        )
+        if type(rhs.unit.scale) is RatioScale:
+            result = _collapsed( lhs / rhs.value, rhs.unit ** -1 )
+        else:
+            # Raises an exception 
+            result = _collapsed(
+                lhs / rhs.value, 
+                rhs.unit.register.Number.unity / rhs.unit
+            )
+        return _numeric_result( result, lhs )
                                         
+    # NumPy ufuncs and functions are handled 
+    # in the `array` module (NumPy is optional)
+    def __array_ufunc__(self,ufunc,method,*inputs,**kwargs):
+        from QV.quantity_array import _array_ufunc
+        return _array_ufunc(ufunc,method,inputs,kwargs)
+        
+    def __array_function__(self,func,types,args,kwargs):
+        from QV.quantity_array import _array_function
+        return _array_function(func,types,args,kwargs)
+        
     def __pow__(self,rhs):
-        # work in progress!
-        return NotImplemented
+        # `rhs` must be an integer or a Fraction. 
+        # The unit expression is a single node and 
+        # the conversion factor is raised to the power. 
+        rhs = _rational_exponent(rhs)
+        return ValueUnit(
+            self.value ** rhs,
+            self.unit ** rhs
+        )
+        
+#----------------------------------------------------------------------------
+class NormalisedValueUnit(ValueUnit):
+    """
+    A number in a reference unit, and the unit that 
+    was used to create it (see :class:`.UnitRegister`)
+    
+    """
+    __slots__ = ("display_unit",)
+    
+    # Results, e.g., from `qresult`, are ordinary quantity values
+    _result_type = ValueUnit
+    
+    def __init__(self,value,unit,display_unit):
+        ValueUnit.__init__(self,value,unit)
+        self.display_unit = display_unit
+        
+    def __repr__(self):
+        return repr( qresult(self) )
+        
+    def __str__(self):
+        return str( qresult(self) )
         
+    # The sum or difference of values created with the  
+    # same unit remembers that unit 
+    def __add__(self,rhs):
+        return _keep_display_unit( ValueUnit.__add__(self,rhs), self, rhs )
+        
+    def __sub__(self,rhs):
+        return _keep_display_unit( ValueUnit.__sub__(self,rhs), self, rhs )
+        
+def _keep_display_unit(result,lhs,rhs):
+    display_unit = getattr(rhs,'display_unit',None)
+    if display_unit is lhs.display_unit and result.unit is lhs.unit:
+        return NormalisedValueUnit(result.value,result.unit,display_unit)
+    else:
+        return result
+
+def _to_reference(unit):
+    # The reference unit and conversion for a registered unit 
+    # are found once and kept by the register
+    to_reference = unit.register._to_reference
+    if unit not in to_reference:
+        to_reference[unit] = _resolve_conversion(unit,simplify=False)
+    return to_reference[unit]
+    
+def _collapsed(value,unit):
+    # A unit expression is replaced by the reference unit when the 
+    # register collapses results and the kind of quantity is declared.
+    # The reference unit and the conversion factor are kept in the 
+    # register's table of operations.
+    register = unit.register
+    if (
+        not register.collapse 
+    or  isinstance(unit,Unit) 
+    or  type(unit.scale) is not RatioScale
+    ):
+        return ValueUnit(value,unit)
+        
+    # As for addition, the signature is not simplified
+    entry = register._operation(None,unit,None,False)
+    if entry is None:
+        # The kind of quantity, or its reference unit, is not declared
+        return ValueUnit(value,unit)
+        
+    return ValueUnit( entry.factor * value, entry.unit )
+    
+def _scaled(value,unit):
+    # Multiplying or dividing by a number does not change a unit 
+    # on a ratio scale, so no unit expression is needed 
+    if type(unit.scale) is RatioScale:
+        if isinstance(unit,Unit):
+            return ValueUnit(value,unit)
+        return _collapsed(value,unit)
+    else:
+        # Raises an exception 
+        return _collapsed( value, unit.register.Number.unity * unit )
+    
+def _numeric_result(result,number):
+    # A NumPy array of numbers gives an array of quantity values, 
+    # whichever side of the operator it is on (`array * value` is 
+    # dispatched to the `array` module by `__array_ufunc__`)
+    if hasattr(number,'__array_ufunc__'):
+        from QV.quantity_array import _result
+        return _result(result.value,result.unit)
+    else:
+        return result
+    
+def _product(lhs,rhs,op,value):
+    # The product or quotient of two quantity values. When results  
+    # are collapsed, the register's table of operations provides 
+    # the reference unit and the conversion factor in one look-up.
+    register = lhs.unit.register
+    if register.collapse:
+        # As for addition, the signature is not simplified
+        entry = register._operation(op,lhs.unit,rhs.unit,False)
+        if entry is not None:
+            return ValueUnit( entry.factor * value, entry.unit )
+            
+    if op == '*':
+        return ValueUnit( value, lhs.unit * rhs.unit )
+    else:
+        return ValueUnit( value, lhs.unit / rhs.unit )
+    
+#----------------------------------------------------------------------------
+def _reference_values(lhs,rhs):
+    """
+    Return the values of ``lhs`` and ``rhs`` in a common unit,
+    or ``None`` if they are not the same kind of quantity 
+    
+    """
+    if lhs.unit is rhs.unit:
+        return lhs.value, rhs.value
+        
+    if lhs.unit.register is not rhs.unit.register:
+        return None
+        
+    try:
+        # The signatures are compared first, because there may be 
+        # no reference unit for a different kind of quantity 
+        if _signature(lhs.unit) != _signature(rhs.unit):
+            return None
+            
+        # As for addition, the signatures are not simplified
+        ref_u_l, l_to_ref_fn = _resolve_conversion(lhs.unit,simplify=False)
+        ref_u_r, r_to_ref_fn = _resolve_conversion(rhs.unit,simplify=False)
+    except (KeyError,RuntimeError):
+        # The kind of quantity, or a conversion, is not declared
+        return None
+    
+    if ref_u_l is not ref_u_r:
+        return None
+        
+    return l_to_ref_fn(lhs.value), r_to_ref_fn(rhs.value)
+    
+def _signature(unit):
+    if isinstance(unit,Unit):
+        return unit.signature
+    else:
+        return unit.register.context._evaluate_signature( 
+            unit.kind_of_quantity 
+        )
+    
+def _ordered_values(lhs,rhs):
+    values = _reference_values(lhs,rhs) if isinstance(rhs,ValueUnit) else None
+    if values is None:
+        raise RuntimeError(
+            "cannot compare {!r} and {!r}".format(lhs,rhs)
+        )
+    return values
+    
 #----------------------------------------------------------------------------
 def qvalue(value,unit):
     """
@@ -235,7 +430,28 @@ def qvalue(value,unit):
         >>> qvalue( 1.84, metre )
         qvalue(1.84,metre)
         
+    When the register normalises values, values for ratio-scale units 
+    are stored in the reference unit, but are displayed in ``unit``
+    
+        >>> si = UnitRegister("si",context,normalise=True)
+        >>> metre = si.unit( RatioScale(context['Length'],'metre','m') ) 
+        >>> centimetre = si.unit( prefix.centi(metre) ) 
+        >>> x = qvalue( 25, centimetre ) + qvalue( 50, centimetre )
+        >>> x.value, x.unit.scale.symbol
+        (0.75, 'm')
+        >>> print( x )
+        75.0 cm
+        
     """
+    if (
+        unit.register.normalise 
+    and isinstance(unit,Unit) 
+    and type(unit.scale) is RatioScale
+    ):
+        ref_unit, fn = _to_reference(unit)
+        if ref_unit is not unit:
+            return NormalisedValueUnit( fn(value), ref_unit, unit )
+            
     return ValueUnit(value,unit)
     
 #----------------------------------------------------------------------------
@@ -301,32 +517,139 @@ def qresult(
         displacement = 0.8 m
         
     """
-    register = value_unit.unit.register 
+    if unit is None:
+        # Normalised values are reported in their original unit 
+        unit = getattr(value_unit,'display_unit',None)
+        
+    u, fn = _resolve_conversion(value_unit.unit,unit,simplify)
+    
+    # The result has the same type as `value_unit` 
+    # (there are array-backed quantity values too), 
+    # unless the type names another type for results
+    cls = getattr(value_unit,'_result_type',value_unit.__class__)
+    return cls( 
+        value_result(
+            fn( value_unit.value ), 
+            *arg, 
+            **kwarg
+        ), 
+        u  
+    )
+        
+#----------------------------------------------------------------------------
+def qmap(fn,*iterables,unit=None,simplify=True):
+    """
+    Yield ``qresult( fn(*args), unit, simplify )`` for ``args`` taken 
+    from ``iterables`` in turn (as for the built-in ``map``)
+    
+    ``fn`` is a function of quantity values, like ``lambda d,t: d/t``. 
+    It is called once for each ``args``, with full unit checking. 
+    The unit of the result and its conversion are resolved the first 
+    time that unit is seen and are used again for later results in 
+    the same unit (usually, from arguments with the same units).
+    
+    Example ::
+    
+        >>> context = Context( ("Length","L"), ("Time","T") )
+        >>> Speed = context.declare('Speed','V','Length/Time')
+        >>> si =  UnitRegister("si",context)
+        >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        >>> second = si.unit( RatioScale(context['Time'],'second','s') )
+        >>> metre_per_second = si.unit( RatioScale(context['Speed'],'metre_per_second','m*s-1') )
+        >>> d = [ qvalue(x,metre) for x in (0.5,1.5,3.0) ]
+        >>> t = [ qvalue(x,second) for x in (1.0,2.0,4.0) ]
+        >>> [ str(v) for v in qmap( lambda d,t: d/t, d, t ) ]
+        ['0.5 m*s-1', '0.75 m*s-1', '0.75 m*s-1']
+        
+    """
+    # (unit of the result, unit to report) - keys; 
+    # (reported unit, conversion) - values 
+    cache = dict()
+    
+    for args in zip(*iterables):
+        result = fn(*args)
+        
+        # As for `qresult`
+        if unit is None:
+            target = getattr(result,'display_unit',None)
+        else:
+            target = unit
+            
+        key = (result.unit,target)
+        if key in cache:
+            u, convert = cache[key]
+        else:
+            u, convert = cache[key] = _resolve_conversion(
+                result.unit,target,simplify
+            )
+        
+        cls = getattr(result,'_result_type',result.__class__)
+        yield cls( convert( result.value ), u )
+        
+#----------------------------------------------------------------------------
+def _resolve_conversion(unit_expr,unit=None,simplify=True):
+    """
+    Return the unit that :func:`.qresult` would report for values 
+    in ``unit_expr`` and the function that converts those values 
+    
+    ``unit_expr`` is a registered unit or unit expression,
+    ``unit`` and ``simplify`` are as for :func:`.qresult`.
+    The resolution is done once, so the function returned 
+    may be applied to any number of values (or to an array). 
     
-    if simplify and not value_unit.unit.is_simplified:
-        u = value_unit.unit.simplify()
+    """
+    register = unit_expr.register 
+    
+    if (
+        not unit 
+    and not isinstance(unit_expr,Unit) 
+    and type(unit_expr.scale) is RatioScale
+    ):
+        # A unit expression, the reference unit and the conversion  
+        # factor are kept in the register's table of operations
+        entry = register._operation(None,unit_expr,None,simplify)
+        if entry is not None:
+            return entry.unit, AffineConversion( entry.factor )
+        
+    if simplify and not unit_expr.is_simplified:
+        u = unit_expr.simplify()
     else:
-        u = value_unit.unit
+        u = unit_expr
         
-    u_scale_type = type(u.scale)
-
-    # This can find the ref unit, but if we are dealing 
-    # with a unit expression, we don't know how to 
-    # convert to that ref unit! The same applies to 
-    # a preferred unit. 
-    ref_unit = register.reference_unit_for( u )
+    if not unit and isinstance(u,Unit) and u.reference_factor is not None:
+        # A registered unit on a ratio scale, so the reference 
+        # unit and the factor were found when it was registered 
+        ref_unit = u.reference_unit
+        if ref_unit is u:
+            return u, AffineConversion(1)
+        else:
+            return ref_unit, AffineConversion( u.reference_factor )
+        
+    if type(u.scale) is RatioScale:
+        # This can find the ref unit, but if we are dealing 
+        # with a unit expression, we don't know how to 
+        # convert to that ref unit! The same applies to 
+        # a preferred unit. 
+        ref_unit = register.reference_unit_for( u )
+        koq = ref_unit.scale.kind_of_quantity
+    else:
+        # A registered unit on an interval scale. The reference 
+        # unit, if there is one, is on a ratio scale. 
+        koq = u.kind_of_quantity
+        ref_unit = register._koq_to_ref_unit.get(koq)
     
     # ``unit`` may be a string.
     if unit:
     
-        koq = ref_unit.scale.kind_of_quantity
-        ref_scale_type = type(ref_unit.scale)
-        
-        units_dict = register.get(koq,ref_scale_type)
-        
         if isinstance(unit,str):
-            if unit in units_dict:
-                unit = units_dict[unit]
+            # The units are looked up directly, because 
+            # `register.get` creates an empty `UnitsDict`
+            units_dicts = register._koq_to_units_dict.get(koq,{})
+            for scale_type in (RatioScale,IntervalScale):
+                units_dict = units_dicts.get(scale_type,())
+                if unit in units_dict:
+                    unit = units_dict[unit]
+                    break
             else:
                 raise RuntimeError(
                     "{} is not a unit for {!r}".format(
@@ -335,36 +658,72 @@ def qresult(
                     )
                 )
             
-        # # Do not simplify dimensionless units 
-        # simplify = not preferred_unit.is_dimensionless and simplify 
-        
-        # if simplify:
-            # ref_unit = register.reference_unit_for( 
-                # value_unit.unit.simplify() 
-            # ) 
-        # else:
-            # ref_unit = register.reference_unit_for( value_unit.unit )
-                
         # Note `unit` may be a temporary RatioScale object and hence unregistered
-        fn = register.conversion_from_A_to_B(u,unit)
-        return ValueUnit( 
-            value_result(
-                fn( value_unit.value ), 
-                *arg, 
-                **kwarg
-            ), 
-            unit 
+        return unit, register.conversion_from_A_to_B(u,unit)
+    elif ref_unit is not None:       
+        return ref_unit, register.conversion_from_A_to_B(u,ref_unit)
+    else:
+        raise RuntimeError(
+            "there is no reference unit for {!r}".format(koq)
         )
-    else:       
-        fn = register.conversion_from_A_to_B(u,ref_unit)
-        return ValueUnit( 
-            value_result(
-                fn( value_unit.value ), 
-                *arg, 
-                **kwarg
-            ), 
-            ref_unit  
+        
+def _conversion_to(unit_from,unit=None):
+    """
+    Return the unit and the function that converts 
+    values in ``unit_from`` to ``unit``
+    
+    When ``unit`` is ``None``, the reference unit is used. ``unit`` 
+    may be a string, as for :func:`.qresult`. A ``RuntimeError`` is 
+    raised if the units are for different kinds of quantity.
+    
+    """
+    # As for addition, the signatures are not simplified
+    ref_unit, fn = _resolve_conversion(unit_from,simplify=False)
+    if unit is None or unit is ref_unit:
+        return ref_unit, fn
+        
+    # Ratio-scale conversions do not check the kind of quantity 
+    # (a string is looked up among the units for that kind)
+    if (
+        not isinstance(unit,str) 
+    and _resolve_conversion(unit,simplify=False)[0] is not ref_unit
+    ):
+        raise RuntimeError(
+            "{!r} is not a unit for {!r}".format(
+                unit,ref_unit.kind_of_quantity
+            )
         )
+    return _resolve_conversion(unit_from,unit,simplify=False)
+        
+#----------------------------------------------------------------------------
+class Converter(object):
+
+    """
+    Converts values measured in a unit, or unit expression, 
+    as :func:`.qresult` would (see :meth:`.UnitRegister.converter`)
+    
+    """
+    
+    __slots__ = ("source", "unit", "function")
+    
+    def __init__(self,unit_expr,unit=None,simplify=True):
+        self.source = unit_expr 
+        self.unit, self.function = _resolve_conversion(unit_expr,unit,simplify)
+        
+    def __repr__(self):
+        return "{!s}({!s},{!s})".format(
+            self.__class__.__name__,
+            self.source,
+            self.unit
+        )
+        
+    def __call__(self,value):
+        """Return a quantity value for ``value``"""
+        return ValueUnit( self.function(value), self.unit )
+        
+    def values(self,values):
+        """Return the converted ``values`` (a number or an array)"""
+        return self.function(values)
         
 #----------------------------------------------------------------------------
 def qratio(value_unit_1, value_unit_2, unit=None ):
@@ -374,6 +733,11 @@ def qratio(value_unit_1, value_unit_2, unit=None ):
     signature information is retained in the quotient.
 
     When ``unit`` is None, the reference unit is used. 
+    
+    The arguments may be quantity arrays, or sequences of quantity 
+    values (which are converted to quantity arrays), in which case 
+    a quantity array of ratios is returned. The unit of the ratio 
+    is resolved once and the values are divided in one operation.
 
     Example ::
     
@@ -386,15 +750,25 @@ def qratio(value_unit_1, value_unit_2, unit=None ):
         >>> v2 = qvalue(9.51, volt)
         >>> qratio( v2,v1 )
         qvalue(7.73170731...,volt_per_volt)
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> qratio( [ qvalue(2.46,volt), qvalue(615,millivolt) ], v1 )
+        qarray([2. ,0.5],volt_per_volt)
 
     """
+    if not isinstance(value_unit_1,ValueUnit):
+        value_unit_1 = _sequence_to_qarray(value_unit_1)
+    if not isinstance(value_unit_2,ValueUnit):
+        value_unit_2 = _sequence_to_qarray(value_unit_2)
+        
     register = value_unit_1.unit.register 
-    if not register is value_unit_1.unit.register :
+    if not register is value_unit_2.unit.register :
         raise RuntimeError("different unit registers")
     
-    ref_unit = register.reference_unit_for(
-        value_unit_1.unit//value_unit_2.unit
+    # The operation is resolved once by the register 
+    entry = register.operation(
+        '//',value_unit_1.unit,value_unit_2.unit,simplify=False
     )
+    ref_unit = entry.unit 
     
     if unit:
         # Check that the user-supplied unit is compatible 
@@ -408,19 +782,45 @@ def qratio(value_unit_1, value_unit_2, unit=None ):
                 )
             )
 
-        value = (
-            value_unit_1.unit.scale.conversion_factor*value_unit_1.value /
-            (value_unit_2.unit.scale.conversion_factor*value_unit_2.value) 
+        factor = (
+            entry.factor * ref_unit.scale.conversion_factor 
         )/unit.scale.conversion_factor
-        
-        return ValueUnit( value, unit )    
     else:
-        value = (
-            value_unit_1.unit.scale.conversion_factor*value_unit_1.value /
-            (value_unit_2.unit.scale.conversion_factor*value_unit_2.value) 
-        )
+        unit = ref_unit 
+        factor = entry.factor 
 
-        return ValueUnit( value, ref_unit )
+    # The conversion factors are combined first, 
+    # so arrays of values are only divided once 
+    value = factor * ( value_unit_1.value / value_unit_2.value )
+    
+    if getattr(value,'ndim',0):
+        from QV.quantity_array import QArray
+        return QArray( value, unit )
+    else:
+        return ValueUnit( value, unit )
+        
+def _sequence_to_qarray(value_units):
+    from QV.quantity_array import QArray
+    
+    value_units = list(value_units)
+    if not value_units:
+        raise RuntimeError("no quantity values")
+        
+    # The values are converted to the first unit. The conversion 
+    # is resolved once for each of the other units.
+    u = value_units[0].unit
+    conversions = dict()
+    values = []
+    for vu in value_units:
+        if vu.unit is u:
+            values.append( vu.value )
+            continue
+        fn = conversions.get(vu.unit)
+        if fn is None:
+            fn = conversions[vu.unit] = _conversion_to(vu.unit,u)[1]
+        values.append( fn(vu.value) )
+        
+    return QArray( values, u )
         
 # ===========================================================================    
 if __name__ == "__main__":
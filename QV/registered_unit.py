@@ -1,4 +1,6 @@
 from QV.scale import * 
+from QV.signature import _rational_exponent, _exponent_str
+from QV.kind_of_quantity import Number
 
 __all__ = (
     'RegisteredUnit', 'RegisteredUnitExpression',
@@ -25,28 +27,83 @@ class RegisteredUnit(object):
     def __init__(self,register,scale):
         self._scale = scale
         self._register = register
+        self._scale_type = type(scale)
+        
+        # Information that does not change once the unit is 
+        # registered is kept, so it need not be looked up again 
+        # (see `_set_id`, `_set_signature` and `_set_reference`)
+        self._unit_id = None
+        self._signature = None
+        self._reference_unit = None
+        self._reference_factor = None
+            
+    def _set_id(self,unit_id):
+        self._unit_id = unit_id 
+        
+    def _set_signature(self,signature):
+        self._signature = signature 
+        
+    def _set_reference(self,ref_unit):
+        # The factor only applies to ratio scales 
+        self._reference_unit = ref_unit 
+        if self._scale_type is RatioScale and ref_unit is not None:
+            self._reference_factor = (
+                self._scale.conversion_factor / ref_unit.scale.conversion_factor
+            )
             
     @property 
     def scale(self):
         """The scale"""
         return self._scale 
 
+    @property 
+    def unit_id(self):
+        """The id of the unit in the register"""
+        return self._unit_id 
+
+    @property 
+    def scale_type(self):
+        """The type of scale"""
+        return self._scale_type 
+
     @property 
     def kind_of_quantity(self): 
         """The kind of quantity"""
         return self._scale._kind_of_quantity
 
+    @property 
+    def signature(self):
+        """The signature of the associated kind of quantity"""
+        return self._signature 
+
+    @property 
+    def reference_unit(self):
+        """
+        The reference unit for the associated kind of quantity,
+        or ``None`` when there is no reference unit
+        
+        """
+        return self._reference_unit 
+
+    @property 
+    def reference_factor(self):
+        """
+        The factor that converts values to the reference unit, 
+        or ``None`` when the unit is not on a ratio scale, or 
+        there is no reference unit
+        
+        """
+        return self._reference_factor 
+
     @property 
     def is_dimensionless(self):
         """True when the associated kind of quantity is dimensionless in the current context"""
-        context = self.register.context 
-        return context.signature( self.kind_of_quantity ).is_dimensionless
+        return self._signature.is_dimensionless
 
     @property 
     def is_simplified(self):
         """True when the elements in the denominator of the associated kind of quantity are all zero"""
-        context = self.register.context 
-        return context.signature( self.kind_of_quantity ).is_simplified
+        return self._signature.is_simplified
 
         
     def is_ratio_of(self,other_koq):
@@ -57,7 +114,7 @@ class RegisteredUnit(object):
         
         """
         context = self.register.context 
-        lhs = context.signature( self.kind_of_quantity )
+        lhs = self._signature
         rhs = context.signature( other_koq )
         
         if lhs.numerator == lhs.denominator and rhs.is_simplified:
@@ -106,29 +163,25 @@ class RegisteredUnit(object):
         )
 
     def __mul__(self,rhs):
-        return Mul(self,rhs)
+        return _product(self,rhs,1)
             
     def __truediv__(self,rhs):
-        return Div(self,rhs)
+        return _product(self,rhs,-1)
 
     # def __div__(self,rhs):
         # return self.__truediv__(rhs)
         
     def __floordiv__(self,rhs):
-        return Ratio(self,rhs)
+        return _ratio(self,rhs)
 
-    # def __pow__(self,rhs):
-        # assert isinstance(rhs,numbers.Real),\
-            # "A real exponent is required"
-        
-        # # work in progress!
-        # return NotImplemented
+    def __pow__(self,rhs):
+        return _power(self,rhs)
   
     # def ratio(self,rhs):
         # return Ratio(self,rhs)
 
     def simplify(self):
-        return Simplify(self)
+        return _simplify(self)
 
     def conversion_to(self,B):
         """
@@ -145,12 +198,19 @@ class RegisteredUnit(object):
                 "unregistered unit: {!r} ".format(B)
             )          
          
-        key = (A.scale.symbol,B.scale.symbol)  
+        key = (A.unit_id,B.unit_id)  
         if key in self.register._conversion_fn:
             return self.register._conversion_fn[ key ]  
+            
+        # There may be a chain of registered conversions
+        fn = self.register._chain_conversion(A,B)
+        if fn is not None:
+            return fn
         else:
             raise RuntimeError(
-                "no conversion defined for {0[0]!r} to {0[1]!r}".format(key)
+                "no conversion defined for {!r} to {!r}".format(
+                    A.scale.symbol,B.scale.symbol
+                )
             ) 
             
 #----------------------------------------------------------------------------
@@ -160,15 +220,17 @@ class RegisteredUnit(object):
 # The base classes  `UnaryOp` and `BinaryOp` establish the interface. 
 # These classes provide a representation for 
 # an equation involving units, but do not resolve into a unit.
+#
+# Products, quotients and powers of units are held in a canonical form:
+# a product of factors `leaf**power`, where the leaves are registered
+# units (or ratios and simplified expressions, which are not expanded).
+# Equal powers are combined, factors with a zero power cancel and the 
+# factors are sorted. The expressions are also shared: the register
+# keeps the expression for each canonical form, so building the same
+# expression twice returns the same object. 
 #----------------------------------------------------------------------------
 class RegisteredUnitExpression(object):
     __slots__ = ()
-    
-class UnaryOp(RegisteredUnitExpression):   
-
-    def __init__(self,arg):
-        self.arg = arg
-        self._register = arg.register
 
     @property 
     def is_simplified(self): return False
@@ -178,22 +240,40 @@ class UnaryOp(RegisteredUnitExpression):
         return self._register
 
     def __mul__(self,rhs):
-        return Mul(self,rhs)
+        return _product(self,rhs,1)
             
     def __truediv__(self,rhs):
-        return Div(self,rhs)
+        return _product(self,rhs,-1)
 
     # def __div__(self,rhs):
         # return self.__truediv__(rhs)
         
     def __floordiv__(self,rhs):
-        return Ratio(self,rhs)
+        return _ratio(self,rhs)
+
+    def __pow__(self,rhs):
+        return _power(self,rhs)
 
     # def ratio(self,rhs):
         # return Ratio(self,rhs)
 
     def simplify(self):
-        return Simplify(self)
+        return _simplify(self)
+        
+    @property 
+    def kind_of_quantity(self):  
+        return self.scale.kind_of_quantity
+ 
+    # Perform the operation on the scales involved 
+    @property 
+    def scale(self):  
+        return self._scale 
+    
+class UnaryOp(RegisteredUnitExpression):   
+
+    def __init__(self,arg):
+        self.arg = arg
+        self._register = arg.register
     
 #----------------------------------------------------------------------------
 class BinaryOp(RegisteredUnitExpression):   
@@ -205,31 +285,6 @@ class BinaryOp(RegisteredUnitExpression):
         assert lhs.register is rhs.register
         self._register = lhs.register
         
-    @property 
-    def is_simplified(self): return False
-
-    @property 
-    def register(self):
-        return self._register
-
-    def __mul__(self,rhs):
-        return Mul(self,rhs)
-            
-    def __truediv__(self,rhs):
-        return Div(self,rhs)
-
-    # def __div__(self,rhs):
-        # return self.__truediv__(rhs)
-        
-    def __floordiv__(self,rhs):
-        return Ratio(self,rhs)
-
-    # def ratio(self,rhs):
-        # return Ratio(self,rhs)
-
-    def simplify(self):
-        return Simplify(self)
-
 #----------------------------------------------------------------------------
 #
 # The operations are performed simultaneously on the kinds of quantity. 
@@ -269,62 +324,166 @@ class Ratio(BinaryOp):
     def __str__(self):
         # TODO: need to treat a numeric as a special case
         return str(self.scale)
-           
-    @property 
-    def kind_of_quantity(self):  
-        return self.scale.kind_of_quantity
  
-    # Perform the operation on the scales involved 
-    @property 
-    def scale(self):  
-        return self._scale 
- 
-
 #----------------------------------------------------------------------------
-class Mul(BinaryOp):   
-
-    def __init__(self,lhs,rhs):
-        super(Mul,self).__init__(lhs,rhs) 
-        self._scale = self.lhs.scale * self.rhs.scale
+class Product(RegisteredUnitExpression):   
 
-    def __repr__(self):
-        return "({!r})*({!r})".format(self.lhs,self.rhs)
+    """
+    A product of powers of units, in canonical form
+    
+    ``factors`` is a sequence of ``(unit,power)`` pairs 
+    
+    """
 
-    def __str__(self):
-        # TODO: need to treat a numeric as a special case
-        return str(self.scale)
-           
-    @property 
-    def kind_of_quantity(self):  
-        return self.scale.kind_of_quantity
+    def __init__(self,register,factors):
+        self._register = register 
+        self.factors = tuple(factors) 
         
-    # Perform the operation on the scales involved 
-    @property 
-    def scale(self):  
-        return self._scale 
+        # The scale is built up from the scales of the factors, 
+        # the numerator first and then the denominator
+        scale = None
+        for u,p in self.factors:
+            if p > 0:
+                s = u.scale if p == 1 else u.scale ** p 
+                scale = s if scale is None else scale * s
+                
+        if scale is None:
+            # The unit for numbers
+            scale = _unity(register).scale 
         
-#----------------------------------------------------------------------------
-class Div(BinaryOp):   
-
-    def __init__(self,lhs,rhs):
-        super(Div,self).__init__(lhs,rhs) 
-        self._scale = self.lhs.scale / self.rhs.scale
+        for u,p in self.factors:
+            if p < 0:
+                scale = scale / ( u.scale if p == -1 else u.scale ** -p )
+                
+        self._scale = scale 
 
     def __repr__(self):
-        return "({!r})/({!r})".format(self.lhs,self.rhs)
+        num = [ _factor_repr(u,p) for u,p in self.factors if p > 0 ]
+        den = [ _factor_repr(u,-p) for u,p in self.factors if p < 0 ]
+        if den:
+            return "{!s}/{!s}".format( 
+                '*'.join(num) if num else '1', 
+                '/'.join(den) 
+            )
+        else:
+            return '*'.join(num)
 
     def __str__(self):
-        # TODO: need to treat a numeric as a special case
         return str(self.scale)
+        
+def _factor_repr(u,p):
+    if p == 1:
+        return "({!r})".format(u)
+    else:
+        return "({!r})**{!s}".format(u,_exponent_str(p))
+
+# The class of a product indicates its form 
+class Mul(Product):
+    """A product of units"""
     
-    @property 
-    def kind_of_quantity(self):  
-        return self.scale.kind_of_quantity
+class Div(Product):
+    """A quotient of units"""
+        
+class Pow(Product):
+    """A unit raised to a power"""
 
-    # Perform the operation on the scales involved 
     @property 
-    def scale(self): 
-        return self._scale 
+    def arg(self): 
+        return self.factors[0][0]
+        
+    @property 
+    def exponent(self): 
+        return self.factors[0][1]
+
+#----------------------------------------------------------------------------
+def _unity(register):
+    return register._koq_to_ref_unit[Number]
+    
+def _factors(x):
+    """
+    Return the factors of ``x``, omitting the unit for numbers
+    
+    """
+    if isinstance(x,Product):
+        return x.factors 
+    elif x is _unity(x.register):
+        return ()
+    else:
+        return ( (x,1), )
+        
+def _order(factor):
+    u = factor[0]
+    return ( u.scale.symbol, u.scale.name, id(u) )
+        
+def _canonical(register,powers):
+    """
+    Return the expression for a mapping of units to powers 
+    
+    """
+    powers = dict( 
+        (u,_rational_exponent(p)) for u,p in powers.items() if p != 0 
+    )
+    if not powers:
+        return _unity(register)
+    
+    # The register keeps the expressions it has seen
+    key = frozenset( powers.items() )
+    expr = register._expressions.get(key)
+    if expr is not None:
+        return expr
+        
+    factors = sorted( powers.items(), key=_order )
+    for u,p in factors:
+        if type(u.scale) is not RatioScale: 
+            raise RuntimeError(
+                "Incompatible scale: {!r}".format(u.scale)
+            )
+    
+    if len(factors) == 1:
+        u, p = factors[0]
+        expr = u if p == 1 else Pow(register,factors)
+    elif any( p < 0 for u,p in factors ):
+        expr = Div(register,factors)
+    else:
+        expr = Mul(register,factors)
+        
+    register._expressions[key] = expr
+    return expr
+    
+def _product(lhs,rhs,sign):
+    # `rhs` is multiplied (sign = 1) or divided (sign = -1)
+    if not hasattr(rhs,'register'):
+        return NotImplemented
+    assert lhs.register is rhs.register
+    
+    powers = dict( _factors(lhs) )
+    for u,p in _factors(rhs):
+        powers[u] = powers.get(u,0) + sign*p
+        
+    return _canonical(lhs.register,powers)
+    
+def _power(x,exponent):
+    exponent = _rational_exponent(exponent)
+    return _canonical(
+        x.register,
+        dict( (u,p*exponent) for u,p in _factors(x) )
+    )
+    
+def _ratio(lhs,rhs):
+    if not hasattr(rhs,'register'):
+        return NotImplemented
+    key = ('ratio',lhs,rhs)
+    expr = lhs.register._expressions.get(key)
+    if expr is None:
+        expr = lhs.register._expressions[key] = Ratio(lhs,rhs)
+    return expr
+    
+def _simplify(x):
+    key = ('simplify',x)
+    expr = x.register._expressions.get(key)
+    if expr is None:
+        expr = x.register._expressions[key] = Simplify(x)
+    return expr
         
 # ===========================================================================    
 if __name__ == "__main__":
@@ -0,0 +1,198 @@
+from collections import deque
+from math import fsum, sqrt
+
+from QV.quantity_value import ValueUnit, _conversion_to
+from QV.registered_unit import RegisteredUnit
+
+__all__ = ( 'RollingWindow', )
+
+#----------------------------------------------------------------------------
+class RollingWindow(object):
+
+    """
+    Statistics of the most recent ``size`` quantity values in a stream.
+
+    The window is created for a unit (or unit expression). The state
+    is held in the reference unit for the kind of quantity, and each
+    update costs O(1) per value. Values may be given in other units
+    for the same kind of quantity: the conversion for each distinct
+    unit is resolved once, when it is first seen.
+
+    Removing values from the running mean and variance accumulates 
+    rounding errors, so they are recalculated from the values in the 
+    window after every ``size`` updates (still O(1) per value, on 
+    average).
+
+    Example::
+
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> w = RollingWindow(millivolt,3)
+        >>> for x in (1.0, 2.0, 3.0, 10.0):
+        ...     w.update( qvalue(x,volt) )
+        ...
+        >>> print( w.mean )
+        5.0 V
+        >>> print( w.min, w.max )
+        2.0 V 10.0 V
+        >>> w.update( qvalue(4000,millivolt) )
+        >>> print( w.mean )
+        5.666666666666667 V
+
+    """
+
+    def __init__(self,unit,size):
+        if size < 1:
+            raise RuntimeError(
+                "the window size must be positive, got {}".format(size)
+            )
+
+        self._unit, fn = _conversion_to(unit)
+        self._conversions = { unit: fn }
+        self._size = size
+
+        self._index = 0
+        self._values = deque()
+
+        # Running mean and sum of squared deviations (Welford), 
+        # and the number of updates since they were recalculated
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+        # Monotonic queues of (index,value) for the extremes
+        self._min = deque()
+        self._max = deque()
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def size(self):
+        """The maximum number of values in the window"""
+        return self._size
+
+    @property
+    def unit(self):
+        """The unit of the results (the reference unit)"""
+        return self._unit
+
+    def _conversion(self,unit):
+        if unit in self._conversions:
+            return self._conversions[unit]
+
+        fn = _conversion_to(unit,self._unit)[1]
+        # Unit expressions are usually temporary objects
+        if isinstance(unit,RegisteredUnit):
+            self._conversions[unit] = fn
+        return fn
+
+    def update(self,value_unit):
+        """
+        Add a quantity value, or the elements of a quantity array,
+        to the window
+
+        """
+        x = self._conversion(value_unit.unit)(value_unit.value)
+        try:
+            xs = iter(x)
+        except TypeError:
+            self._push(x)
+        else:
+            for x_i in xs:
+                self._push(x_i)
+
+    def _push(self,x):
+        if len(self._values) == self._size:
+            self._pop()
+
+        i = self._index
+        self._index += 1
+        self._values.append(x)
+
+        n = len(self._values)
+        self._updates += 1
+        if self._updates >= self._size:
+            self._recalculate()
+        else:
+            delta = x - self._mean
+            self._mean += delta/n
+            self._m2 += delta*(x - self._mean)
+
+        q = self._min
+        while q and q[-1][1] >= x:
+            q.pop()
+        q.append( (i,x) )
+
+        q = self._max
+        while q and q[-1][1] <= x:
+            q.pop()
+        q.append( (i,x) )
+
+    def _pop(self):
+        x = self._values.popleft()
+        i = self._index - len(self._values) - 1
+
+        n = len(self._values)
+        if n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            mean = self._mean
+            self._mean = mean - (x - mean)/n
+            self._m2 -= (x - mean)*(x - self._mean)
+
+        for q in (self._min,self._max):
+            if q[0][0] == i:
+                q.popleft()
+
+    def _recalculate(self):
+        values = self._values
+        n = len(values)
+        mean = fsum(values)/n
+        self._mean = mean
+        self._m2 = fsum( (x - mean)**2 for x in values )
+        self._updates = 0
+
+    def _check(self):
+        if not self._values:
+            raise RuntimeError("the window is empty")
+
+    @property
+    def mean(self):
+        """The mean of the values in the window"""
+        self._check()
+        return ValueUnit( self._mean, self._unit )
+
+    @property
+    def variance(self):
+        """The sample variance of the values in the window (in unit**2)"""
+        self._check()
+        n = len(self._values)
+        v = max(self._m2,0.0)/(n - 1) if n > 1 else 0.0
+        return ValueUnit( v, self._unit**2 )
+
+    @property
+    def std(self):
+        """The sample standard deviation of the values in the window"""
+        return ValueUnit( sqrt( self.variance.value ), self._unit )
+
+    @property
+    def min(self):
+        """The smallest value in the window"""
+        self._check()
+        return ValueUnit( self._min[0][1], self._unit )
+
+    @property
+    def max(self):
+        """The largest value in the window"""
+        self._check()
+        return ValueUnit( self._max[0][1], self._unit )
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
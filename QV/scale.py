@@ -1,4 +1,9 @@
-__all__ = ( 'Scale', 'OrdinalScale', 'IntervalScale', 'RatioScale', )
+from QV.signature import _exponent_str
+
+__all__ = ( 
+    'Scale', 'OrdinalScale', 'IntervalScale', 'RatioScale', 
+    'AffineConversion', 
+)
 
 #----------------------------------------------------------------------------
 # 'Scale' is a nominal scale 
@@ -67,6 +72,77 @@ class OrdinalScale(Scale):
     def __init__(self,kind_of_quantity,name,symbol):
         Scale.__init__(self,kind_of_quantity,name,symbol)
         
+#----------------------------------------------------------------------------
+class AffineConversion(object):
+
+    """
+    A conversion of values from one scale to another,
+    ``x -> factor*x + offset``, held as data.
+    
+    Conversions between ratio scales have no offset. 
+    Conversions can be composed (see :meth:`then`) and inverted, 
+    so a chain of conversions reduces to a single conversion. 
+    
+    When ``x`` is a NumPy array, the offset is added in place 
+    to the product, so only one new array is created.
+    
+    Example::
+    
+        >>> F_to_C = AffineConversion(5.0/9.0,-32*5.0/9.0)
+        >>> C_to_K = AffineConversion(1.0,273.15)
+        >>> F_to_K = F_to_C.then(C_to_K)
+        >>> F_to_K
+        AffineConversion(0.5555555555555556,255.3722222222222)
+        >>> F_to_K(212.0)
+        373.15
+        >>> round( F_to_K.inverse()(373.15), 9 )
+        212.0
+        
+    """
+    
+    __slots__ = ( 'factor', 'offset' )
+    
+    def __init__(self,factor,offset=0):
+        self.factor = factor 
+        self.offset = offset
+        
+    def __repr__(self):
+        return "{!s}({!r},{!r})".format(
+            self.__class__.__name__,
+            self.factor,
+            self.offset
+        )
+        
+    def __call__(self,x):
+        y = self.factor*x 
+        if self.offset:
+            try:
+                y += self.offset
+            except TypeError:
+                # e.g., an integer array can not be updated in place 
+                y = y + self.offset
+        return y
+        
+    def then(self,other):
+        """
+        Return the conversion that applies this conversion and then ``other``
+        
+        """
+        return AffineConversion(
+            other.factor*self.factor,
+            other.factor*self.offset + other.offset
+        )
+        
+    def inverse(self):
+        """
+        Return the conversion in the opposite direction
+        
+        """
+        return AffineConversion(
+            1/self.factor,
+            -self.offset/self.factor
+        )
+        
 #----------------------------------------------------------------------------
 class IntervalScale(OrdinalScale):
 
@@ -184,6 +260,15 @@ class RatioScale(IntervalScale):
  
         return RatioScale(koq,name,symbol,factor)
 
+    # `rhs` is an exponent (an integer or a Fraction)
+    def __pow__(self,rhs):
+        koq = self.kind_of_quantity**rhs
+        name = "({!s}**{!s})".format(self.name,_exponent_str(rhs))
+        symbol = "({!s}**{!s})".format(self.symbol,_exponent_str(rhs))
+        factor = self.conversion_factor**rhs 
+ 
+        return RatioScale(koq,name,symbol,factor)
+
 # ===========================================================================    
 if __name__ == "__main__":
     import doctest
@@ -0,0 +1,176 @@
+from collections import namedtuple
+
+from multiprocessing import shared_memory, resource_tracker
+
+from QV.quantity_array import QArray, np, _require_numpy
+from QV.registered_unit import RegisteredUnit
+
+__all__ = ( 'SharedQArray', 'QArrayHandle', 'shared_qarray', 'attach' )
+
+#----------------------------------------------------------------------------
+# The values of a shared quantity array are held in a block of shared
+# memory. Other processes are sent a small handle: the name of the block,
+# the shape and dtype of the array, the register id and the integer id 
+# of the unit in that register. A process with its own copy of the 
+# register can then attach to the block without copying the values.
+#
+QArrayHandle = namedtuple(
+    'QArrayHandle',
+    ('name','shape','dtype','register_id','unit_id')
+)
+
+# Names of the blocks created by this process
+_created = set()
+
+def _unit_id(unit):
+    if not isinstance(unit,RegisteredUnit):
+        raise RuntimeError(
+            "a shared quantity array needs a registered unit, got {!r}".format(unit)
+        )
+    return unit.unit_id
+
+def _open(name):
+    try:
+        return shared_memory.SharedMemory(name=name,track=False)
+    except TypeError:
+        # Before Python 3.13, attaching registers the block with the
+        # resource tracker, which would unlink it when this process ends
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _created:
+            resource_tracker.unregister(shm._name,'shared_memory')
+        return shm
+
+#----------------------------------------------------------------------------
+class SharedQArray(QArray):
+
+    """
+    A :class:`.QArray` with values held in shared memory.
+
+    The process that creates the array (see :func:`.shared_qarray`)
+    owns the block of memory. Other processes use the :attr:`.handle`
+    to :func:`.attach`. Arithmetic returns ordinary quantity arrays.
+
+    Values are not copied when an array is attached, so changes made
+    by one process are seen by the others. A ``SharedQArray`` cannot
+    be pickled: send the handle instead.
+
+    """
+    __slots__ = ( '_shm', '_owner' )
+
+    # Results, e.g. from `qresult`, are not in shared memory
+    _result_type = QArray
+
+    def __init__(self,shm,shape,dtype,unit,owner=False):
+        _require_numpy()
+        QArray.__init__(
+            self,
+            np.ndarray(shape,dtype=dtype,buffer=shm.buf),
+            unit
+        )
+        self._shm = shm
+        self._owner = owner
+
+    def __reduce__(self):
+        raise TypeError(
+            "cannot pickle a SharedQArray, send the handle instead"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def handle(self):
+        """A :class:`.QArrayHandle` for use in other processes"""
+        return QArrayHandle(
+            self._shm.name,
+            self.value.shape,
+            self.value.dtype.str,
+            self.unit.register.register_id,
+            _unit_id(self.unit)
+        )
+
+    def close(self):
+        """
+        Detach from the shared memory
+        
+        The array may not be used after it is closed and any
+        views of the values must have been released.
+
+        """
+        self.value = None
+        self._shm.close()
+
+    def unlink(self):
+        """Release the shared memory (only the owner may do this)"""
+        if not self._owner:
+            raise RuntimeError("only the owner can unlink a SharedQArray")
+        _created.discard(self._shm.name)
+        self._shm.unlink()
+
+#----------------------------------------------------------------------------
+def shared_qarray(values,unit):
+    """
+    Create a new quantity array in shared memory
+
+    ``values`` is a sequence of measures (or a NumPy array),
+    which are copied, ``unit`` must be a registered unit.
+
+    Example ::
+
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> with shared_qarray( [1.5, 250, 12], millivolt ) as x:
+        ...     h = x.handle
+        ...     y = attach(h,ureg)
+        ...     print( qresult(y) )
+        ...     y.close()
+        ...
+        [0.0015 0.25   0.012 ] V
+
+    """
+    _require_numpy()
+    _unit_id(unit)
+
+    values = np.asarray(values)
+    shm = shared_memory.SharedMemory(create=True,size=max(values.nbytes,1))
+    _created.add(shm.name)
+
+    qa = SharedQArray(shm,values.shape,values.dtype,unit,owner=True)
+    qa.value[...] = values
+    return qa
+
+#----------------------------------------------------------------------------
+def attach(handle,register):
+    """
+    Return a :class:`.SharedQArray` for ``handle``
+
+    ``register`` must be the unit register used to create
+    the array, or a copy of it (e.g., in a worker process).
+
+    """
+    _require_numpy()
+    if handle.register_id != register.register_id:
+        raise RuntimeError(
+            "{!r} is not the register for this array".format(register)
+        )
+    unit = register.unit_for_id(handle.unit_id)
+
+    return SharedQArray(
+        _open(handle.name),
+        handle.shape,
+        np.dtype(handle.dtype),
+        unit
+    )
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
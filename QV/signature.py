@@ -1,4 +1,33 @@
 from itertools import zip_longest                   
+from fractions import Fraction
+from numbers import Integral
+
+#----------------------------------------------------------------------------
+def _rational_exponent(x):
+    """
+    Return ``x`` as an ``int``, or a ``Fraction`` if it is not integral.
+    A ``RuntimeError`` is raised if ``x`` is not a rational number.
+    
+    """
+    if isinstance(x,Integral):
+        return int(x)
+    elif isinstance(x,Fraction):
+        return x.numerator if x.denominator == 1 else x
+    else:
+        raise RuntimeError(
+            "an integer or Fraction exponent is required, got {!r}".format(x)
+        )
+
+def _exponent_str(x):
+    """
+    Return the exponent ``x`` as it is written after ``**`` in a 
+    unit name, with a fraction in parentheses (e.g., ``m**(1/2)``)
+    
+    """
+    if isinstance(x,Fraction) and x.denominator != 1:
+        return "({!s})".format(x)
+    else:
+        return str(x)
 
 #----------------------------------------------------------------------------
 class Signature(object):
@@ -22,6 +51,10 @@ class Signature(object):
     
     A Signature refers to a :class:`.Context`, which contains 
     a 1-to-1 mapping between signatures and kinds of quantity.
+    
+    The elements are usually integers, but rational numbers
+    (``Fraction`` objects) are allowed, so that signatures 
+    can be raised to fractional powers.
     """
     
     def __init__(self,context,numerator,denominator=()):
@@ -119,10 +152,11 @@ class Signature(object):
         )
 
     def __pow__(self,rhs):
+        rhs = _rational_exponent(rhs)
         return Signature(
             self.context,
-            tuple(i*rhs for i in self.numerator),
-            tuple(i*rhs for i in self.denominator)
+            tuple( _rational_exponent(i*rhs) for i in self.numerator ),
+            tuple( _rational_exponent(i*rhs) for i in self.denominator )
         )
             
     def __truediv__(self,rhs):
@@ -0,0 +1,200 @@
+import asyncio
+
+from QV.quantity_value import ValueUnit, _resolve_conversion
+from QV.quantity_array import QArray, np, _require_numpy
+
+__all__ = ( 'aqresult', 'aqmap' )
+
+#----------------------------------------------------------------------------
+# A stream of raw readings, all on the same unit, is read by a
+# producer task that collects the readings into chunks and puts
+# them in a bounded queue. The queue is the source of backpressure:
+# when the consumer falls behind, the producer waits. A chunk is also
+# put in the queue, before it is full, a short time after its first 
+# reading, so readings from a slow (live) source are not held up. 
+# The consumer converts a whole chunk at a time, using a conversion 
+# function that is resolved once for the stream.
+#
+_END_OF_STREAM = object()
+
+async def _fill(readings,queue,chunk_size,flush_after):
+    loop = asyncio.get_running_loop()
+    chunk = []
+    timer = None
+    putting = False
+
+    # Runs when the producer is waiting for the source. A full 
+    # chunk that is waiting for space in the queue goes first, 
+    # otherwise the flush is tried again later. 
+    def flush():
+        nonlocal chunk, timer
+        timer = None
+        if not chunk:
+            return
+        if putting or queue.full():
+            timer = loop.call_later(flush_after,flush)
+        else:
+            queue.put_nowait(chunk)
+            chunk = []
+
+    try:
+        async for x in readings:
+            chunk.append(x)
+            if len(chunk) == chunk_size:
+                if timer is not None:
+                    timer.cancel()
+                    timer = None
+                full, chunk = chunk, []
+                putting = True
+                await queue.put(full)
+                putting = False
+            elif timer is None:
+                timer = loop.call_later(flush_after,flush)
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        if chunk:
+            await queue.put(chunk)
+    except Exception as e:
+        # The consumer will raise it
+        await queue.put(e)
+    else:
+        await queue.put(_END_OF_STREAM)
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+async def _chunks(readings,chunk_size,maxsize,flush_after):
+    if chunk_size < 1 or maxsize < 1:
+        raise RuntimeError(
+            "chunk_size and maxsize must be positive, got {} and {}".format(
+                chunk_size,maxsize
+            )
+        )
+
+    queue = asyncio.Queue(maxsize)
+    producer = asyncio.ensure_future( 
+        _fill(readings,queue,chunk_size,flush_after) 
+    )
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _END_OF_STREAM:
+                break
+            elif isinstance(chunk,Exception):
+                raise chunk
+            else:
+                yield chunk
+    finally:
+        producer.cancel()
+
+#----------------------------------------------------------------------------
+async def aqresult(
+    readings,
+    unit,
+    target=None,
+    simplify=True,
+    chunk_size=256,
+    maxsize=4,
+    flush_after=0.05
+):
+    """
+    Yield a quantity value for each raw reading in ``readings``
+
+    ``readings`` is an asynchronous iterable of numbers measured in ``unit``,
+    which may be a registered unit or an expression of registered units.
+
+    The results are the same as applying :func:`.qresult` to each reading,
+    with ``target`` and ``simplify`` used as the ``unit`` and ``simplify``
+    arguments of :func:`.qresult`. However, the unit is resolved only once
+    for the stream.
+
+    Readings are collected into chunks of up to ``chunk_size`` values and
+    at most ``maxsize`` chunks are held waiting for the consumer.
+    A chunk is passed on before it is full when the source has not 
+    filled it within ``flush_after`` seconds of its first reading. Each chunk is converted at once 
+    (using NumPy, when it is available) and control is returned to 
+    the event loop after each chunk.
+
+    Example ::
+
+        >>> import asyncio
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> async def readings():
+        ...     for x in (1.5, 250, 12):
+        ...         yield x
+        ...
+        >>> async def main():
+        ...     return [ str(v) async for v in aqresult(readings(),millivolt) ]
+        ...
+        >>> asyncio.run( main() )
+        ['0.0015 V', '0.25 V', '0.012 V']
+
+    """
+    u, fn = _resolve_conversion(unit,target,simplify)
+
+    async for chunk in _chunks(readings,chunk_size,maxsize,flush_after):
+        if np is None:
+            values = [ fn(x) for x in chunk ]
+        else:
+            values = fn( np.asarray(chunk,dtype=float) ).tolist()
+        for x in values:
+            yield ValueUnit( x, u )
+        await asyncio.sleep(0)
+
+#----------------------------------------------------------------------------
+async def aqmap(
+    fn,
+    readings,
+    unit,
+    target=None,
+    simplify=True,
+    chunk_size=256,
+    maxsize=4,
+    flush_after=0.05
+):
+    """
+    Yield ``fn(chunk)`` for chunks of raw readings in ``readings``
+
+    Each chunk is a :class:`.QArray` of up to ``chunk_size`` readings,
+    converted as :func:`.aqresult` would do (but the conversion
+    is done on the whole array at once). If ``fn`` is ``None``,
+    the chunks are yielded. NumPy is required.
+
+    ``readings``, ``unit``, ``target``, ``simplify``, ``chunk_size``,
+    ``maxsize`` and ``flush_after`` are as for :func:`.aqresult`.
+
+    Example ::
+
+        >>> import asyncio
+        >>> context = Context( ("Voltage","V"), )
+        >>> ureg = UnitRegister("ureg",context)
+        >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        >>> millivolt = ureg.unit( prefix.milli(volt) )
+        >>> async def readings():
+        ...     for x in range(5):
+        ...         yield x
+        ...
+        >>> async def main():
+        ...     return [ chunk async for chunk in aqmap(None,readings(),millivolt,chunk_size=3) ]
+        ...
+        >>> asyncio.run( main() )
+        [qarray([0.   ,0.001,0.002],volt), qarray([0.003,0.004],volt)]
+
+    """
+    _require_numpy()
+    u, convert = _resolve_conversion(unit,target,simplify)
+
+    async for chunk in _chunks(readings,chunk_size,maxsize,flush_after):
+        qa = QArray( convert( np.asarray(chunk,dtype=float) ), u )
+        yield qa if fn is None else fn(qa)
+        await asyncio.sleep(0)
+
+# ===========================================================================
+if __name__ == "__main__":
+    import doctest
+    from QV import *
+    doctest.testmod(  optionflags= doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS  )
@@ -1,14 +1,41 @@
-from functools import partial 
+from array import array
+from collections import deque, namedtuple, OrderedDict
+import uuid
+import weakref
 
 from QV.kind_of_quantity import KindOfQuantity
+from QV.quantity_value import Converter
 from QV.registered_unit import RegisteredUnit 
 from QV.units_dict import UnitsDict
-from QV.scale import RatioScale, IntervalScale
+from QV.scale import Scale, OrdinalScale, RatioScale, IntervalScale, AffineConversion
 
 __all__ = (
     'UnitRegister', 'proportional_unit'
 )
 
+#----------------------------------------------------------------------------
+# The result of an operation on units: the unit of the result, its kind
+# of quantity and the factor that converts the product (or quotient) 
+# of the values to that unit
+Operation = namedtuple('Operation','unit kind_of_quantity factor')
+
+class OperationsInfo( namedtuple('OperationsInfo','hits misses maxsize currsize') ):
+
+    """
+    Statistics for the table of operations held by a :class:`.UnitRegister`
+    
+    """
+    __slots__ = ()
+    
+    @property
+    def hit_rate(self):
+        """The fraction of look-ups that found an entry"""
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+        
+# Columns of information about registered units, indexed by unit id
+UnitTables = namedtuple('UnitTables','koq reference factor scale_type')
+
 #----------------------------------------------------------------------------
 class UnitRegister(object):
 
@@ -19,15 +46,60 @@ class UnitRegister(object):
     A distinction is made between a reference unit and other related units 
     for the same kind of quantity. There can be only one reference unit 
     in the register for each kind of quantity.  
+    
+    If ``normalise`` is ``True``, :func:`.qvalue` stores values for 
+    ratio-scale units in the reference unit, so that addition and 
+    subtraction need no conversion. The unit given to :func:`.qvalue` 
+    is remembered and :func:`.qresult` converts back to it. 
+    
+    If ``collapse`` is ``True``, the product or quotient of quantity 
+    values is resolved immediately when the kind of quantity of the 
+    result is declared in the context: the value is converted to the 
+    reference unit, so the unit expression is not retained. 
+    
+    The results of operations on units are kept in a table of 
+    up to ``operations_size`` entries (see :meth:`.operation`).
+    
+    Each unit is given a small integer id when it is registered 
+    (the unit for numbers is 0). Information about the units is 
+    also held in arrays indexed by id (see :meth:`.tables`).
     """ 
     
-    def __init__(self,name,context):
+    # The codes used for types of scale in the tables 
+    scale_types = (RatioScale,IntervalScale,OrdinalScale,Scale)
+    
+    def __init__(
+        self,
+        name,
+        context,
+        normalise=False,
+        collapse=False,
+        operations_size=256
+    ):
         
         self._name = name
         
+        # Identifies the register, and copies of it 
+        # (e.g., pickled for another process)
+        self._id = uuid.uuid4().hex
+        
         # Needed to resolve KoQ objects from names
         self._context = context
         
+        self._normalise = normalise 
+        self._collapse = collapse 
+        
+        # Registered units - keys; (reference unit, conversion) 
+        # - values, for `qvalue` when values are normalised 
+        self._to_reference = dict()
+        
+        # (op, lhs unit, rhs unit, simplify) - keys; Operation 
+        # objects - values, in order of use (least recent first) 
+        self._operations = OrderedDict()
+        self._operations_size = operations_size 
+        self._operations_hits = 0
+        self._operations_misses = 0
+        
         # KoQ objects - keys; UnitsDict() - values
         # The UnitsDict is a mapping of scale names 
         # and scale symbols to the corresponding 
@@ -40,14 +112,32 @@ class UnitRegister(object):
         # Only ratio scales can be reference units 
         self._koq_to_ref_unit = dict()
         
-        # A mapping of symbols for pairs of scales to a 
-        # function that converts between those scales 
+        # A mapping of the ids of pairs of units to a 
+        # function that converts between those units 
         self._conversion_fn = dict()            
+        
+        # Registered units, indexed by id, and the ids of 
+        # the kinds of quantity (KoQ objects - keys) 
+        self._units = list()
+        self._koqs = list()
+        self._koq_ids = dict()
+        
+        # The tables, indexed by unit id: the KoQ id, the reference 
+        # unit id (-1 when there is none), the factor that converts 
+        # to the reference unit (NaN when there is none) and the 
+        # scale type code (an index into `scale_types`)
+        self._table_koq = array('l')
+        self._table_reference = array('l')
+        self._table_factor = array('d')
+        self._table_scale_type = array('b')
                 
         # There must always be a unit for numbers and it is a 
         # special case because the name and symbol are blank
         Number = context['Number']
         unity = RegisteredUnit( self, RatioScale(Number,'','') )        
+        unity._set_signature( context.signature(Number) )
+        self._index_unit( unity )
+        self._set_reference( unity, unity )
         self._koq_to_ref_unit[Number] = unity       
         self._koq_to_units_dict[Number] = {
             RatioScale: UnitsDict({ 'unity': unity }) 
@@ -56,6 +146,21 @@ class UnitRegister(object):
         # Need to know if a unit has been registered 
         self._registered_units = set()
         
+        # Unit expressions, indexed by their canonical form, 
+        # so that equal expressions are the same object. An 
+        # expression is discarded when it is no longer used.
+        self._expressions = weakref.WeakValueDictionary()
+        
+    # A `WeakValueDictionary` cannot be pickled
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_expressions'] = dict( self._expressions )
+        return state
+        
+    def __setstate__(self,state):
+        self.__dict__.update(state)
+        self._expressions = weakref.WeakValueDictionary( self._expressions )
+        
     def __str__(self):
         return self._name
 
@@ -72,6 +177,164 @@ class UnitRegister(object):
     def context(self):        
         return self._context     
     
+    @property
+    def normalise(self):
+        """``True`` when quantity values are stored in reference units"""
+        return self._normalise
+        
+    @property
+    def collapse(self):
+        """``True`` when products and quotients are resolved to reference units"""
+        return self._collapse
+        
+    @property
+    def register_id(self):
+        """A string that identifies this register and its copies"""
+        return self._id
+        
+    def operation(self,op,lhs,rhs,simplify=True):
+        """
+        Return the unit, kind of quantity and conversion factor 
+        for the result of ``lhs op rhs``
+        
+        ``op`` is one of ``'*'``, ``'/'`` or ``'//'``, ``lhs`` and ``rhs``
+        are units, or unit expressions, on ratio scales. The unit is the 
+        reference unit that :func:`.qresult` would report (``simplify`` 
+        is as for :func:`.qresult`) and the value of the result is the 
+        factor times ``lhs_value op rhs_value``.
+        
+        The results are kept in a table, so after the first time the 
+        operation needs a single look-up. The least recently used entry 
+        is discarded when the table is full (see :meth:`.operations_info`).
+        
+        Example::
+        
+            >>> context = Context( ("Length","L"), ("Time","T") )
+            >>> Speed = context.declare('Speed','V','Length/Time')
+            >>> si = UnitRegister("si",context)
+            >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+            >>> kilometre = si.unit( prefix.kilo(metre) )
+            >>> second = si.unit( RatioScale(context['Time'],'second','s') )
+            >>> metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+            >>> op = si.operation('/',kilometre,second)
+            >>> op.unit is metre_per_second
+            True
+            >>> op.factor
+            1000.0
+            >>> si.operation('/',kilometre,second) is op
+            True
+            >>> si.operations_info()
+            OperationsInfo(hits=1, misses=1, maxsize=256, currsize=1)
+            
+        """
+        entry = self._operation(op,lhs,rhs,simplify)
+        if entry is None:
+            raise RuntimeError(
+                "cannot resolve {!r} {!s} {!r}".format(lhs,op,rhs)
+            )
+        return entry
+        
+    def _operation(self,op,lhs,rhs,simplify):
+        # As `operation`, but `None` is returned when the kind of 
+        # quantity of the result, or its reference unit, is not declared.
+        # When `op` is `None`, `lhs` is a unit expression that is resolved
+        # itself (`rhs` is ignored).
+        key = (op,lhs,rhs,simplify)
+        operations = self._operations
+        if key in operations:
+            self._operations_hits += 1
+            operations.move_to_end(key)
+            return operations[key]
+            
+        self._operations_misses += 1
+        entry = self._resolve_operation(op,lhs,rhs,simplify)
+        
+        # Failures are not kept, because the kind of quantity 
+        # and a reference unit may be declared later 
+        if entry is not None:
+            operations[key] = entry
+            if len(operations) > self._operations_size:
+                operations.popitem(last=False)
+            
+        return entry
+        
+    def _resolve_operation(self,op,lhs,rhs,simplify):
+        if op is None:
+            expr = lhs
+        elif op == '*':
+            expr = lhs * rhs
+        elif op == '/':
+            expr = lhs / rhs
+        elif op == '//':
+            expr = lhs // rhs
+        else:
+            raise RuntimeError(
+                "unknown operation {!r}".format(op)
+            )
+            
+        if type(expr.scale) is not RatioScale:
+            raise RuntimeError(
+                "cannot resolve {!r}".format(expr.scale)
+            )
+            
+        if simplify and not expr.is_simplified:
+            expr = expr.simplify()
+            
+        try:
+            ref_unit = self.reference_unit_for(expr)
+        except KeyError:
+            return None
+            
+        return Operation(
+            ref_unit,
+            ref_unit.scale.kind_of_quantity,
+            expr.scale.conversion_factor / ref_unit.scale.conversion_factor
+        )
+        
+    def converter(self,unit_expr,unit=None,simplify=True):
+        """
+        Return a function that converts values in ``unit_expr`` 
+        
+        The function returns a quantity value, which is the same as  
+        :func:`.qresult` would return for a value in ``unit_expr``, 
+        with ``unit`` and ``simplify`` as for :func:`.qresult`. 
+        However, the units are resolved only once. 
+        The function also has a ``values`` method, which 
+        returns converted numbers (or an array of numbers).
+        
+        Example::
+        
+            >>> context = Context( ("Voltage","V"), )
+            >>> ureg = UnitRegister("ureg",context)
+            >>> volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+            >>> millivolt = ureg.unit( prefix.milli(volt) )
+            >>> microvolt = ureg.unit( prefix.micro(volt) )
+            >>> to_mV = ureg.converter(microvolt,'mV')
+            >>> print( to_mV(1500) )
+            1.5 mV
+            >>> to_mV.values(250)
+            0.25
+            
+        """
+        if unit_expr.register is not self:
+            raise RuntimeError(
+                "{!r} is not in {!r}".format(unit_expr,self)
+            )
+        return Converter(unit_expr,unit,simplify)
+        
+    def operations_info(self):
+        """
+        Return the hits, misses, maximum size and current size 
+        of the table of operations (see :meth:`.operation`)
+        
+        """
+        return OperationsInfo(
+            self._operations_hits,
+            self._operations_misses,
+            self._operations_size,
+            len(self._operations)
+        )
+    
     def reference_unit_for(self,expr):
         """
         Return the reference unit for `expr`
@@ -152,6 +415,11 @@ class UnitRegister(object):
     
     # Only for RatioScales
     def __getattr__(self,koq_name):
+        if '_context' not in self.__dict__:
+            raise AttributeError(
+                "{!r} not found".format(koq_name)
+            )
+            
         koq = getattr(self._context,koq_name)
         
         if koq in self._koq_to_units_dict:  
@@ -170,50 +438,141 @@ class UnitRegister(object):
                 
     def get(self,koq,scale_type=RatioScale):
         """
+        Return the units for ``koq`` on scales of type ``scale_type``
+        
+        ``koq`` may be a kind of quantity or its name.
+        An empty :class:`.UnitsDict` is returned if there are no units.
+        
         """
         if isinstance(koq,str):
             koq = self._context[koq]
           
-        default = {
-            RatioScale: UnitsDict({}),
-            IntervalScale: UnitsDict({})
-        }
-        
-        return self._koq_to_units_dict.get(
-            koq,
-            default
-        )[scale_type]
+        units_dicts = self._koq_to_units_dict.get(koq,{})
+        if scale_type in units_dicts:
+            return units_dicts[scale_type]
+        else:
+            return UnitsDict()
                     
     def _register_unit(self,unit):
          
         koq = unit.scale.kind_of_quantity
         scale_type = type(unit.scale)
         
+        unit._set_signature( self._context.signature(koq) )
+        self._index_unit( unit )
+        
+        # Update or initialise the dict for koq
+        units_dicts = self._koq_to_units_dict.setdefault(koq,dict())
+        
         if koq not in self._koq_to_ref_unit and scale_type is RatioScale:
             self._koq_to_ref_unit[koq] = unit
+            
+            # Units on other types of scale may already be registered
+            for units_dict in units_dicts.values():
+                for u in units_dict.values():
+                    self._set_reference(u,unit)
+                    
+        self._set_reference( unit, self._koq_to_ref_unit.get(koq) )
 
-        # Update or initialise the dict for koq
-        if koq in self._koq_to_units_dict:           
-            if scale_type in self._koq_to_units_dict[koq]:
-                units_dict = self._koq_to_units_dict[koq][scale_type]
-                units_dict.update({ 
-                    unit.scale.name: unit, 
-                    unit.scale.symbol: unit 
-                })
-            else:
-                self._koq_to_units_dict[koq][scale_type] = UnitsDict({ 
-                    unit.scale.name: unit, 
-                    unit.scale.symbol: unit 
-                })
+        if scale_type in units_dicts:
+            units_dict = units_dicts[scale_type]
         else:
-            self._koq_to_units_dict[koq] = {
-                scale_type: UnitsDict({ 
-                    unit.scale.name: unit, 
-                    unit.scale.symbol: unit 
-                })
-            }         
+            units_dict = units_dicts[scale_type] = UnitsDict()
+            
+        units_dict[unit.scale.name] = unit
+        if unit.scale.symbol != unit.scale.name:
+            units_dict[unit.scale.symbol] = unit
+            
         self._registered_units.add(unit)
         
+    def _index_unit(self,unit):
+        # Give `unit` the next id and add a row to the tables
+        koq = unit.scale.kind_of_quantity
+        if koq not in self._koq_ids:
+            self._koq_ids[koq] = len(self._koqs)
+            self._koqs.append(koq)
+            
+        unit._set_id( len(self._units) )
+        self._units.append(unit)
+        
+        self._table_koq.append( self._koq_ids[koq] )
+        self._table_reference.append( -1 )
+        self._table_factor.append( float('nan') )
+        self._table_scale_type.append( 
+            next( 
+                i for i,t in enumerate(self.scale_types) 
+                    if isinstance(unit.scale,t) 
+            )
+        )
+        
+    def _set_reference(self,unit,ref_unit):
+        unit._set_reference(ref_unit)
+        if ref_unit is not None:
+            i = unit.unit_id
+            self._table_reference[i] = ref_unit.unit_id
+            if unit.reference_factor is not None:
+                self._table_factor[i] = unit.reference_factor
+        
+    def unit_for_id(self,unit_id):
+        """
+        Return the registered unit with id ``unit_id``
+        
+        """
+        if 0 <= unit_id < len(self._units):
+            return self._units[unit_id]
+        else:
+            raise RuntimeError(
+                "there is no unit with id {!r}".format(unit_id)
+            )
+        
+    def koq_for_id(self,koq_id):
+        """
+        Return the kind of quantity with id ``koq_id`` in the tables
+        
+        """
+        if 0 <= koq_id < len(self._koqs):
+            return self._koqs[koq_id]
+        else:
+            raise RuntimeError(
+                "there is no kind of quantity with id {!r}".format(koq_id)
+            )
+        
+    def tables(self):
+        """
+        Return arrays of information about the registered units
+        
+        The arrays are indexed by unit id. They hold the kind of quantity 
+        id (see :meth:`.koq_for_id`), the id of the reference unit 
+        (-1 when there is none), the factor that converts to the 
+        reference unit (NaN when the scale is not a ratio scale, or 
+        there is no reference unit) and a code for the type of scale 
+        (an index into ``scale_types``). The arrays belong to the 
+        register and must not be modified.
+        
+        Example::
+        
+            >>> context = Context( ("Length","L"), )
+            >>> si = UnitRegister("si",context)
+            >>> metre = si.unit( RatioScale(context['Length'],'metre','m') )
+            >>> kilometre = si.unit( prefix.kilo(metre) )
+            >>> kilometre.unit_id
+            2
+            >>> t = si.tables()
+            >>> t.reference[ kilometre.unit_id ] == metre.unit_id
+            True
+            >>> t.factor[ kilometre.unit_id ]
+            1000.0
+            >>> si.koq_for_id( t.koq[ kilometre.unit_id ] )
+            KindOfQuantity('Length','L')
+            
+        """
+        return UnitTables(
+            self._table_koq,
+            self._table_reference,
+            self._table_factor,
+            self._table_scale_type
+        )
+        
     def unit(self,scale):
         """
         Register a new scale as a unit 
@@ -222,33 +581,84 @@ class UnitRegister(object):
         already have a scale with the same name or symbol 
         
         """
-        scale_type = type(scale)
+        return self.units( (scale,) )[0]
         
-        units_dict = self._koq_to_units_dict.get(
-            scale.kind_of_quantity,
-            UnitsDict({})
-        )
-
-        if (
-            scale.name in units_dict  
-        or  scale.symbol in units_dict
-        ):
-            raise RuntimeError(
-                "{!r} is already a registered unit for {!r}".format(
-                    scale.name,
-                    scale.kind_of_quantity
+    def units(self,scales):
+        """
+        Register a sequence of new scales as units 
+        
+        Every scale is checked before any is registered, 
+        so either all the scales become units or none do.
+        The names and symbols must not be used already 
+        for the same kind of quantity and type of scale,  
+        nor by another scale in ``scales``.
+        
+        Returns a list of the new units, in the order of ``scales``.
+        
+        Example::
+        
+            >>> context = Context( ('Length','L') )
+            >>> SI = UnitRegister("SI",context)
+            >>> metre = SI.unit( RatioScale(context['Length'],'metre','m') )
+            >>> units = SI.units( p_i(metre) for p_i in prefix.metric_prefixes )
+            >>> len(units)
+            20
+            >>> print( SI.Length.millimetre )
+            mm
+            
+        """
+        scales = list(scales)
+        
+        # The keys claimed by earlier scales in the batch, for each 
+        # koq and scale type. Keys already in use are looked up in 
+        # the register, so the cost does not grow with its size.
+        claimed = dict()
+        for scale in scales:
+            koq = scale.kind_of_quantity
+            scale_type = type(scale)
+            
+            if koq not in self._context._koq_signature:
+                raise RuntimeError(
+                    "{!r} is not declared in the context".format(koq)
                 )
-            )
-
-        u = RegisteredUnit(self,scale)
-        self._register_unit( u ) 
+            
+            units_dict = self._koq_to_units_dict.get(koq,{}).get(scale_type,{})
+            keys = claimed.setdefault( (koq,scale_type), set() )
+            
+            if any( 
+                key in keys or key in units_dict 
+                    for key in (scale.name,scale.symbol) 
+            ):
+                raise RuntimeError(
+                    "{!r} is already a registered unit for {!r}".format(
+                        scale.name,
+                        scale.kind_of_quantity
+                    )
+                )
+            
+            for key in (scale.name,scale.symbol):
+                if hasattr(UnitsDict,key):
+                    raise AttributeError( 
+                        "'{!s}' is an attribute of {}".format(
+                            key,UnitsDict.__name__
+                        ) 
+                    )                
+                keys.add(key)
+            
+        units = [ RegisteredUnit(self,scale) for scale in scales ]
+        for u in units:
+            self._register_unit( u ) 
         
-        return u
+        return units
   
     def conversion_function_values(self,A,B,*args):
         """
         Register a function to convert from scale `A` to `B` 
         
+        The arguments ``args`` are a factor, when `A` and `B` are 
+        ratio scales, or a factor and an offset, when either is 
+        an interval scale. The function is an :class:`.AffineConversion`.
+        
         """
         src_koq = A.scale.kind_of_quantity
         dst_koq = B.scale.kind_of_quantity
@@ -266,10 +676,12 @@ class UnitRegister(object):
         type_A = type(A.scale)
         type_B = type(B.scale)
         if type_A is RatioScale and type_B is RatioScale:
-            full_fn = RatioScale.value_conversion_function()
+            factor, = args
+            fn = AffineConversion(factor)
             
         elif type_A is IntervalScale or type_B is IntervalScale:
-            full_fn = IntervalScale.value_conversion_function()
+            factor, offset = args
+            fn = AffineConversion(factor,offset)
             
         else:
             # Ordinal and nominal scales are not yet covered.
@@ -277,9 +689,13 @@ class UnitRegister(object):
                 "{!r} or {!r} are not supported".format(A.scale,B.scale)
             )
 
-        # This applies the conversion parameter values but leaves `x`
-        partial_fn = partial(full_fn,*args)
-        self._conversion_fn[(A.scale.symbol,B.scale.symbol)] = partial_fn        
+        for u in (A,B):
+            if u.register is not self or u.unit_id is None:
+                raise RuntimeError(
+                    "unregistered unit: {!r}".format(u)
+                )
+                
+        self._conversion_fn[(A.unit_id,B.unit_id)] = fn        
         
     def conversion_from_A_to_B(self,A,B):
         """
@@ -289,15 +705,18 @@ class UnitRegister(object):
         on `A` and returns a quantity-value result on `B`
         
         """
-        if A.scale.symbol == B.scale.symbol:
-            return lambda x: x
+        # Units are compared by identity: different units 
+        # may have the same symbol. The conversion is an object, 
+        # rather than a lambda, so that it can be pickled.
+        if A is B or A.scale is B.scale:
+            return AffineConversion(1)
             
         # For ratio scales we may use the `conversion_factor` information 
         # in the Scale objects to find the conversion factor.
         # This avoids the need to register lots of functions.
         if type(A.scale) is RatioScale and type(B.scale) is RatioScale:            
             factor = A.scale.conversion_factor / B.scale.conversion_factor
-            return lambda x: factor*x 
+            return AffineConversion(factor)
             
         if not isinstance(A,RegisteredUnit):
             raise RuntimeError(
@@ -306,6 +725,64 @@ class UnitRegister(object):
             
         return A.conversion_to(B)
 
+    def _chain_conversion(self,A,B):
+        """
+        Return a conversion from unit `A` to unit `B` composed from 
+        a chain of registered conversions, or `None` if there is none 
+        
+        Ratio-scale units for the same kind of quantity are linked by 
+        their conversion factors, so they need not be registered.
+        The composed conversion is registered for `A` and `B`.
+        
+        """
+        koq = A.scale.kind_of_quantity
+        if B.scale.kind_of_quantity is not koq:
+            return None
+            
+        # The units for `koq`, by id
+        units = dict()
+        for units_dict in self._koq_to_units_dict.get(koq,{}).values():
+            for u in units_dict.values():
+                units[u.unit_id] = u
+                
+        edges = dict()
+        for (src,dst),fn in self._conversion_fn.items():
+            if src in units and dst in units and isinstance(fn,AffineConversion):
+                edges.setdefault(src,[]).append( (dst,fn) )
+                
+        ratio_units = [ 
+            u for u in units.values() if type(u.scale) is RatioScale 
+        ]
+        
+        # Breadth-first search, composing the conversions on the way
+        fns = { A.unit_id: AffineConversion(1) }
+        queue = deque( [A] )
+        while queue:
+            u = queue.popleft()
+            fn = fns[u.unit_id]
+            
+            successors = list( edges.get(u.unit_id,()) )
+            if type(u.scale) is RatioScale:
+                successors.extend( 
+                    ( 
+                        v.unit_id, 
+                        AffineConversion( 
+                            u.scale.conversion_factor / v.scale.conversion_factor 
+                        ) 
+                    )
+                        for v in ratio_units
+                )
+                
+            for dst,step in successors:
+                if dst not in fns:
+                    fns[dst] = fn.then(step)
+                    if dst == B.unit_id:
+                        self._conversion_fn[(A.unit_id,dst)] = fns[dst]
+                        return fns[dst]
+                    queue.append( units[dst] )
+            
+        return None
+        
 #----------------------------------------------------------------------------
 def proportional_unit(unit,name,symbol,conversion_factor):
     """
@@ -328,7 +805,7 @@ def proportional_unit(unit,name,symbol,conversion_factor):
     # The derived scale is the same type and quantity
     s = scale.__class__(scale.kind_of_quantity,name,symbol)
 
-    if register.reference_unit_for(unit) is unit:
+    if getattr(unit,'reference_unit',None) is unit:
         # The multiplier converts to the reference scale 
         s.conversion_factor = conversion_factor 
         
@@ -28,25 +28,29 @@ class UnitsDict(MutableMapping):
         return self._units[key]
 
     def __setitem__(self, key, value):
-        # Use the fact that keys are also attributes
-        if hasattr(self,key):           
-            if key in self._units:
-                # Require unique keys
-                raise RuntimeError(
-                    "'{!s}' is the used by {!r} ".format(
-                        key,
-                        self._units[key]
-                    )
+        self._check_key(key)
+        self._units[key] = value
+
+    def _check_key(self, key):
+        # Keys are also attributes, so a key must be unique
+        # and must not hide an attribute of the object.
+        # NB, `hasattr(self,key)` would go through `__getattr__`
+        # and raise an exception for every new key.
+        if key in self._units:
+            # Require unique keys
+            raise RuntimeError(
+                "'{!s}' is the used by {!r} ".format(
+                    key,
+                    self._units[key]
                 )
-            else:
-                # Cannot use object attribute names, like 'update'
-                raise AttributeError( 
-                    "'{!s}' is an attribute of {}".format(
-                        key,self.__class__.__name__
-                    ) 
-                )                
-        else:
-            self._units[key] = value
+            )
+        elif hasattr(self.__class__,key) or key in self.__dict__:
+            # Cannot use object attribute names, like 'update'
+            raise AttributeError( 
+                "'{!s}' is an attribute of {}".format(
+                    key,self.__class__.__name__
+                ) 
+            )                
 
     def __delitem__(self, key):
         # NB, usually two keys refer to the same unit
@@ -61,8 +65,9 @@ class UnitsDict(MutableMapping):
         return len(self._units)
 
     def __getattr__(self, attr):
-        if attr in self._units:
-            return self._units[attr]
+        units = self.__dict__.get('_units',{})
+        if attr in units:
+            return units[attr]
         else:
             raise AttributeError( "{!r} not found".format(attr) )
                        
@@ -0,0 +1,45 @@
+"""
+Timing of arithmetic between quantity values and plain numbers
+
+Run from the repository root::
+
+    python -m benchmarks.scalar
+
+"""
+import timeit
+
+from QV import *
+
+#----------------------------------------------------------------------------
+def _setup():
+    context = Context( ("Voltage","V"), )
+    ureg = UnitRegister("ureg",context)
+    volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+    millivolt = ureg.unit( prefix.milli(volt) )
+    return dict(
+        q = qvalue(1.5,millivolt),
+        qvalue = qvalue,
+        millivolt = millivolt
+    )
+
+CASES = (
+    ( '2*q', '2*q' ),
+    ( 'q*2', 'q*2' ),
+    ( 'q/3', 'q/3' ),
+    ( '3/q', '3/q' ),
+    ( 'qvalue(2*q.value,q.unit)', 'qvalue(2*q.value,q.unit)' ),
+)
+
+def main(number=200000,repeat=5):
+    namespace = _setup()
+    for label,stmt in CASES:
+        t = min(
+            timeit.repeat(stmt,globals=namespace,number=number,repeat=repeat)
+        )
+        print(
+            "{:<28s} {:8.3f} us".format( label, 1E6*t/number )
+        )
+
+# ===========================================================================
+if __name__ == "__main__":
+    main()
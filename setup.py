@@ -90,12 +90,13 @@ def fetch_init(key):
     return re.compile(r'{}\s*=\s*(.*)'.format(key)).search(init_text).group(1)[1:-1]
 
 
-install_requires = ['bidict']
+install_requires = []
 
 tests_require = [
     'pytest>=4.4',  # >=4.4 to support the "-p conftest" option
     'pytest-cov',
     'sybil',
+    'numpy',
 ]
 
 testing = {'test', 'tests', 'pytest'}.intersection(sys.argv)
@@ -122,9 +123,6 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
         'Topic :: Software Development',
@@ -132,8 +130,9 @@ setup(
     ],
     setup_requires=sphinx + pytest_runner,
     tests_require=tests_require,
+    python_requires='>=3.8',
     install_requires=install_requires,
-    extras_require={'tests': tests_require},
+    extras_require={'tests': tests_require, 'numpy': ['numpy']},
     cmdclass={'docs': BuildDocs, 'apidocs': ApiDocs},
     packages=find_packages(include=('QV*',)),
 )
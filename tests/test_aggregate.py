@@ -0,0 +1,166 @@
+import unittest
+
+from QV import * 
+from QV.prefix import *
+from QV.quantity_value import ValueUnit
+
+#----------------------------------------------------------------------------
+class TestAggregate(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Length","L"), ("Time","T"), ("Temperature","t") )
+        context.declare('Speed','V','Length/Time')
+        
+        self.si = si = UnitRegister("si",context)
+        self.metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        self.centimetre = si.unit( centi(self.metre) )
+        self.kilometre = si.unit( kilo(self.metre) )
+        self.second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.metre_per_second = si.unit( 
+            RatioScale(context['Speed'],'metre_per_second','m/s') 
+        )
+
+    def test_comparison(self):
+        m = self.metre
+        cm = self.centimetre
+        
+        self.assertTrue( qvalue(1,m) == qvalue(100,cm) )
+        self.assertFalse( qvalue(1,m) != qvalue(100,cm) )
+        self.assertTrue( qvalue(1,m) != qvalue(101,cm) )
+        self.assertTrue( qvalue(1,m) < qvalue(101,cm) )
+        self.assertTrue( qvalue(1,m) <= qvalue(100,cm) )
+        self.assertTrue( qvalue(102,cm) > qvalue(1,m) )
+        self.assertTrue( qvalue(102,cm) >= qvalue(1.02,m) )
+        self.assertTrue( qvalue(2,cm) > qvalue(1,cm) )
+        
+        # Unit expressions are resolved 
+        d = qvalue(10,m)
+        t = qvalue(2,self.second)
+        self.assertTrue( d/t == qvalue(5,self.metre_per_second) )
+        self.assertTrue( d/t < qvalue(6,self.metre_per_second) )
+        
+        # Different kinds of quantity are not equal and cannot be ordered
+        self.assertFalse( qvalue(1,m) == qvalue(1,self.second) )
+        self.assertTrue( qvalue(1,m) != qvalue(1,self.second) )
+        self.assertRaises( RuntimeError, ValueUnit.__lt__, qvalue(1,m), qvalue(1,self.second) )
+        self.assertRaises( RuntimeError, ValueUnit.__lt__, qvalue(1,m), 1 )
+        self.assertFalse( qvalue(1,m) == 1 )
+        
+        # Even when there is no reference unit for one of the kinds 
+        area = qvalue(1,m)*qvalue(1,m)
+        self.assertFalse( qvalue(1,m) == qvalue(1,m)*qvalue(1,self.second) )
+        self.assertTrue( qvalue(1,m) != area )
+        self.assertFalse( qvalue(1,m) in [ area, qvalue(1,self.second) ] )
+        self.assertTrue( qvalue(100,cm) in [ area, qvalue(1,m) ] )
+        self.assertRaises( RuntimeError, ValueUnit.__lt__, qvalue(1,m), area )
+        
+        celsius = self.si.unit( 
+            IntervalScale(self.si.context['Temperature'],'degree_Celsius','degC') 
+        )
+        self.assertFalse( qvalue(1,celsius) == qvalue(1,m) )
+        self.assertTrue( qvalue(1,celsius) != qvalue(1,m) )
+        self.assertTrue( qvalue(1,celsius) == qvalue(1,celsius) )
+        
+        # Different registers 
+        other = UnitRegister("other",self.si.context)
+        foot = other.unit( RatioScale(self.si.context['Length'],'foot','ft') )
+        self.assertFalse( qvalue(1,m) == qvalue(1,foot) )
+        self.assertRaises( RuntimeError, ValueUnit.__ge__, qvalue(1,m), qvalue(1,foot) )
+        
+        # Quantity values are mutable 
+        self.assertRaises( TypeError, hash, qvalue(1,m) )
+
+    def test_qsorted(self):
+        m = self.metre
+        cm = self.centimetre
+        km = self.kilometre
+        
+        x = [ 
+            qvalue(1.2,m), qvalue(35,cm), qvalue(0.001,km), 
+            qvalue(0.5,m), qvalue(100,cm), qvalue(2,cm) 
+        ]
+        
+        s = qsorted( x )
+        self.assertEqual( 
+            [ str(s_i) for s_i in s ],
+            ['2 cm', '35 cm', '0.5 m', '0.001 km', '100 cm', '1.2 m']
+        )
+        # The same objects are returned 
+        self.assertTrue( all( any( s_i is x_i for x_i in x ) for s_i in s ) )
+        
+        s = qsorted( x, reverse=True )
+        self.assertEqual( str(s[0]), '1.2 m' )
+        self.assertEqual( str(s[-1]), '2 cm' )
+        
+        # Same as sorting with the comparison operators
+        self.assertEqual( 
+            [ str(s_i) for s_i in qsorted(x) ],
+            [ str(s_i) for s_i in sorted(x) ]
+        )
+        
+        self.assertTrue( qmin(x) is x[5] )
+        self.assertTrue( qmax(x) is x[0] )
+        self.assertTrue( qmax( iter(x) ) is x[0] )
+        
+        self.assertEqual( qsorted([]), [] )
+        self.assertRaises( RuntimeError, qmax, [] )
+        
+        x.append( qvalue(1,self.second) )
+        self.assertRaises( RuntimeError, qsorted, x )
+        self.assertRaises( RuntimeError, qmin, x )
+        
+    def test_qsum(self):
+        from fractions import Fraction
+        
+        m = self.metre
+        cm = self.centimetre
+        km = self.kilometre
+        
+        x = [ 
+            qvalue(1.2,m), qvalue(35,cm), qvalue(0.001,km), 
+            qvalue(0.5,m), qvalue(100,cm), qvalue(2,cm) 
+        ]
+        
+        s = qsum( x )
+        self.assertTrue( s.unit is m )
+        self.assertAlmostEqual( s.value, 1.2 + 0.35 + 1 + 0.5 + 1 + 0.02, 14 )
+        
+        # The unit is kept when there is only one 
+        s = qsum( [ qvalue(35,cm), qvalue(2,cm) ] )
+        self.assertTrue( s.unit is cm )
+        self.assertEqual( s.value, 37 )
+        
+        # Compensated summation for floats
+        s = qsum( [ qvalue(0.1,m) ]*10 )
+        self.assertEqual( s.value, 1.0 )
+        
+        # Other types are summed pairwise 
+        s = qsum( [ qvalue(Fraction(1,3),m), qvalue(Fraction(1,6),m), qvalue(Fraction(1,2),m) ] ) 
+        self.assertEqual( s.value, 1 )
+        
+        # Numbers cannot be summed with the built-in `sum`, unless 
+        # they are numbers 
+        self.assertRaises( TypeError, sum, x )
+        
+        mean = qmean( iter(x) )
+        self.assertTrue( mean.unit is m )
+        self.assertAlmostEqual( mean.value, 4.07/6, 14 )
+        
+        mean = qmean( [ qvalue(35,cm), qvalue(2,cm) ] )
+        self.assertTrue( mean.unit is cm )
+        self.assertEqual( mean.value, 18.5 )
+        
+        # Unit expressions
+        d = qvalue(10,m)
+        t = qvalue(2,self.second)
+        s = qsum( [ d/t, qvalue(1,self.metre_per_second) ] )
+        self.assertTrue( s.unit is self.metre_per_second )
+        self.assertEqual( s.value, 6 )
+        
+        self.assertRaises( RuntimeError, qsum, [] )
+        self.assertRaises( RuntimeError, qmean, [] )
+        self.assertRaises( RuntimeError, qsum, x + [ qvalue(1,self.second) ] )
+        
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
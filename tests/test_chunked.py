@@ -0,0 +1,134 @@
+import unittest
+
+import numpy as np
+
+from QV import *
+from QV.prefix import *
+from QV.quantity_array import QArray, qarray
+from QV.chunked import Chunks, ChunkedQArray, chunked
+
+#----------------------------------------------------------------------------
+class TestChunkedQArray(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        context.declare('Speed','V','Length/Time')
+
+        self.si = si = UnitRegister("si",context)
+        self.metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        self.millimetre = si.unit( milli(self.metre) )
+        self.second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.metre_per_second = si.unit(
+            RatioScale(context['Speed'],'metre_per_second','m/s')
+        )
+
+        rng = np.random.default_rng(1)
+        self.d = [ rng.uniform(0,1000,50) for i in range(7) ]
+        self.t = [ rng.uniform(1,2,50) for i in range(7) ]
+
+    def test_lazy(self):
+        produced = []
+        def source():
+            for i,c in enumerate(self.d):
+                produced.append(i)
+                yield c
+
+        x = chunked(source,self.millimetre)
+        y = qresult( 3*x + x )
+        self.assertEqual( produced, [] )
+
+        # One chunk of the source at a time
+        chunks = iter(y)
+        first = next(chunks)
+        self.assertEqual( produced, [0,0] )
+        self.assertTrue( isinstance(first,QArray) )
+        self.assertTrue( first.unit is self.metre )
+        np.testing.assert_allclose( first.value, 4E-3*self.d[0] )
+
+        # The source is read again for each evaluation
+        self.assertEqual( len(x), 350 )
+        self.assertEqual( len(x), 350 )
+
+        # A sequence of chunks can be used more than once,
+        # an iterator cannot
+        x = chunked(self.d,self.millimetre)
+        self.assertEqual( len(x), 350 )
+        self.assertEqual( len(x), 350 )
+        self.assertRaises( TypeError, chunked, iter(self.d), self.millimetre )
+        self.assertRaises( TypeError, chunked, source(), self.millimetre )
+
+    def test_arithmetic(self):
+        d = chunked(self.d,self.millimetre)
+        t = chunked(self.t,self.second)
+        all_d = np.concatenate(self.d)
+        all_t = np.concatenate(self.t)
+
+        v = qresult(d/t)
+        self.assertTrue( isinstance(v,ChunkedQArray) )
+        self.assertTrue( v.unit is self.metre_per_second )
+        np.testing.assert_allclose( v.qarray().value, 1E-3*all_d/all_t )
+
+        # Different units are converted to the reference unit
+        x = d + chunked( [ 1E-3*c for c in self.d ], self.metre )
+        self.assertTrue( x.unit is self.metre )
+        np.testing.assert_allclose( x.qarray().value, 2E-3*all_d )
+
+        # Quantity values and numbers
+        x = qresult( d - qvalue(0.5,self.metre) )
+        self.assertTrue( x.unit is self.metre )
+        np.testing.assert_allclose( x.qarray().value, 1E-3*all_d - 0.5 )
+
+        x = qresult( qvalue(2.0,self.second) * v, self.metre )
+        np.testing.assert_allclose( x.qarray().value, 2E-3*all_d/all_t )
+
+        x = qresult( d*(1/t) )
+        np.testing.assert_allclose( x.qarray().value, 1E-3*all_d/all_t )
+
+        x = qresult( d*t**2/(t*t) )
+        self.assertTrue( x.unit is self.metre )
+        np.testing.assert_allclose( x.qarray().value, 1E-3*all_d )
+
+        # Operands must be chunked in the same way
+        short = chunked( self.t[:-1], self.second )
+        self.assertRaises( RuntimeError, list, d/short )
+        self.assertRaises( RuntimeError, list, short*d )
+
+        # A quantity array is split to match the chunks, in either order 
+        a = qarray( 1E-3*all_d, self.metre )
+        for x in (d + a, a + d):
+            self.assertTrue( isinstance(x,ChunkedQArray) )
+            self.assertTrue( x.unit is self.metre )
+            np.testing.assert_allclose( x.qarray().value, 2E-3*all_d )
+
+        x = qresult( a/t )
+        self.assertTrue( isinstance(x,ChunkedQArray) )
+        self.assertTrue( x.unit is self.metre_per_second )
+        np.testing.assert_allclose( x.qarray().value, 1E-3*all_d/all_t )
+
+        self.assertRaises( RuntimeError, list, d + a[:-1] )
+        self.assertRaises( RuntimeError, list, a[:-50] * t )
+
+    def test_reductions(self):
+        x = chunked(self.d,self.millimetre)
+        all_d = np.concatenate(self.d)
+
+        s = x.sum()
+        self.assertTrue( s.unit is self.millimetre )
+        self.assertAlmostEqual( s.value, np.sum(all_d), 9 )
+        self.assertAlmostEqual( x.mean().value, np.mean(all_d), 12 )
+        self.assertEqual( x.min().value, np.min(all_d) )
+        self.assertEqual( x.max().value, np.max(all_d) )
+
+        m = qresult( x.mean() )
+        self.assertAlmostEqual( m.value, 1E-3*np.mean(all_d), 15 )
+
+        self.assertEqual( chunked( [ [1,2], [3] ], self.metre ).sum().value, 6 )
+
+        empty = chunked( [], self.metre )
+        self.assertEqual( len(empty), 0 )
+        self.assertRaises( RuntimeError, empty.mean )
+        self.assertRaises( RuntimeError, empty.min )
+
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
-from bidict import ValueDuplicationError
+from QV.context import ValueDuplicationError
 
+import functools
+import operator
 import unittest
  
 from QV import * 
@@ -79,6 +81,41 @@ class TestContext(unittest.TestCase):
         self.assertTrue( Speed is context.evaluate('Length/Time') )
         self.assertTrue( SpeedRatio is context.evaluate( '(Length/Time)//(Length/Time)' ) )
         
+    def test_deep_expressions(self):
+
+        context = Context(
+            ('Length','L'),
+            ('Time','T')
+        )
+        Length = context['Length']
+        Time = context['Time']
+        
+        # Long chains of operations must not hit the recursion limit 
+        n = 5000 
+        e = functools.reduce( operator.mul, [Length]*n )
+        self.assertEqual( context._evaluate_signature(e), Signature(context,(n,0)) )
+        
+        e = functools.reduce( operator.truediv, [Length]*(n+1) )
+        self.assertEqual( context._evaluate_signature(e), Signature(context,(1-n,0)) )
+
+        e = functools.reduce( operator.mul, [Length,1/Time]*n )
+        self.assertEqual( context._evaluate_signature(e), Signature(context,(n,-n)) )
+        
+        # Powers of nested expressions  
+        e = ( (Length*Length/Time)**2 )**-1 
+        self.assertEqual( context._evaluate_signature(e), Signature(context,(-4,2)) )
+        
+        # A cancelled leaf still contributes to the denominator of a ratio
+        e = functools.reduce( operator.mul, [Length,Time/Time]*n )
+        self.assertEqual( 
+            context._evaluate_signature(e//e), 
+            Signature(context,(n,0)) // Signature(context,(n,0))
+        )
+        self.assertEqual( 
+            context._evaluate_signature(Length/Length), 
+            Signature(context,(0,0)) 
+        )
+        
     def test_failures(self):
 
         context = Context(
@@ -0,0 +1,103 @@
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+
+import QV
+
+# The time allowed for `import QV`, in microseconds.
+# This is generous: the package itself imports no submodules.
+BUDGET = 50000
+
+ROOT = os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) )
+
+#----------------------------------------------------------------------------
+def _import_times(statement):
+    """
+    Return a dict of the cumulative import times (in microseconds),
+    by module name, reported by ``python -X importtime``
+
+    """
+    result = subprocess.run(
+        [ sys.executable, '-X', 'importtime', '-c', statement ],
+        cwd=ROOT,
+        capture_output=True,
+        universal_newlines=True,
+        check=True
+    )
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            times[ fields[2].strip() ] = int( fields[1] )
+        except ValueError:
+            # The header line
+            continue
+    return times
+
+#----------------------------------------------------------------------------
+class TestImport(unittest.TestCase):
+
+    def test_import_time(self):
+        times = _import_times('import QV')
+
+        self.assertTrue( 'QV' in times )
+        self.assertTrue( times['QV'] < BUDGET, times['QV'] )
+
+        # Nothing else is needed until it is used
+        for name in ('numpy','bidict','QV.quantity_value','QV.quantity_array'):
+            self.assertFalse( name in times, name )
+
+        # NumPy is only imported for quantity arrays
+        result = subprocess.run(
+            [ 
+                sys.executable, '-c', 
+                'import sys; from QV import qvalue, UnitRegister, Context; '
+                'print( "QV.quantity_value" in sys.modules, "numpy" in sys.modules )' 
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            universal_newlines=True,
+            check=True
+        )
+        self.assertEqual( result.stdout.split(), ['True','False'] )
+        
+        # Nor by a star import 
+        result = subprocess.run(
+            [ 
+                sys.executable, '-c', 
+                'import sys; from QV import *; '
+                'print( "QV.quantity_array" in sys.modules, "numpy" in sys.modules )' 
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            universal_newlines=True,
+            check=True
+        )
+        self.assertEqual( result.stdout.split(), ['False','False'] )
+
+    def test_lazy_names(self):
+        for name in QV.__all__:
+            self.assertTrue( getattr(QV,name) is not None, name )
+            self.assertTrue( name in dir(QV), name )
+
+        # The module for quantity arrays and the function are distinct 
+        module = importlib.import_module('QV.quantity_array')
+        self.assertTrue( QV.quantity_array is module )
+        self.assertTrue( QV.qarray is module.qarray )
+        self.assertTrue( QV.QArray is module.QArray )
+
+        self.assertTrue( QV.KindOfQuantity is QV.kind_of_quantity.KindOfQuantity )
+        self.assertRaises(AttributeError,getattr,QV,'no_such_name')
+        
+        # Modules used by the package are not exposed 
+        for name in ('importlib','sys','types'):
+            self.assertFalse( name in dir(QV), name )
+            self.assertFalse( hasattr(QV,name), name )
+
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
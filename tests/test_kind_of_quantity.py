@@ -1,4 +1,4 @@
-from bidict import ValueDuplicationError
+from QV.context import ValueDuplicationError
 
 import unittest
  
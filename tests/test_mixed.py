@@ -0,0 +1,108 @@
+import unittest
+
+import numpy as np
+
+from QV import *
+from QV.prefix import *
+from QV.quantity_array import QArray
+from QV.mixed import MixedQArray, mixed_qarray
+
+#----------------------------------------------------------------------------
+class TestMixedQArray(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Voltage","V"), ("Temperature","t") )
+        self.ureg = ureg = UnitRegister("ureg",context)
+
+        self.volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        self.millivolt = ureg.unit( milli(self.volt) )
+        self.microvolt = ureg.unit( micro(self.volt) )
+
+        self.kelvin = ureg.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        self.celsius = ureg.unit( 
+            IntervalScale(context['Temperature'],'degree_Celsius','degC') 
+        )
+        ureg.conversion_function_values(self.celsius,self.kelvin,1,273.15)
+
+        rng = np.random.default_rng(2)
+        self.values = rng.uniform(-10,10,1000)
+        self.units = (self.volt,self.millivolt,self.microvolt)
+        self.ids = np.array( [ u.unit_id for u in self.units ], dtype=np.uint8 )
+        self.codes = self.ids[ rng.integers(0,3,1000) ]
+        
+        # Element-by-element results
+        self.expected = np.array([ 
+            qresult( qvalue(x,ureg.unit_for_id(c)) ).value 
+                for x,c in zip(self.values,self.codes) 
+        ])
+
+    def test_normalise(self):
+        x = mixed_qarray(self.values,self.codes,self.ureg)
+        self.assertEqual( len(x), 1000 )
+        self.assertTrue( x.reference_unit is self.volt )
+        self.assertEqual( x.units, self.units )
+
+        y = x.qarray()
+        self.assertTrue( isinstance(y,QArray) )
+        self.assertTrue( y.unit is self.volt )
+        np.testing.assert_allclose( y.value, self.expected, rtol=1E-15 )
+
+        y = x.qarray('mV')
+        self.assertTrue( y.unit is self.millivolt )
+        np.testing.assert_allclose( y.value, 1E3*self.expected, rtol=1E-14 )
+
+        # Indexing
+        self.assertEqual( x[3].value, self.values[3] )
+        self.assertTrue( x[3].unit is self.ureg.unit_for_id( self.codes[3] ) )
+        z = x[10:20]
+        self.assertTrue( isinstance(z,MixedQArray) )
+        np.testing.assert_allclose( z.qarray().value, self.expected[10:20] )
+
+    def test_reductions(self):
+        x = mixed_qarray(self.values,self.codes,self.ureg)
+
+        # Counts are indexed by unit id 
+        np.testing.assert_array_equal( 
+            x.counts()[self.ids], [ np.sum(self.codes == i) for i in self.ids ] 
+        )
+        s = x.sum()
+        self.assertTrue( s.unit is self.volt )
+        self.assertAlmostEqual( s.value, np.sum(self.expected), 11 )
+        self.assertAlmostEqual( x.mean().value, np.mean(self.expected), 13 )
+        self.assertAlmostEqual( x.min().value, np.min(self.expected), 15 )
+        self.assertAlmostEqual( x.max().value, np.max(self.expected), 15 )
+
+        # A single unit
+        mV = self.millivolt.unit_id
+        x = mixed_qarray( [1.0, 2.0], [mV, mV], self.ureg )
+        self.assertEqual( x.counts()[mV], 2 )
+        self.assertEqual( x.counts().sum(), 2 )
+        self.assertEqual( x.units, (self.millivolt,) )
+        self.assertEqual( x.min().value, 1E-3 )
+        self.assertEqual( x.mean().value, 1.5E-3 )
+
+        empty = mixed_qarray( [], np.array([],dtype=int), self.ureg )
+        self.assertRaises( RuntimeError, empty.mean )
+        self.assertRaises( RuntimeError, empty.max )
+        self.assertRaises( RuntimeError, empty.qarray )
+
+    def test_interval_scales(self):
+        C, K = self.celsius.unit_id, self.kelvin.unit_id
+        x = mixed_qarray( [20.0, 300.0, 30.0], [C, K, C], self.ureg )
+        self.assertTrue( x.reference_unit is self.kelvin )
+        np.testing.assert_allclose( x.qarray().value, [293.15, 300.0, 303.15] )
+        self.assertAlmostEqual( x.mean().value, 298.76666666666665, 12 )
+        self.assertAlmostEqual( x.max().value, 303.15, 12 )
+        self.assertRaises( RuntimeError, x.sum )
+
+    def test_errors(self):
+        V, K = self.volt.unit_id, self.kelvin.unit_id
+        self.assertRaises( RuntimeError, mixed_qarray, [1.0,2.0], [V,K], self.ureg )
+        self.assertRaises( RuntimeError, mixed_qarray, [1.0], [100], self.ureg )
+        self.assertRaises( RuntimeError, mixed_qarray, [1.0], [-1], self.ureg )
+        self.assertRaises( RuntimeError, mixed_qarray, [1.0], [1.0], self.ureg )
+        self.assertRaises( RuntimeError, mixed_qarray, [1.0,2.0], [V], self.ureg )
+
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import pickle
+import unittest
+
+from QV import * 
+from QV.prefix import *
+from QV.kind_of_quantity import Number
+from QV.parallel import qresult_map
+
+#----------------------------------------------------------------------------
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        context.declare('Speed','V','Length/Time')
+        
+        self.si = si = UnitRegister("si",context)
+        self.metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        self.millimetre = si.unit( milli(self.metre) )
+        self.second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.metre_per_second = si.unit( 
+            RatioScale(context['Speed'],'metre_per_second','m/s') 
+        )
+        self.millimetre_per_second = si.unit( 
+            proportional_unit(self.metre_per_second,'millimetre_per_second','mm/s',1E-3) 
+        )
+        si.conversion_function_values(self.millimetre,self.metre,1E-3)
+        
+    def test_pickle(self):
+        # A register must be sent to worker processes 
+        si = pickle.loads( pickle.dumps(self.si) )
+        
+        self.assertTrue( si.Length.mm.register is si )
+        self.assertTrue( si.Number.unity.kind_of_quantity is Number )
+        self.assertTrue( 
+            si.reference_unit_for( si.Length.mm/si.Time.s ) is si.Speed.metre_per_second 
+        )
+        x = qresult( qvalue(1.0,si.Length.mm)/qvalue(2.0,si.Time.s), 'mm/s' )
+        self.assertEqual( x.value, 0.5 )
+        self.assertEqual( si.Length.mm.conversion_to(si.Length.m)(5.0), 5E-3 ) 
+        
+    def test_qresult_map(self):
+        values = [ float(i) for i in range(101) ]
+        
+        results = qresult_map( values, self.millimetre, workers=3, chunk_size=7 )
+        self.assertEqual( len(results), len(values) )
+        for r_i,x_i in zip(results,values):
+            # Results refer to the units in this process 
+            self.assertTrue( r_i.unit is self.metre )
+            self.assertAlmostEqual( r_i.value, qresult( qvalue(x_i,self.millimetre) ).value, 15 )
+            
+        # A unit expression and a preferred unit 
+        results = qresult_map( values, self.metre/self.second, 'mm/s', workers=2 )
+        for r_i,x_i in zip(results,values):
+            self.assertTrue( r_i.unit is self.millimetre_per_second )
+            self.assertAlmostEqual( r_i.value, 1000*x_i, 12 )
+            
+        # In process 
+        results = qresult_map( values, self.millimetre, workers=1 )
+        for r_i,x_i in zip(results,values):
+            self.assertAlmostEqual( r_i.value, x_i/1000, 15 )
+
+        self.assertEqual( qresult_map( [], self.millimetre, workers=2 ), [] )
+        self.assertRaises( RuntimeError, qresult_map, values, self.metre, 'xx', workers=2 )
+        
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,365 @@
+import unittest
+from unittest import mock
+from fractions import Fraction
+
+import numpy as np
+
+from QV import * 
+from QV.prefix import *
+from QV import quantity_array
+from QV.quantity_value import ValueUnit
+from QV.quantity_array import QArray, qarray
+
+#----------------------------------------------------------------------------
+class TestQArray(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        context.declare('Speed','V','Length/Time')
+        context.declare('Area','A','Length**2')
+        
+        self.si = si = UnitRegister("si",context)
+        self.metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        self.centimetre = si.unit( centi(self.metre) )
+        self.second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.metre_per_second = si.unit( 
+            RatioScale(context['Speed'],'metre_per_second','m/s') 
+        )
+        self.square_metre = si.unit( RatioScale(context['Area'],'square_metre','m2') )
+
+    def test_construction(self):
+        x = qarray( [1.0,2.0,3.0], self.metre )
+        
+        self.assertTrue( isinstance(x,QArray) )
+        self.assertTrue( isinstance(x,ValueUnit) )
+        self.assertTrue( isinstance(value(x),np.ndarray) )
+        self.assertTrue( unit(x) is self.metre )
+        self.assertEqual( len(x), 3 )
+        
+        # Elements are quantity values 
+        x1 = x[1]
+        self.assertTrue( type(x1) is ValueUnit )
+        self.assertEqual( x1.value, 2.0 )
+        self.assertTrue( x1.unit is self.metre )
+        
+        # Slices are quantity arrays 
+        x12 = x[1:]
+        self.assertTrue( isinstance(x12,QArray) )
+        self.assertEqual( list(x12.value), [2.0,3.0] )
+        
+        self.assertEqual( [ v.value for v in x ], [1.0,2.0,3.0] )
+        
+    def test_arithmetic(self):
+        d = qarray( [1.0,2.0,3.0], self.metre )
+        c = qarray( [100.0,200.0,300.0], self.centimetre )
+        t = qvalue( 2.0, self.second )
+        
+        s = d + c 
+        self.assertTrue( isinstance(s,QArray) )
+        self.assertTrue( s.unit is self.metre )
+        np.testing.assert_allclose( s.value, [2.0,4.0,6.0] )
+        
+        s = c - d 
+        self.assertTrue( isinstance(s,QArray) )
+        np.testing.assert_allclose( s.value, [0.0,0.0,0.0] )
+        
+        v = qresult( d/t )
+        self.assertTrue( isinstance(v,QArray) )
+        self.assertTrue( v.unit is self.metre_per_second )
+        np.testing.assert_allclose( v.value, [0.5,1.0,1.5] )
+        
+        # A quantity value on the left 
+        x = qresult( t*v )
+        self.assertTrue( isinstance(x,QArray) )
+        self.assertTrue( x.unit is self.metre )
+        np.testing.assert_allclose( x.value, d.value )
+
+        x = qvalue( 1.0, self.metre ) + c 
+        self.assertTrue( isinstance(x,QArray) )
+        np.testing.assert_allclose( x.value, [2.0,3.0,4.0] )
+        
+        x = 2 * d 
+        self.assertTrue( isinstance(x,QArray) )
+        np.testing.assert_allclose( qresult(x).value, [2.0,4.0,6.0] )
+
+        # A quantity value and a NumPy array, in either order 
+        a = np.array( [1.0,2.0,4.0] )
+        for x in (t * a, a * t):
+            self.assertTrue( isinstance(x,QArray) )
+            self.assertTrue( x.unit is self.second )
+            np.testing.assert_allclose( x.value, [2.0,4.0,8.0] )
+            
+        x = t / a
+        self.assertTrue( isinstance(x,QArray) )
+        self.assertTrue( x.unit is self.second )
+        np.testing.assert_allclose( x.value, [2.0,1.0,0.5] )
+        
+        x = a / t
+        self.assertTrue( isinstance(x,QArray) )
+        np.testing.assert_allclose( x.value, [0.5,1.0,2.0] )
+
+        x = qresult( c**2 )
+        self.assertTrue( isinstance(x,QArray) )
+        np.testing.assert_allclose( x.value, [1.0,4.0,9.0] )
+
+        x = qresult( c, 'm' )
+        self.assertTrue( isinstance(x,QArray) )
+        self.assertTrue( x.unit is self.metre )
+        np.testing.assert_allclose( x.value, [1.0,2.0,3.0] )
+        
+    def test_interval_scales(self):
+        context = Context( ("Temperature","t") )
+        ureg = UnitRegister("ureg",context)
+        
+        kelvin = ureg.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        celsius = ureg.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        fahrenheit = ureg.unit( IntervalScale(context['Temperature'],'degree_Fahrenheit','degF') )
+        ureg.conversion_function_values(celsius,kelvin,1,273.15)
+        ureg.conversion_function_values(fahrenheit,celsius,5/9,-32*5/9)
+        
+        t = qarray( [-40.0,32.0,212.0], fahrenheit )
+        x = qresult( t )
+        self.assertTrue( isinstance(x,QArray) )
+        self.assertTrue( x.unit is kelvin )
+        np.testing.assert_allclose( x.value, [233.15,273.15,373.15] )
+        
+        # Integer arrays
+        t = qarray( [0,100], celsius )
+        np.testing.assert_allclose( qresult(t).value, [273.15,373.15] )
+        
+        # Statistics that are spreads of values need a ratio scale
+        self.assertTrue( t.mean().unit is celsius )
+        self.assertRaises( RuntimeError, t.std )
+        self.assertRaises( RuntimeError, t.var )
+        self.assertRaises( RuntimeError, t.ptp )
+
+    def test_statistics(self):
+        data = np.random.default_rng(3).normal(150.0,20.0,(4,250))
+        x = qarray( data, self.centimetre )
+        
+        for name in ('mean','median','std','ptp'):
+            r = getattr(x,name)()
+            self.assertTrue( type(r) is ValueUnit )
+            self.assertTrue( r.unit is self.centimetre )
+            self.assertEqual( r.value, getattr(np,name)(data) )
+            
+        # Along an axis 
+        r = x.mean(axis=1)
+        self.assertTrue( isinstance(r,QArray) )
+        np.testing.assert_array_equal( r.value, np.mean(data,axis=1) )
+        
+        r = x.percentile( [5,95] )
+        self.assertTrue( isinstance(r,QArray) )
+        self.assertTrue( r.unit is self.centimetre )
+        np.testing.assert_array_equal( r.value, np.percentile(data,[5,95]) )
+        
+        # The variance is in the unit squared 
+        v = x.var(ddof=1)
+        self.assertEqual( v.value, np.var(data,ddof=1) )
+        v = qresult(v)
+        self.assertTrue( v.unit is self.square_metre )
+        self.assertAlmostEqual( v.value, 1E-4*np.var(data,ddof=1), 12 )
+        self.assertEqual( x.std(ddof=1).value, np.std(data,ddof=1) )
+        
+        # Histograms 
+        counts, edges = x.histogram(20)
+        expected_counts, expected_edges = np.histogram(data,20)
+        np.testing.assert_array_equal( counts, expected_counts )
+        self.assertTrue( isinstance(edges,QArray) )
+        self.assertTrue( edges.unit is self.centimetre )
+        np.testing.assert_array_equal( edges.value, expected_edges )
+        
+        # Bin edges and limits in other units are converted
+        counts, edges = x.histogram( qarray( [0.5,1.5,2.5], self.metre ) )
+        np.testing.assert_array_equal( 
+            counts, np.histogram(data,[50.0,150.0,250.0])[0] 
+        )
+        np.testing.assert_allclose( edges.value, [50.0,150.0,250.0] )
+        
+        counts, edges = x.histogram( 
+            4, ( qvalue(1.0,self.metre), qvalue(200.0,self.centimetre) ) 
+        )
+        np.testing.assert_array_equal( 
+            counts, np.histogram(data,4,(100.0,200.0))[0] 
+        )
+        
+        # but must be for the same kind of quantity
+        self.assertRaises( 
+            RuntimeError, 
+            x.histogram, 4, ( qvalue(1.0,self.second), qvalue(2.0,self.second) ) 
+        )
+
+    def test_qratio(self):
+        context = self.si.context
+        context.declare('length_ratio','L/L','Length//Length')
+        metre_per_metre = self.si.unit( 
+            RatioScale(context['length_ratio'],'metre_per_metre','m/m') 
+        )
+        centimetre_per_metre = self.si.unit( centi(metre_per_metre) )
+        
+        rng = np.random.default_rng(4)
+        l1 = rng.uniform(1,2,1000)
+        l2 = rng.uniform(50,100,1000)
+        
+        r = qratio( qarray(l1,self.metre), qarray(l2,self.centimetre) )
+        self.assertTrue( isinstance(r,QArray) )
+        self.assertTrue( r.unit is metre_per_metre )
+        expected = np.array([ 
+            qratio( qvalue(x1,self.metre), qvalue(x2,self.centimetre) ).value
+                for x1,x2 in zip(l1,l2)
+        ])
+        np.testing.assert_allclose( r.value, expected, rtol=1E-15 )
+        
+        r = qratio( qarray(l1,self.metre), qvalue(2.0,self.metre), centimetre_per_metre )
+        self.assertTrue( r.unit is centimetre_per_metre )
+        np.testing.assert_allclose( r.value, 50*l1, rtol=1E-15 )
+        
+        # Sequences of quantity values 
+        r = qratio( 
+            [ qvalue(1.0,self.metre), qvalue(50.0,self.centimetre) ],
+            [ qvalue(2.0,self.metre), qvalue(2.0,self.metre) ] 
+        )
+        self.assertTrue( isinstance(r,QArray) )
+        np.testing.assert_allclose( r.value, [0.5,0.25] )
+        
+        # Conversions are resolved once for each unit, not each value 
+        lengths = [ 
+            qvalue(x,u) for x in range(100) 
+                for u in (self.metre,self.centimetre) 
+        ]
+        with mock.patch.object(
+            quantity_array, '_resolve_conversion', 
+            wraps=quantity_array._resolve_conversion
+        ) as resolve:
+            r = qratio( lengths, qvalue(1.0,self.metre) )
+        self.assertTrue( resolve.call_count < 10 )
+        np.testing.assert_allclose( r.value[:4], [0.0,0.0,1.0,0.01] )
+        
+        # Scalars give quantity values 
+        r = qratio( qvalue(1.0,self.metre), qvalue(4.0,self.metre) )
+        self.assertTrue( type(r) is ValueUnit )
+        self.assertEqual( r.value, 0.25 )
+        
+        self.assertRaises( 
+            RuntimeError, qratio, [ qvalue(1.0,self.metre), qvalue(1.0,self.second) ], 
+            qvalue(1.0,self.metre) 
+        )
+        self.assertRaises( RuntimeError, qratio, [], qvalue(1.0,self.metre) )
+
+    def test_ufuncs(self):
+        x = qarray( [1.0,4.0,9.0], self.centimetre )
+        y = qarray( [0.5,0.25,0.125], self.metre )
+        t = qarray( [2.0,2.0,4.0], self.second )
+        
+        # Arithmetic 
+        r = np.add(x,y)
+        self.assertTrue( isinstance(r,QArray) )
+        self.assertTrue( r.unit is self.metre )
+        np.testing.assert_allclose( r.value, [0.51,0.29,0.215] )
+        
+        r = np.subtract(x,x)
+        self.assertTrue( r.unit is self.centimetre )
+        
+        r = qresult( np.divide(y,t) )
+        self.assertTrue( r.unit is self.metre_per_second )
+        np.testing.assert_allclose( r.value, [0.25,0.125,0.03125] )
+        
+        r = qresult( np.multiply(2.0,np.multiply(y,3)) )
+        np.testing.assert_allclose( r.value, [3.0,1.5,0.75] )
+        
+        # NumPy scalars and arrays 
+        r = np.float64(2.0) * y 
+        self.assertTrue( isinstance(r,QArray) )
+        np.testing.assert_allclose( qresult(r).value, [1.0,0.5,0.25] )
+        r = np.array([1.0,2.0,4.0]) * y 
+        self.assertTrue( isinstance(r,QArray) )
+        np.testing.assert_allclose( qresult(r).value, [0.5,0.5,0.5] )
+        
+        # Powers
+        r = qresult( np.square(y) )
+        self.assertTrue( r.unit is self.square_metre )
+        np.testing.assert_allclose( r.value, [0.25,0.0625,0.015625] )
+        
+        a = qarray( [4.0,9.0], self.square_metre )
+        r = qresult( np.sqrt(a) )
+        self.assertTrue( r.unit is self.metre )
+        self.assertEqual( r.value.dtype, np.float64 )
+        np.testing.assert_allclose( r.value, [2.0,3.0] )
+        r = qresult( a**Fraction(1,2) )
+        self.assertEqual( r.value.dtype, np.float64 )
+        np.testing.assert_allclose( r.value, [2.0,3.0] )
+        
+        # The unit is unchanged 
+        r = np.negative( np.absolute(x) )
+        self.assertTrue( r.unit is self.centimetre )
+        np.testing.assert_array_equal( r.value, [-1.0,-4.0,-9.0] )
+        np.testing.assert_array_equal( np.isfinite(x), [True,True,True] )
+        
+        # Comparisons and extremes 
+        np.testing.assert_array_equal( np.less(x,y), [True,True,True] )
+        np.testing.assert_array_equal( x > qvalue(3.0,self.centimetre), [False,True,True] )
+        r = np.maximum(x,y)
+        self.assertTrue( r.unit is self.metre )
+        np.testing.assert_allclose( r.value, [0.5,0.25,0.125] )
+        
+        # A scalar quantity value 
+        r = np.sqrt( qvalue(16.0,self.square_metre) )
+        self.assertTrue( type(r) is ValueUnit )
+        self.assertEqual( qresult(r).value, 4.0 )
+        
+        # Units are checked 
+        self.assertRaises( AssertionError, np.add, x, t )
+        self.assertRaises( RuntimeError, np.less, x, t )
+        self.assertRaises( TypeError, np.add, x, 1.0 )
+        self.assertRaises( TypeError, np.exp, x )
+        self.assertRaises( TypeError, np.add, x, x, out=np.empty(3) )
+        
+    def test_array_functions(self):
+        x = qarray( [1.0,4.0,9.0], self.centimetre )
+        y = qarray( [0.5,0.25], self.metre )
+        
+        r = np.sum(x)
+        self.assertTrue( type(r) is ValueUnit )
+        self.assertTrue( r.unit is self.centimetre )
+        self.assertEqual( r.value, 14.0 )
+        self.assertEqual( np.add.reduce(x).value, 14.0 )
+        self.assertEqual( np.max(x).value, 9.0 )
+        self.assertEqual( np.maximum.reduce(x).value, 9.0 )
+        
+        for fn in (np.mean,np.median,np.std,np.ptp):
+            r = fn(x)
+            self.assertTrue( r.unit is self.centimetre )
+            self.assertEqual( r.value, fn(x.value) )
+        
+        r = qresult( np.var(x) )
+        self.assertTrue( r.unit is self.square_metre )
+        self.assertAlmostEqual( r.value, 1E-4*np.var(x.value), 15 )
+        
+        r = np.cumsum(x)
+        self.assertTrue( isinstance(r,QArray) )
+        np.testing.assert_array_equal( r.value, [1.0,5.0,14.0] )
+        
+        r = np.reshape(x,(3,1))
+        self.assertEqual( r.value.shape, (3,1) )
+        self.assertEqual( np.shape(x), (3,) )
+        self.assertEqual( np.argmax(x), 2 )
+        
+        # Values are converted to the unit of the first array 
+        r = np.concatenate( (x,y) )
+        self.assertTrue( r.unit is self.centimetre )
+        np.testing.assert_allclose( r.value, [1.0,4.0,9.0,50.0,25.0] )
+        
+        counts, edges = np.histogram(x,bins=2)
+        np.testing.assert_array_equal( counts, [2,1] )
+        self.assertTrue( edges.unit is self.centimetre )
+        
+        # Units are checked 
+        t = qarray( [1.0], self.second )
+        self.assertRaises( RuntimeError, np.concatenate, (x,t) )
+        self.assertRaises( TypeError, np.concatenate, (x,[1.0]) )
+        self.assertRaises( TypeError, np.clip, x, y[0], y[1] )
+        self.assertRaises( TypeError, np.fft.fft, x )
+
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
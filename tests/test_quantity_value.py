@@ -1,9 +1,13 @@
+import pickle
 import unittest
+from unittest import mock
 
 from QV import * 
 from QV.prefix import *
+from QV import quantity_value
 from QV.kind_of_quantity import Number
 from QV.quantity_value import ValueUnit
+from QV.scale import AffineConversion
 
 #----------------------------------------------------------------------------
 class TestQuantityValue(unittest.TestCase):
@@ -216,6 +220,399 @@ class TestQuantityValue(unittest.TestCase):
         self.assertEqual( "1000000.0 V/V", str( qresult(gain,volt_per_volt) ) )
         # Inappropriate unit
         self.assertRaises( RuntimeError, qratio, v1, v2, unit = volt  )
+
+    def test_interval_scales(self):
+    
+        context = Context( ("Temperature","t"), ("Length","L") )
+        ureg = UnitRegister("ureg",context)
+        
+        kelvin = ureg.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        millikelvin = ureg.unit( milli(kelvin) )
+        celsius = ureg.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        fahrenheit = ureg.unit( IntervalScale(context['Temperature'],'degree_Fahrenheit','degF') )
+        ureg.conversion_function_values(celsius,kelvin,1,273.15)
+        ureg.conversion_function_values(kelvin,celsius,1,-273.15)
+        ureg.conversion_function_values(fahrenheit,celsius,5/9,-32*5/9)
+        
+        t = qvalue(212,fahrenheit)
+        
+        # Conversions are chained through registered conversions 
+        # and ratio-scale units of the same kind of quantity
+        x = qresult(t)
+        self.assertTrue( x.unit is kelvin )
+        self.assertAlmostEqual( x.value, 373.15, 12 )
+        
+        x = qresult(t,'degC')
+        self.assertTrue( x.unit is celsius )
+        self.assertAlmostEqual( x.value, 100.0, 12 )
+ 
+        x = qresult(t,millikelvin)
+        self.assertTrue( x.unit is millikelvin )
+        self.assertAlmostEqual( x.value, 373150.0, 9 )
+        
+        x = qresult( qvalue(1000,millikelvin), celsius )
+        self.assertAlmostEqual( x.value, -272.15, 12 )
+        
+        # The chain is composed into a single conversion, which is kept
+        fn = ureg.conversion_from_A_to_B(fahrenheit,millikelvin)
+        self.assertTrue( isinstance(fn,AffineConversion) )
+        self.assertTrue( fn is ureg.conversion_from_A_to_B(fahrenheit,millikelvin) )
+        
+        # There is no conversion from Celsius to Fahrenheit
+        self.assertRaises( RuntimeError, qresult, qvalue(1,celsius), fahrenheit )
+        
+        # Interval-scale values cannot be added 
+        self.assertRaises( RuntimeError, ValueUnit.__add__, t, t )
+        
+    def test_powers(self):
+    
+        from fractions import Fraction
+        from QV import registered_unit
+        
+        context = Context( ("Length","L"), ("Time","T"), ("Voltage","V") )
+        Area = context.declare('Area','A','Length**2')
+        Volume = context.declare('Volume','Vol','Length*Length*Length')
+        Frequency = context.declare('Frequency','F','1/Time')
+        NoiseDensity = context.declare(
+            'NoiseDensity','Vn', 
+            context['Voltage']/context['Frequency']**Fraction(1,2)
+        )
+        
+        si = UnitRegister("si",context)
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        centimetre = si.unit( centi(metre) )
+        square_metre = si.unit( RatioScale(Area,'square_metre','m2') )
+        cubic_metre = si.unit( RatioScale(Volume,'cubic_metre','m3') )
+        hertz = si.unit( RatioScale(Frequency,'hertz','Hz') )
+        kilohertz = si.unit( kilo(hertz) )
+        volt = si.unit( RatioScale(context['Voltage'],'volt','V') )
+        nanovolt = si.unit( nano(volt) )
+        volt_per_root_hertz = si.unit( 
+            RatioScale(NoiseDensity,'volt_per_root_hertz','V/Hz**(1/2)') 
+        )
+        
+        x = qvalue(3.0,centimetre)
+        
+        # A single expression node, whatever the power 
+        x3 = x**3
+        self.assertTrue( isinstance(x3.unit,registered_unit.Pow) )
+        self.assertTrue( x3.unit.arg is centimetre )
+        self.assertAlmostEqual( x3.unit.scale.conversion_factor, 1E-6, 20 )
+        
+        self.assertTrue( qresult(x**2).unit is square_metre )
+        self.assertAlmostEqual( qresult(x**2).value, 9E-4, 18 )
+        self.assertTrue( qresult(x3).unit is cubic_metre )
+        self.assertAlmostEqual( qresult(x3).value, 2.7E-5, 18 )
+        self.assertAlmostEqual( qresult(x3).value, qresult(x*x*x).value, 18 )
+        
+        # A negative power 
+        f = qresult( x3 * qvalue(2.0,metre)**-2, 'cm' ) 
+        self.assertTrue( f.unit is centimetre )
+        self.assertAlmostEqual( f.value, 6.75E-4, 18 )
+        
+        # Rational powers 
+        bw = qvalue(0.25,kilohertz)
+        noise = qresult( qvalue(4.0,nanovolt)/bw**Fraction(1,2) )
+        self.assertTrue( noise.unit is volt_per_root_hertz )
+        self.assertAlmostEqual( noise.value, 4E-9/250**0.5, 22 )
+
+        f = qresult( (x**Fraction(2,3))**Fraction(3,2), metre )
+        self.assertAlmostEqual( f.value, 0.03, 15 )
+        
+        # Other exponents are not allowed
+        self.assertRaises( RuntimeError, pow, x, 0.5 )
+        self.assertRaises( RuntimeError, pow, metre, 0.5 )
+        
+    def test_qmap(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        Speed = context.declare('Speed','V','Length/Time')
+        si = UnitRegister("si",context)
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        centimetre = si.unit( centi(metre) )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+        centimetre_per_second = si.unit( centi(metre_per_second) )
+        
+        d = [ 
+            qvalue(1.5,metre), qvalue(20,centimetre), 
+            qvalue(3.0,metre), qvalue(50,centimetre)
+        ] 
+        t = [ qvalue(x,second) for x in (0.5, 2.0, 4.0, 0.25) ]
+
+        calls = []
+        def speed(d,t):
+            calls.append( (d,t) )
+            return d/t 
+        
+        results = list( qmap(speed,d,t) )
+        expected = [ qresult(d_i/t_i) for d_i,t_i in zip(d,t) ] 
+        
+        self.assertEqual( len(results), 4 )
+        for r, e in zip(results,expected):
+            self.assertTrue( r.unit is metre_per_second )
+            self.assertAlmostEqual( r.value, e.value, 15 )
+            
+        # `fn` is called once for each set of arguments, 
+        # always with quantity values
+        self.assertEqual( len(calls), 4 )
+        for d_i,t_i in calls:
+            self.assertTrue( isinstance(d_i,ValueUnit) )
+            self.assertTrue( isinstance(t_i,ValueUnit) )
+        
+        # A target unit 
+        results = list( qmap(speed,d,t,unit='cm/s') )
+        self.assertTrue( results[0].unit is centimetre_per_second )
+        self.assertAlmostEqual( results[3].value, 200.0, 12 )
+        
+        # `fn` may return results in its own units 
+        results = list( qmap( lambda d: qresult(d), d ) )
+        self.assertEqual( str( results[1] ), '0.2 m' )
+        self.assertEqual( str( results[3] ), '0.5 m' )
+        
+        # The target unit is still checked
+        self.assertRaises( 
+            RuntimeError, list, qmap( speed, d, t, unit='m' ) 
+        )
+        
+        # Values in different units are converted before they are 
+        # added, even if the raw values happen to give the same result 
+        x = [ qvalue(0,metre), qvalue(1,metre) ]
+        y = [ qvalue(0,centimetre), qvalue(50,centimetre) ]
+        results = list( qmap( lambda x,y: x + y, x, y ) )
+        self.assertTrue( results[1].unit is metre )
+        self.assertEqual( results[0].value, 0.0 )
+        self.assertEqual( results[1].value, 1.5 )
+        
+        # The conversion is resolved once for each unit of the result 
+        calls = []
+        def total(x,y):
+            calls.append( (x,y) )
+            return x + y 
+        with mock.patch.object(
+            quantity_value, '_resolve_conversion', 
+            wraps=quantity_value._resolve_conversion
+        ) as resolve:
+            results = list( qmap( total, x + y, x + y ) )
+        self.assertTrue( results[3].unit is metre )
+        self.assertEqual( results[3].value, 1.0 )
+        self.assertEqual( len(calls), 4 )
+        self.assertEqual( resolve.call_count, 2 )
+        
+    def test_normalise(self):
+        context = Context( ("Voltage","V"), ("Temperature","t") )
+        ureg = UnitRegister("ureg",context,normalise=True)
+        self.assertTrue( ureg.normalise )
+        
+        volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        millivolt = ureg.unit( milli(volt) )
+        kilovolt = ureg.unit( kilo(volt) )
+        kelvin = ureg.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        celsius = ureg.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        ureg.conversion_function_values(celsius,kelvin,1,273.15)
+        
+        # Values are stored in the reference unit 
+        x = qvalue(250,millivolt)
+        self.assertTrue( x.unit is volt )
+        self.assertEqual( x.value, 0.25 )
+        self.assertTrue( x.display_unit is millivolt )
+        self.assertEqual( str(x), '250.0 mV' )
+        self.assertEqual( repr(x), 'qvalue(250.0,millivolt)' )
+        
+        # so addition and subtraction need no conversion 
+        y = qvalue(1.5,kilovolt)
+        s = x + y 
+        self.assertTrue( type(s) is ValueUnit )
+        self.assertTrue( s.unit is volt )
+        self.assertEqual( s.value, 1500.25 )
+        self.assertEqual( str( qresult(s,'kV') ), '1.50025 kV' )
+        
+        # A result for values in the same unit is reported in that unit 
+        s = x - qvalue(50,millivolt)
+        r = qresult(s)
+        self.assertTrue( type(r) is ValueUnit )
+        self.assertTrue( r.unit is millivolt )
+        self.assertAlmostEqual( r.value, 200.0, 12 )
+        self.assertTrue( qresult( s, volt ).unit is volt )
+        
+        # Other operations use the reference unit 
+        p = qresult( 4*x )
+        self.assertTrue( p.unit is volt )
+        self.assertEqual( p.value, 1.0 )
+        self.assertTrue( x < y )
+        
+        # Reference units and interval scales are not changed 
+        self.assertTrue( type( qvalue(1,volt) ) is ValueUnit )
+        t = qvalue(20,celsius)
+        self.assertTrue( t.unit is celsius )
+        self.assertEqual( t.value, 20 )
+        
+        # The register can be copied after conversions have been used 
+        copy = pickle.loads( pickle.dumps(ureg) )
+        self.assertTrue( copy.normalise )
+        x = qvalue(250,copy.Voltage.mV)
+        self.assertTrue( x.unit is copy.Voltage.V )
+        self.assertEqual( x.value, 0.25 )
+        
+        # Registers normally do not normalise 
+        self.assertFalse( UnitRegister("si",context).normalise )
+        
+    def test_scaling(self):
+        context = Context( ("Length","L"), ("Temperature","t") )
+        si = UnitRegister("si",context)
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        centimetre = si.unit( centi(metre) )
+        celsius = si.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        
+        # Multiplying or dividing by a number does not change the unit 
+        x = qvalue(1.5,centimetre)
+        for y,v in ( (2*x,3.0), (x*2,3.0), (x/3,0.5) ):
+            self.assertTrue( type(y) is ValueUnit )
+            self.assertTrue( y.unit is centimetre )
+            self.assertEqual( y.value, v )
+            
+        # nor does it change a unit expression 
+        a = qvalue(2,metre)*qvalue(3,centimetre)
+        self.assertTrue( (2*a).unit is a.unit )
+        self.assertTrue( (a/4).unit is a.unit )
+        
+        y = 3/x
+        self.assertTrue( y.unit is centimetre**-1 )
+        self.assertEqual( y.value, 2.0 )
+        
+        # Interval scales cannot be scaled
+        t = qvalue(20,celsius)
+        self.assertRaises(RuntimeError,lambda: 2*t)
+        self.assertRaises(RuntimeError,lambda: t*2)
+        self.assertRaises(RuntimeError,lambda: t/2)
+        self.assertRaises(RuntimeError,lambda: 2/t)
+        
+    def test_converter(self):
+        context = Context( ("Length","L"), ("Time","T"), ("Temperature","t") )
+        Speed = context.declare('Speed','V','Length/Time')
+        si = UnitRegister("si",context)
+        
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        kilometre = si.unit( kilo(metre) )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+        kelvin = si.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        celsius = si.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        si.conversion_function_values(kelvin,celsius,1,-273.15)
+        
+        # The same results as `qresult`
+        conv = si.converter(kilometre/second)
+        self.assertTrue( conv.unit is metre_per_second )
+        for x in (0.5,2,7.25):
+            r = conv(x)
+            q = qresult( qvalue(x,kilometre)/qvalue(1,second) )
+            self.assertTrue( type(r) is ValueUnit )
+            self.assertTrue( r.unit is q.unit )
+            self.assertEqual( r.value, q.value )
+            self.assertEqual( conv.values(x), q.value )
+        
+        # A unit given by symbol or name
+        conv = si.converter(kelvin,'degC')
+        self.assertTrue( conv.unit is celsius )
+        self.assertAlmostEqual( conv(300).value, 26.85, 12 )
+        self.assertTrue( si.converter(metre,'kilometre').unit is kilometre )
+        self.assertEqual( si.converter(metre,'km').values(1500), 1.5 )
+        
+        self.assertRaises(RuntimeError,si.converter,metre,'s')
+        self.assertRaises(RuntimeError,UnitRegister("other",context).converter,metre)
+        
+    def test_collapse(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        Speed = context.declare('Speed','V','Length/Time')
+        Area = context.declare('Area','A','Length**2')
+        si = UnitRegister("si",context,collapse=True)
+        self.assertTrue( si.collapse )
+        
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        centimetre = si.unit( centi(metre) )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+        
+        # A product or quotient is resolved to the reference unit 
+        v = qvalue(150,centimetre) / qvalue(2,second)
+        self.assertTrue( v.unit is metre_per_second )
+        self.assertAlmostEqual( v.value, 0.75, 15 )
+        self.assertTrue( qresult(v).unit is metre_per_second )
+        
+        d = v * qvalue(4,second)
+        self.assertTrue( d.unit is metre )
+        self.assertAlmostEqual( d.value, 3.0, 15 )
+        
+        # Without a reference unit for Area the expression is kept
+        a = qvalue(2,metre) * qvalue(3,metre)
+        self.assertFalse( a.unit is metre )
+        self.assertEqual( a.value, 6 )
+        self.assertEqual( str(a.unit), '(m**2)' )
+        
+        # The expression is resolved once there is a reference unit 
+        square_metre = si.unit( RatioScale(Area,'square_metre','m2') )
+        a = qvalue(2,metre) * qvalue(3,metre)
+        self.assertTrue( a.unit is square_metre )
+        self.assertEqual( a.value, 6 )
+        
+        # Multiplying by a number does not change the unit 
+        x = 3 * qvalue(2,centimetre) 
+        self.assertTrue( x.unit is centimetre )
+        self.assertEqual( x.value, 6 )
+        
+        # A long chain of operations holds no expression 
+        x = qvalue(1.0,metre)
+        t = qvalue(2.0,second)
+        for i in range(1000):
+            x = (x/t)*t 
+        self.assertTrue( x.unit is metre )
+        self.assertEqual( x.value, 1.0 )
+        
+        # Registers normally do not collapse
+        si = UnitRegister("si",context)
+        self.assertFalse( si.collapse )
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.assertFalse( ( qvalue(1,metre)/qvalue(1,second) ).unit is metre )
+        
+        # The kind of quantity may be declared after a failure
+        context = Context( ("Length","L"), ("Time","T") )
+        si = UnitRegister("si",context,collapse=True)
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        v = qvalue(2,metre) / qvalue(1,second)
+        self.assertFalse( v.unit in si )
+        
+        Speed = context.declare('Speed','V','Length/Time')
+        metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+        v = qvalue(2,metre) / qvalue(1,second)
+        self.assertTrue( v.unit is metre_per_second )
+        self.assertEqual( v.value, 2 )
+        
+    def test_operations_table(self):
+        # Results that are not collapsed are resolved using 
+        # the register's table of operations
+        context = Context( ("Length","L"), ("Time","T") )
+        Speed = context.declare('Speed','V','Length/Time')
+        si = UnitRegister("si",context)
+        metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        centimetre = si.unit( centi(metre) )
+        second = si.unit( RatioScale(context['Time'],'second','s') )
+        metre_per_second = si.unit( RatioScale(Speed,'metre_per_second','m/s') )
+        
+        v = qvalue(150,centimetre) / qvalue(2,second)
+        for i in range(3):
+            r = qresult(v)
+            self.assertTrue( r.unit is metre_per_second )
+            self.assertAlmostEqual( r.value, 0.75, 15 )
+        self.assertEqual( si.operations_info()[:2], (2,1) )
+        
+        # Addition too (the signatures are not simplified)
+        w = qvalue(1,metre) / qvalue(1,second)
+        for i in range(3):
+            s = v + w
+            self.assertTrue( s.unit is metre_per_second )
+            self.assertAlmostEqual( s.value, 1.75, 15 )
+        self.assertEqual( si.operations_info()[:2], (6,3) )
         
 #============================================================================
 if __name__ == '__main__':
@@ -0,0 +1,95 @@
+import random
+import statistics
+import unittest
+
+import numpy as np
+
+from QV import *
+from QV.prefix import *
+from QV.quantity_array import qarray
+from QV.rolling import RollingWindow
+
+#----------------------------------------------------------------------------
+class TestRollingWindow(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Voltage","V"), ("Time","T") )
+        context.declare('Voltage_squared','V2','Voltage**2')
+        
+        self.ureg = ureg = UnitRegister("ureg",context)
+        self.volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        self.millivolt = ureg.unit( milli(self.volt) )
+        self.second = ureg.unit( RatioScale(context['Time'],'second','s') )
+        self.volt_squared = ureg.unit( 
+            RatioScale(context['Voltage_squared'],'volt_squared','V2') 
+        )
+
+    def test_statistics(self):
+        rng = random.Random(1)
+        size = 7
+        
+        w = RollingWindow(self.millivolt,size)
+        self.assertEqual( w.size, size )
+        self.assertTrue( w.unit is self.volt )
+        self.assertEqual( len(w), 0 )
+        self.assertRaises( RuntimeError, getattr, w, 'mean' )
+        
+        history = []
+        for i in range(100):
+            if i % 3:
+                x = rng.uniform(-1,1)
+                w.update( qvalue(x,self.volt) )
+            else:
+                x = rng.uniform(-1000,1000)
+                w.update( qvalue(x,self.millivolt) )
+                x = x/1000
+            history.append(x)
+            
+            window = history[-size:]
+            self.assertEqual( len(w), len(window) )
+            self.assertAlmostEqual( w.mean.value, statistics.mean(window), 12 )
+            self.assertAlmostEqual( w.min.value, min(window), 15 )
+            self.assertAlmostEqual( w.max.value, max(window), 15 )
+            if len(window) > 1:
+                self.assertAlmostEqual( w.variance.value, statistics.variance(window), 12 )
+                self.assertAlmostEqual( w.std.value, statistics.stdev(window), 12 )
+                
+        self.assertTrue( w.mean.unit is self.volt )
+        self.assertTrue( qresult( w.variance ).unit is self.volt_squared )
+        self.assertTrue( w.std.unit is self.volt )
+
+    def test_drift(self):
+        # Rounding errors do not accumulate in a long stream
+        # of values with a large mean
+        rng = np.random.default_rng(3)
+        size = 100
+        x = 1E6 + rng.uniform(-1,1,100000)
+        
+        w = RollingWindow(self.volt,size)
+        start = 0
+        for stop in (50000, 75037, 100000):
+            w.update( qarray(x[start:stop],self.volt) )
+            start = stop
+            
+            window = x[stop - size:stop]
+            self.assertTrue( abs( w.mean.value - np.mean(window) ) < 1E-9 )
+            self.assertAlmostEqual( 
+                w.variance.value/np.var(window,ddof=1), 1.0, 9 
+            )
+        
+    def test_arrays(self):
+        w = RollingWindow(self.volt,5)
+        w.update( qarray( np.arange(8.0), self.millivolt ) )
+        self.assertEqual( len(w), 5 )
+        self.assertAlmostEqual( w.mean.value, 0.005, 15 )
+        self.assertEqual( w.min.value, 0.003 )
+        self.assertEqual( w.max.value, 0.007 )
+        
+    def test_errors(self):
+        self.assertRaises( RuntimeError, RollingWindow, self.volt, 0 )
+        w = RollingWindow(self.volt,5)
+        self.assertRaises( RuntimeError, w.update, qvalue(1,self.second) )
+        
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -30,6 +30,42 @@ class TestScale(unittest.TestCase):
         d = { metre: 1 }
         self.assertTrue( d[metre] == 1 )
 
+    def test_affine_conversion(self):
+    
+        C_to_K = AffineConversion(1.0,273.15)
+        F_to_C = AffineConversion(5.0/9.0,-32*5.0/9.0)
+        
+        self.assertEqual( C_to_K(0.0), 273.15 )
+        self.assertAlmostEqual( F_to_C(212.0), 100.0, 13 )
+        
+        # Composition
+        F_to_K = F_to_C.then(C_to_K)
+        self.assertTrue( isinstance(F_to_K,AffineConversion) )
+        for x in (-40.0,0.0,32.0,98.6,212.0):
+            self.assertAlmostEqual( F_to_K(x), C_to_K(F_to_C(x)), 12 )
+            self.assertAlmostEqual( F_to_K.inverse()(F_to_K(x)), x, 12 )
+            
+        # Ratio-scale conversions have no offset
+        m_to_cm = AffineConversion(100)
+        self.assertEqual( m_to_cm.offset, 0 )
+        self.assertEqual( m_to_cm(3), 300 )
+        self.assertTrue( type(m_to_cm(3)) is int )
+
+    def test_power(self):
+        from fractions import Fraction
+        
+        Length = KindOfQuantity('Length','L') 
+        metre = RatioScale(Length,'metre','m')
+        
+        x = metre**2
+        self.assertEqual( x.name, '(metre**2)' )
+        self.assertEqual( str(x), '(m**2)' )
+        
+        # Fractional exponents are in parentheses 
+        x = metre**Fraction(1,2)
+        self.assertEqual( x.name, '(metre**(1/2))' )
+        self.assertEqual( str(x), '(m**(1/2))' )
+        self.assertEqual( str( metre**Fraction(-3,2) ), '(m**(-3/2))' )
 
         
 #============================================================================
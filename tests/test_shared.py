@@ -0,0 +1,111 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from QV import *
+from QV.prefix import *
+from QV.quantity_array import QArray
+from QV.shared import SharedQArray, shared_qarray, attach
+
+#----------------------------------------------------------------------------
+# Worker processes have their own copy of the register
+_register = None
+
+def _initialise_worker(payload):
+    global _register
+    _register = pickle.loads(payload)
+
+def _mean_in_volts(handle):
+    x = attach(handle,_register)
+    try:
+        assert x.unit.register is _register
+        return float( np.mean( qresult(x).value ) )
+    finally:
+        x.close()
+
+def _double(handle):
+    x = attach(handle,_register)
+    try:
+        x.value *= 2
+    finally:
+        x.close()
+
+#----------------------------------------------------------------------------
+class TestSharedQArray(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Voltage","V"), ("Time","T") )
+        self.ureg = ureg = UnitRegister("ureg",context)
+        self.volt = ureg.unit( RatioScale(context['Voltage'],'volt','V') )
+        self.millivolt = ureg.unit( milli(self.volt) )
+        self.second = ureg.unit( RatioScale(context['Time'],'second','s') )
+
+    def test_handle(self):
+        values = np.arange(12.0).reshape(3,4)
+        with shared_qarray(values,self.millivolt) as x:
+            self.assertTrue( isinstance(x,QArray) )
+            self.assertTrue( np.all( x.value == values ) )
+
+            h = x.handle
+            self.assertEqual( h.shape, (3,4) )
+            self.assertEqual( np.dtype(h.dtype), np.float64 )
+            self.assertEqual( h.register_id, self.ureg.register_id )
+            self.assertEqual( h.unit_id, self.millivolt.unit_id )
+            self.assertTrue( self.ureg.unit_for_id(h.unit_id) is self.millivolt )
+
+            # The handle is small, the array cannot be pickled
+            self.assertTrue( len( pickle.dumps(h) ) < 300 )
+            self.assertRaises( TypeError, pickle.dumps, x )
+
+            # Values are shared, not copied
+            y = attach(h,self.ureg)
+            self.assertTrue( y.unit is self.millivolt )
+            y.value[0,0] = 100.0
+            self.assertEqual( x.value[0,0], 100.0 )
+
+            # Arithmetic gives ordinary quantity arrays
+            z = qresult(y)
+            self.assertTrue( type(z) is QArray )
+            self.assertTrue( z.unit is self.volt )
+            self.assertAlmostEqual( z.value[0,0], 0.1, 15 )
+
+            y.close()
+            self.assertRaises( RuntimeError, y.unlink )
+
+    def test_errors(self):
+        self.assertRaises( 
+            RuntimeError, shared_qarray, [1.0], self.volt/self.second 
+        )
+
+        other = UnitRegister("other",self.ureg.context)
+        other.unit( RatioScale(self.ureg.context['Voltage'],'volt','V') )
+        with shared_qarray( [1.0, 2.0], self.millivolt ) as x:
+            self.assertRaises( RuntimeError, attach, x.handle, other )
+
+            # A copy of the register
+            copy = pickle.loads( pickle.dumps(self.ureg) )
+            y = attach(x.handle,copy)
+            self.assertTrue( y.unit is copy.Voltage.mV )
+            y.close()
+
+    def test_workers(self):
+        values = np.linspace(0.0,1000.0,10001)
+        with shared_qarray(values,self.millivolt) as x:
+            h = x.handle
+            with ProcessPoolExecutor(
+                max_workers=2,
+                initializer=_initialise_worker,
+                initargs=( pickle.dumps(self.ureg), )
+            ) as executor:
+                means = list( executor.map(_mean_in_volts,[h]*4) )
+                for m in means:
+                    self.assertAlmostEqual( m, 0.5, 12 )
+
+                executor.submit(_double,h).result()
+                self.assertEqual( x.value[-1], 2000.0 )
+
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -51,6 +51,23 @@ class TestSignature(unittest.TestCase):
         d_simple = d_ratio.simplify() 
         self.assertEqual( (1,-1), d_simple.numerator ) 
         self.assertEqual( (), d_simple.denominator ) 
+
+        # Powers may be integers or fractions
+        from fractions import Fraction
+        
+        d_pow = d_sub**2 
+        self.assertEqual( (2,-2), d_pow.numerator ) 
+        
+        d_pow = d_sub**Fraction(1,2) 
+        self.assertEqual( (Fraction(1,2),Fraction(-1,2)), d_pow.numerator ) 
+        
+        # Integral results are held as integers
+        d_pow = d_pow**Fraction(4,1)
+        self.assertEqual( (2,-2), d_pow.numerator ) 
+        self.assertTrue( all( type(i) is int for i in d_pow.numerator ) ) 
+        self.assertEqual( hash(d_pow), hash(d_sub**2) )
+        
+        self.assertRaises( RuntimeError, pow, d1, 0.5 )
         
     def test_in_context(self):
     
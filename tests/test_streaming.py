@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from QV import * 
+from QV.prefix import *
+from QV.quantity_array import QArray
+from QV.streaming import aqresult, aqmap
+
+#----------------------------------------------------------------------------
+async def _readings(values,log=None):
+    for x in values:
+        if log is not None: log.append(x)
+        yield x
+        
+async def _collect(agen):
+    return [ x async for x in agen ]
+
+#----------------------------------------------------------------------------
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        context = Context( ("Length","L"), ("Time","T") )
+        context.declare('Speed','V','Length/Time')
+        
+        si = UnitRegister("si",context)
+        self.metre = si.unit( RatioScale(context['Length'],'metre','m') )
+        self.millimetre = si.unit( milli(self.metre) )
+        self.second = si.unit( RatioScale(context['Time'],'second','s') )
+        self.metre_per_second = si.unit( 
+            RatioScale(context['Speed'],'metre_per_second','m/s') 
+        )
+        self.millimetre_per_second = si.unit( 
+            proportional_unit(self.metre_per_second,'millimetre_per_second','mm/s',1E-3) 
+        )
+        
+    def test_aqresult(self):
+        values = [ float(i) for i in range(10) ]
+        
+        results = asyncio.run( _collect(
+            aqresult( _readings(values), self.millimetre, chunk_size=3 )
+        ))
+        self.assertEqual( len(results), len(values) )
+        for r_i,x_i in zip(results,values):
+            self.assertTrue( r_i.unit is self.metre )
+            self.assertAlmostEqual( r_i.value, x_i/1000, 15 )
+            
+        # A unit expression and a preferred unit 
+        results = asyncio.run( _collect(
+            aqresult( _readings(values), self.metre/self.second, 'mm/s' )
+        ))
+        for r_i,x_i in zip(results,values):
+            self.assertTrue( r_i.unit is self.millimetre_per_second )
+            self.assertAlmostEqual( r_i.value, 1000*x_i, 12 )
+            
+        self.assertRaises( 
+            RuntimeError, 
+            asyncio.run,
+            _collect( aqresult( _readings(values), self.metre, 'xx' ) )
+        )
+
+    def test_aqmap(self):
+        values = [ float(i) for i in range(10) ]
+        
+        chunks = asyncio.run( _collect(
+            aqmap( None, _readings(values), self.millimetre, chunk_size=4 )
+        ))
+        self.assertEqual( [ len(c) for c in chunks ], [4,4,2] )
+        for c in chunks:
+            self.assertTrue( isinstance(c,QArray) )
+            self.assertTrue( c.unit is self.metre )
+        np.testing.assert_allclose( 
+            np.concatenate( [c.value for c in chunks] ),
+            np.array(values)/1000
+        )
+        
+        totals = asyncio.run( _collect(
+            aqmap( 
+                lambda c: c.value.sum(), 
+                _readings(values), self.millimetre, chunk_size=5 
+            )
+        ))
+        self.assertEqual( len(totals), 2 )
+        self.assertAlmostEqual( sum(totals), sum(values)/1000, 15 )
+
+    def test_live_source(self):
+        # Readings that arrive slowly are not held back 
+        # until a chunk is full
+        async def live():
+            for x in range(5):
+                await asyncio.sleep(0.05)
+                yield float(x)
+                
+        async def main():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            times = []
+            async for v in aqresult( live(), self.millimetre, flush_after=0.01 ):
+                times.append( loop.time() - start )
+            return times
+            
+        times = asyncio.run( main() )
+        self.assertEqual( len(times), 5 )
+        self.assertTrue( times[0] < 0.15, times )
+        self.assertTrue( times[3] < 0.25, times )
+        
+        # Chunks for `aqmap` are passed on as well 
+        async def chunks():
+            return [ 
+                len(c) async for c in aqmap( 
+                    None, live(), self.millimetre, flush_after=0.01 
+                ) 
+            ]
+        self.assertEqual( asyncio.run( chunks() ), [1,1,1,1,1] )
+
+    def test_backpressure(self):
+        # The producer cannot get more than `maxsize` chunks
+        # ahead of a consumer that has stopped reading.
+        log = []
+        
+        async def main():
+            stream = aqresult( 
+                _readings(range(1000),log), self.metre, 
+                chunk_size=10, maxsize=2 
+            )
+            first = await stream.__anext__()
+            for i in range(10): 
+                await asyncio.sleep(0)
+            await stream.aclose()
+            return first
+            
+        first = asyncio.run( main() )
+        self.assertEqual( first.value, 0 )
+        self.assertTrue( len(log) <= 10*4 )
+        
+    def test_errors(self):
+        async def broken():
+            yield 1.0
+            raise ValueError("instrument fault")
+            
+        self.assertRaises( 
+            ValueError, 
+            asyncio.run,
+            _collect( aqresult( broken(), self.metre ) )
+        )
+        self.assertRaises( 
+            RuntimeError, 
+            asyncio.run,
+            _collect( aqresult( broken(), self.metre, chunk_size=0 ) )
+        )
+        
+#============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 from __future__ import print_function
 from __future__ import division 
 
+import gc
+import pickle
 import unittest
 
 from QV import * 
@@ -78,6 +80,258 @@ class TestUnit(unittest.TestCase):
         else:
             assert False 
             
+    def test_units(self):
+        # bulk registration
+        context = Context( ('Length','L'),('Time','T') )
+        SI =  UnitRegister("SI",context)
+
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        second = RatioScale(context['Time'],'second','s')
+        
+        scales = [ p_i(metre) for p_i in metric_prefixes ] 
+        scales.append( second )
+        
+        units = SI.units( scales )
+        self.assertEqual( len(units), len(scales) )
+        for u_i,s_i in zip(units,scales):
+            self.assertTrue( isinstance(u_i,Unit) )
+            self.assertTrue( u_i.scale is s_i )
+            self.assertTrue( u_i in SI )
+
+        self.assertTrue( SI.Length.km is units[12] )
+        self.assertTrue( SI.Time.second is units[-1] )
+        self.assertTrue( SI.reference_unit_for(units[-1]) is units[-1] )
+        
+        # A clash with a registered unit, or within the batch, 
+        # means that nothing is registered
+        foot = RatioScale(context['Length'],'foot','ft')
+        self.assertRaises( RuntimeError, SI.units, [foot,centi(metre)] )
+        self.assertFalse( 'foot' in SI.Length )
+        
+        inch = RatioScale(context['Length'],'inch','in')
+        self.assertRaises( RuntimeError, SI.units, [foot,inch,foot] )
+        self.assertFalse( 'foot' in SI.Length )
+        self.assertFalse( 'inch' in SI.Length )
+
+        keys = RatioScale(context['Length'],'keys','k')
+        self.assertRaises( AttributeError, SI.units, [foot,keys] )
+        self.assertFalse( 'foot' in SI.Length )
+        
+        # A kind of quantity that is not in the context
+        other = Context( ('Mass','M'), )
+        kilogram = RatioScale(other['Mass'],'kilogram','kg')
+        self.assertRaises( RuntimeError, SI.units, [inch,kilogram] )
+        self.assertFalse( 'inch' in SI.Length )
+        
+        # A large register 
+        Count = context.declare('Count','N','Length/Time')
+        count = SI.unit( RatioScale(Count,'count','n') )
+        scales = [
+            proportional_unit(count,'count_{}'.format(i),'n{}'.format(i),i)
+                for i in range(1,5001)
+        ]
+        units = SI.units( scales )
+        self.assertEqual( len(units), 5000 )
+        self.assertEqual( len(SI.Count), 2*5001 )
+        self.assertTrue( SI.Count.n4321 is units[4320] )
+ 
+    def test_metadata(self):
+        context = Context( ('Length','L'),('Temperature','t') )
+        Area = context.declare('Area','A','Length**2')
+        SI =  UnitRegister("SI",context)
+        
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        centimetre = SI.unit( centi( metre ) )
+        
+        self.assertTrue( metre.scale_type is RatioScale )
+        self.assertTrue( metre.signature is context.signature('Length') )
+        self.assertTrue( metre.reference_unit is metre )
+        self.assertEqual( metre.reference_factor, 1 )
+        self.assertTrue( centimetre.reference_unit is metre )
+        self.assertEqual( centimetre.reference_factor, 0.01 )
+        self.assertFalse( centimetre.is_dimensionless )
+        self.assertTrue( centimetre.is_simplified )
+        
+        unity = SI.Number.unity 
+        self.assertTrue( unity.reference_unit is unity )
+        self.assertTrue( unity.is_dimensionless )
+        
+        # The attributes are read-only
+        self.assertRaises(AttributeError,setattr,metre,'reference_unit',centimetre)
+        
+        # An interval scale registered before the reference unit 
+        celsius = SI.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        self.assertTrue( celsius.scale_type is IntervalScale )
+        self.assertTrue( celsius.reference_unit is None )
+        kelvin = SI.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        self.assertTrue( celsius.reference_unit is kelvin )
+        self.assertTrue( celsius.reference_factor is None )
+        self.assertTrue( kelvin.reference_unit is kelvin )
+        
+    def test_operations(self):
+        context = Context( ('Length','L'),('Time','T') )
+        Speed = context.declare('Speed','V','Length/Time')
+        SI =  UnitRegister("SI",context,operations_size=2)
+        
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        kilometre = SI.unit( kilo( metre ) )
+        second = SI.unit( RatioScale(context['Time'],'second','s') )  
+        metre_per_second = SI.unit( RatioScale(Speed,'metre_per_second','m/s') )  
+        
+        op = SI.operation('/',kilometre,second)
+        self.assertTrue( op.unit is metre_per_second )
+        self.assertTrue( op.kind_of_quantity is Speed )
+        self.assertEqual( op.factor, 1000.0 )
+        
+        op = SI.operation('*',metre_per_second,second)
+        self.assertTrue( op.unit is metre )
+        self.assertEqual( op.factor, 1.0 )
+        
+        op = SI.operation('//',kilometre,metre)
+        self.assertEqual( op.factor, 1000.0 )
+        self.assertTrue( op.unit is SI.Number.unity )
+        
+        self.assertRaises(RuntimeError,SI.operation,'+',metre,metre)
+        # Area is not declared 
+        self.assertRaises(RuntimeError,SI.operation,'*',metre,metre)
+        
+        # The table holds the two most recent operations
+        info = SI.operations_info()
+        self.assertEqual( info, (0,5,2,2) )
+        self.assertEqual( info.hit_rate, 0.0 )
+        
+        SI.operation('//',kilometre,metre)
+        SI.operation('/',kilometre,second)
+        info = SI.operations_info()
+        self.assertEqual( (info.hits,info.misses,info.currsize), (1,6,2) )
+        self.assertEqual( info.hit_rate, 1.0/7 )
+        
+        # The table is used for products and quotients that are collapsed 
+        SI =  UnitRegister("SI",context,collapse=True)
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        second = SI.unit( RatioScale(context['Time'],'second','s') )  
+        metre_per_second = SI.unit( RatioScale(Speed,'metre_per_second','m/s') )  
+        for i in range(10):
+            v = qvalue(i,metre) / qvalue(2.0,second)
+        self.assertTrue( v.unit is metre_per_second )
+        self.assertEqual( v.value, 4.5 )
+        self.assertEqual( SI.operations_info().hit_rate, 0.9 )
+        
+    def test_unit_ids(self):
+        context = Context( ('Length','L'),('Temperature','t'),('Pressure','P') )
+        SI =  UnitRegister("SI",context)
+        
+        self.assertEqual( SI.Number.unity.unit_id, 0 )
+        
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        kilometre = SI.unit( kilo( metre ) )
+        celsius = SI.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        kelvin = SI.unit( RatioScale(context['Temperature'],'kelvin','K') )
+        
+        units = (metre,kilometre,celsius,kelvin)
+        self.assertEqual( [ u.unit_id for u in units ], [1,2,3,4] )
+        for u in units:
+            self.assertTrue( SI.unit_for_id( u.unit_id ) is u )
+        self.assertRaises(RuntimeError,SI.unit_for_id,5)
+            
+        t = SI.tables()
+        self.assertEqual( list(t.reference), [0,1,1,4,4] )
+        self.assertEqual( list(t.factor)[:3], [1.0,1.0,1000.0] )
+        self.assertTrue( t.factor[ celsius.unit_id ] != t.factor[ celsius.unit_id ] )
+        self.assertTrue( SI.koq_for_id( t.koq[ kelvin.unit_id ] ) is context['Temperature'] )
+        self.assertEqual( t.koq[ celsius.unit_id ], t.koq[ kelvin.unit_id ] )
+        self.assertTrue( 
+            SI.scale_types[ t.scale_type[ celsius.unit_id ] ] is IntervalScale 
+        )
+        self.assertTrue( 
+            SI.scale_types[ t.scale_type[ metre.unit_id ] ] is RatioScale 
+        )
+        
+        # Units for different kinds of quantity can have the same symbol,
+        # their conversions are not confused
+        SI.conversion_function_values(celsius,kelvin,1,273.15)
+        pascal = SI.unit( RatioScale(context['Pressure'],'pascal','K') )
+        gauge = SI.unit( IntervalScale(context['Pressure'],'gauge_pascal','degC') )
+        SI.conversion_function_values(gauge,pascal,1,101325)
+        
+        self.assertEqual( SI.conversion_from_A_to_B(celsius,kelvin)(0), 273.15 )
+        self.assertEqual( SI.conversion_from_A_to_B(gauge,pascal)(0), 101325 )
+        
+        # Units for the same kind of quantity with the same symbol
+        # are not treated as the same unit
+        kilopascal = SI.unit( RatioScale(context['Pressure'],'kilopascal','degC',1000) )
+        SI.conversion_function_values(gauge,kilopascal,1E-3,101.325)
+        self.assertEqual( SI.conversion_from_A_to_B(gauge,kilopascal)(0), 101.325 )
+        self.assertEqual( SI.conversion_from_A_to_B(kilopascal,pascal)(1), 1000 )
+        self.assertEqual( SI.conversion_from_A_to_B(kilopascal,kilopascal)(1), 1 )
+        
+    def test_canonical_expressions(self):
+        context = Context( ('Length','L'),('Time','T'),('Mass','M'),('Temperature','t') )
+        context.declare('Speed','V','Length/Time')
+        SI =  UnitRegister("SI",context)
+        
+        metre = SI.unit( RatioScale(context['Length'],'metre','m') )  
+        centimetre = SI.unit( centi(metre) )  
+        second = SI.unit( RatioScale(context['Time'],'second','s') ) 
+        kilogram = SI.unit( RatioScale(context['Mass'],'kilogram','kg') ) 
+        unity = SI.Number.unity
+        
+        # Expressions built separately are the same object
+        self.assertTrue( metre/second is metre/second )
+        self.assertTrue( metre*second is second*metre )
+        self.assertTrue( (metre/second)/second is metre/(second*second) )
+        self.assertTrue( (metre/second)/second is metre*second**-2 )
+        self.assertTrue( kilogram*(metre/second) is (kilogram*metre)/second )
+        self.assertTrue( metre//second is metre//second )
+        
+        # The class indicates the form 
+        self.assertTrue( isinstance(metre*kilogram,registered_unit.Mul) )
+        self.assertTrue( isinstance(metre*second**-2,registered_unit.Div) )
+        self.assertTrue( isinstance(second*second,registered_unit.Pow) )
+        self.assertEqual( (second*second).exponent, 2 )
+        self.assertTrue( (second*second).arg is second )
+        
+        # Factors cancel
+        self.assertTrue( (metre*second)/second is metre )
+        self.assertTrue( metre**2/metre is metre )
+        self.assertTrue( metre/metre is unity )
+        self.assertTrue( unity*metre is metre )
+        self.assertTrue( isinstance(metre/centimetre,registered_unit.Div) )
+        
+        # The scale is unchanged 
+        v = (centimetre/second)/second
+        self.assertEqual( str(v), '(cm/(s**2))' )
+        self.assertAlmostEqual( v.scale.conversion_factor, 0.01, 15 )
+        metre_per_second = SI.unit( RatioScale(context['Speed'],'metre_per_second','m/s') ) 
+        self.assertTrue( SI.reference_unit_for(centimetre/second) is metre_per_second )
+        
+        # so addition of values uses the same-unit path 
+        d = [ qvalue(1.5,centimetre), qvalue(2.5,centimetre) ]
+        t = qvalue(2.0,second)
+        s = d[0]/t + d[1]/t
+        self.assertTrue( s.unit is centimetre/second )
+        self.assertEqual( s.value, 2.0 )
+        
+        # Expressions that are no longer used are discarded
+        n = len(SI._expressions)
+        for i in range(2,100):
+            x = metre**i
+        self.assertTrue( x is metre**99 )
+        del x
+        gc.collect()
+        self.assertTrue( len(SI._expressions) <= n )
+        
+        # A copy of the register keeps the expressions in use
+        v = centimetre/second
+        v_copy = pickle.loads( pickle.dumps(v) )
+        cm, s = v_copy.register.Length.cm, v_copy.register.Time.s
+        self.assertTrue( cm/s is v_copy )
+        
+        # Interval scales cannot be multiplied
+        celsius = SI.unit( IntervalScale(context['Temperature'],'degree_Celsius','degC') )
+        self.assertRaises( RuntimeError, lambda: metre*celsius )
+        self.assertRaises( TypeError, lambda: metre*2 )
+ 
 #============================================================================
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file